@@ -0,0 +1 @@
+"""Micro and end-to-end benchmarks for ocr_eval (run with ``python -m benchmarks``)."""
@@ -0,0 +1,96 @@
+"""Run the benchmark suite and save results as JSON.
+
+    python -m benchmarks                       # everything, saved under benchmarks/results/
+    python -m benchmarks --filter metrics      # only names containing "metrics"
+    python -m benchmarks --compare benchmarks/results/<baseline>.json
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+
+from .common import REGISTRY, run_case
+
+MODULES = ("bench_startup", "bench_loader", "bench_encode", "bench_metrics", "bench_runner", "bench_report")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+app = typer.Typer()
+
+
+def _case_key(result: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in result["params"].items())
+    return f"{result['name']}[{params}]" if params else result["name"]
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: List[Dict], baseline_path: str) -> None:
+    baseline = {_case_key(r): r for r in json.loads(Path(baseline_path).read_text())["benchmarks"]}
+    print(f"\nvs {baseline_path} (median, ratio > 1 is slower):")
+    for result in results:
+        key = _case_key(result)
+        if key in baseline:
+            ratio = result["median"] / baseline[key]["median"] if baseline[key]["median"] else float("nan")
+            flag = "  <-- slower" if ratio > 1.1 else ("  faster" if ratio < 0.9 else "")
+            print(f"  {key:60s} {ratio:6.2f}x{flag}")
+
+
+@app.command()
+def main(
+    filter: Optional[str] = typer.Option(None, help="Only run benchmarks whose name contains this"),
+    output: Optional[str] = typer.Option(None, help="JSON results file (defaults to benchmarks/results/<time>.json)"),
+    compare: Optional[str] = typer.Option(None, help="Baseline JSON results file to compare against"),
+    repeat: Optional[int] = typer.Option(None, help="Override the number of timed repeats per case"),
+):
+    """
+    Run the ocr_eval benchmarks.
+    """
+    for module in MODULES:
+        importlib.import_module(f"{__package__}.{module}")
+
+    results = []
+    for bench in REGISTRY:
+        if filter and filter not in bench.name:
+            continue
+        for case in bench.cases():
+            result = run_case(bench, case, repeat)
+            results.append(result)
+            rate = f"  {result['items_per_s']:.1f} items/s" if result.get("items_per_s") else ""
+            print(f"{_case_key(result):60s} {result['median'] * 1000:10.2f} ms{rate}")
+
+    path = Path(output) if output else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "commit": _commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "benchmarks": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results saved to {path}")
+    if compare:
+        _compare(results, compare)
+
+
+if __name__ == "__main__":
+    app()
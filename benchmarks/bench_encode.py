@@ -0,0 +1,19 @@
+"""Request payload preparation: preprocessing profiles and base64 encoding."""
+
+import base64
+
+from ocr_eval.preprocess import PROFILES, preprocess
+
+from .common import benchmark, synthetic_page
+
+
+@benchmark(params={"profile": list(PROFILES)}, repeat=3)
+def preprocess_page(profile):
+    page = synthetic_page()
+    return lambda: preprocess(page, PROFILES[profile])
+
+
+@benchmark(params={"profile": ["original", "jpeg-1600", "jpeg-1024-gray"]}, number=10)
+def base64_payload(profile):
+    data = preprocess(synthetic_page(), PROFILES[profile]).data
+    return lambda: base64.b64encode(data).decode("utf-8")
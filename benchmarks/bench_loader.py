@@ -0,0 +1,63 @@
+"""Loader materialization: Arrow rows -> samples (image bytes + ground truth)."""
+
+import tempfile
+
+from ocr_eval.data import loader
+from ocr_eval.data.gt_index import GroundTruthIndex
+
+from .common import benchmark, local_dataset, synthetic_hf_dataset
+
+PAGES = 64
+
+
+@benchmark(params={"streaming": [False, True], "prefetch": [0, 8]})
+def iter_samples(streaming, prefetch):
+    ds = synthetic_hf_dataset(PAGES)
+
+    def run():
+        with local_dataset(ds):
+            for _ in loader.iter_dataset_samples("funsd", num_samples=PAGES, streaming=streaming, prefetch_size=prefetch):
+                pass
+
+    return run, PAGES
+
+
+@benchmark(repeat=3)
+def iter_samples_save_images():
+    ds = synthetic_hf_dataset(PAGES)
+
+    def run():
+        with local_dataset(ds):
+            for _ in loader.iter_dataset_samples(
+                "funsd", num_samples=PAGES, streaming=False, prefetch_size=0, save_images=True
+            ):
+                pass
+
+    return run, PAGES
+
+
+@benchmark()
+def iter_samples_gt_index():
+    ds = synthetic_hf_dataset(PAGES)
+    index = GroundTruthIndex(tempfile.mkdtemp() + "/funsd-train.npz")
+    with local_dataset(ds):
+        list(loader.iter_dataset_samples("funsd", num_samples=PAGES, streaming=False, prefetch_size=0, gt_index=index))
+
+    def run():
+        with local_dataset(ds):
+            for _ in loader.iter_dataset_samples(
+                "funsd", num_samples=PAGES, streaming=False, prefetch_size=0, gt_index=index
+            ):
+                pass
+
+    return run, PAGES
+
+
+@benchmark(params={"source": ["bytes", "pil"]})
+def image_bytes(source):
+    ds = synthetic_hf_dataset(8)
+    if source == "pil":
+        cells = [row["image"] for row in ds]  # decoded PIL images -> re-encoded as PNG
+    else:
+        cells = [row["image"] for row in loader._undecoded_images(ds)]
+    return (lambda: [loader._image_bytes(cell) for cell in cells]), len(cells)
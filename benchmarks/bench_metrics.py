@@ -0,0 +1,80 @@
+"""CER/WER at various text lengths, scalar vs batch vs pre-split references; box matching; QA scoring."""
+
+import numpy as np
+
+from ocr_eval.qa import score_answers
+from ocr_eval.utils.boxes import score_boxes_batch
+from ocr_eval.utils.metrics import calculate_cer, calculate_wer, calculate_wer_tokens, score_batch, score_pair
+
+from .common import benchmark, perturb, synthetic_text
+
+PAIRS = 200
+LENGTHS = [100, 1000, 10000]
+
+
+def _pairs(length):
+    refs = [synthetic_text(length, seed=i) for i in range(PAIRS)]
+    return refs, [perturb(r, seed=i) for i, r in enumerate(refs)]
+
+
+@benchmark(params={"length": LENGTHS})
+def cer_scalar(length):
+    refs, hyps = _pairs(length)
+    return (lambda: [calculate_cer(r, h) for r, h in zip(refs, hyps)]), PAIRS
+
+
+@benchmark(params={"length": LENGTHS})
+def wer_scalar(length):
+    refs, hyps = _pairs(length)
+    return (lambda: [calculate_wer(r, h) for r, h in zip(refs, hyps)]), PAIRS
+
+
+@benchmark(params={"length": LENGTHS})
+def wer_presplit(length):
+    """References split once and reused, as the runner does across engines."""
+    refs, hyps = _pairs(length)
+    ref_words = [r.split() for r in refs]
+
+    def run():
+        return [calculate_wer_tokens(words, h.split()) for words, h in zip(ref_words, hyps)]
+
+    return run, PAIRS
+
+
+@benchmark(params={"length": LENGTHS})
+def score_pair_rows(length):
+    refs, hyps = _pairs(length)
+    return (lambda: [score_pair(r, h) for r, h in zip(refs, hyps)]), PAIRS
+
+
+@benchmark(params={"length": LENGTHS})
+def score_batch_all_cores(length):
+    refs, hyps = _pairs(length)
+    return (lambda: score_batch(refs, hyps, workers=-1)), PAIRS
+
+
+def _dense_page(words, seed):
+    """Word grid like a dense DocVQA page, and the same boxes jittered as the prediction."""
+    rng = np.random.default_rng(seed)
+    x = (np.arange(words) % 60) * 40.0
+    y = (np.arange(words) // 60) * 25.0
+    refs = np.stack([x, y, x + 35, y + 20], axis=1)
+    preds = refs + rng.normal(0, 3, refs.shape)
+    texts = [synthetic_text(8, seed=seed * words + i) for i in range(words)]
+    return (
+        [{"text": perturb(t, seed=i), "bbox": box} for i, (t, box) in enumerate(zip(texts, preds.tolist()))],
+        [{"text": t, "bbox": box} for t, box in zip(texts, refs.tolist())],
+    )
+
+
+@benchmark(params={"words": [500, 3000]}, repeat=3)
+def box_matching(words):
+    pages = [_dense_page(words, seed) for seed in range(4)]
+    return (lambda: score_boxes_batch(pages)), len(pages)
+
+
+@benchmark(params={"questions": [1000, 20000]}, repeat=3)
+def qa_scoring(questions):
+    golds = [[synthetic_text(12, seed=i), synthetic_text(20, seed=-i - 1)] for i in range(questions)]
+    answers = [perturb(g[0], seed=i) for i, g in enumerate(golds)]
+    return (lambda: score_answers(answers, golds, processes=1)), questions
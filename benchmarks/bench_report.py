@@ -0,0 +1,79 @@
+"""Report generation (results store, summary tables + Markdown) over large result sets."""
+
+import os
+import random
+import tempfile
+
+import pandas as pd
+
+from ocr_eval import report
+from ocr_eval.results import ResultStore, read_results
+
+from .common import benchmark, synthetic_text
+
+
+def _rows(count):
+    rng = random.Random(0)
+    text = synthetic_text(400)
+    rows = []
+    for i in range(count):
+        ok = rng.random() > 0.02
+        rows.append({
+            "Sample ID": str(i // 2),
+            "Engine": ("Textract", "OpenAI")[i % 2],
+            "Status": "ok" if ok else "error",
+            "Latency (s)": round(rng.uniform(0.3, 4.0), 2) if ok else -1,
+            "WER": round(rng.random(), 4) if ok else -1,
+            "CER": round(rng.random() / 2, 4) if ok else -1,
+            "Cached": rng.random() < 0.1,
+            "Profile": "original",
+            "Payload (KB)": round(rng.uniform(100, 900), 1),
+            "Char Edits": rng.randint(0, 200),
+            "Ref Chars": 400,
+            "Word Edits": rng.randint(0, 40),
+            "Ref Words": 70,
+            "Retries": 0,
+            "Throttled": 0,
+            "Throttle (s)": 0.0,
+            "Ground Truth": text,
+            "Prediction": text,
+        })
+    return rows
+
+
+@benchmark(params={"rows": [10_000, 50_000]}, repeat=3)
+def summarize(rows):
+    df = pd.DataFrame(_rows(rows))
+    return (lambda: (report.summarize(df), report.payload_table(df), report.retry_table(df))), rows
+
+
+@benchmark(params={"rows": [10_000]}, repeat=3)
+def write_markdown_report(rows):
+    df = pd.DataFrame(_rows(rows))
+    output = os.path.join(tempfile.mkdtemp(), "results.md")
+
+    def run():
+        report.write_report(output, report.summarize(df), header=["bench"], sections={})
+
+    return run, rows
+
+
+@benchmark(params={"rows": [50_000]}, repeat=3)
+def write_results_store(rows):
+    data = _rows(rows)
+
+    def run():
+        with ResultStore(tempfile.mkdtemp()) as store:
+            for i, row in enumerate(data):
+                store.append(i // 2, row)
+
+    return run, rows
+
+
+@benchmark(params={"rows": [50_000]}, repeat=3)
+def read_results_summary(rows):
+    run_dir = tempfile.mkdtemp()
+    with ResultStore(run_dir) as store:
+        for i, row in enumerate(_rows(rows)):
+            store.append(i // 2, row)
+    return (lambda: report.summarize(read_results([run_dir], texts=False))), rows
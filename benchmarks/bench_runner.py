@@ -0,0 +1,80 @@
+"""End-to-end runner throughput with fake engines at several concurrency levels."""
+
+import atexit
+import os
+
+from ocr_eval.engines.openai import OpenAIVLMEngine
+from ocr_eval.engines.process_pool import ProcessPoolEngine
+from ocr_eval.fakes import FakeCPUEngine, FakeEngine, FakeOpenAIServer
+from ocr_eval.preprocess import PROFILES
+from ocr_eval.runner import EvaluationRunner
+
+from .common import benchmark, synthetic_page, synthetic_samples
+
+PAGES = 48
+
+
+@benchmark(params={"workers": [1, 4, 16], "latency": [0.0, 0.05]}, repeat=3)
+def evaluate_throughput(workers, latency):
+    samples = synthetic_samples(PAGES, page=synthetic_page(1000, 1300, lines=20))
+    engines = {
+        "Fast": FakeEngine(reply=samples[0]["ground_truth"], latency=latency / 2, jitter=latency / 4, seed=0),
+        "Slow": FakeEngine(reply=samples[1]["ground_truth"], latency=latency, jitter=latency / 2, seed=1),
+    }
+
+    def run():
+        runner = EvaluationRunner(engines, workers=workers)
+        for _ in runner.run(samples):
+            pass
+
+    return run, PAGES
+
+
+@benchmark(params={"workers": [1, 8]}, repeat=3)
+def evaluate_with_preprocessing(workers):
+    samples = synthetic_samples(16)
+    engines = {"A": FakeEngine(), "B": FakeEngine()}
+    profiles = {"A": PROFILES["jpeg-1600"], "B": PROFILES["jpeg-1600"]}
+
+    def run():
+        for _ in EvaluationRunner(engines, workers=workers, profiles=profiles).run(samples):
+            pass
+
+    return run, len(samples)
+
+
+@benchmark(params={"processes": sorted({0, 1, os.cpu_count() or 1})}, repeat=3)
+def cpu_bound_engine(processes):
+    """CPU-bound engine in the runner's threads (processes=0) vs hosted in worker processes."""
+
+    samples = synthetic_samples(PAGES, page=synthetic_page(1000, 1300, lines=20), gt_chars=0)
+    options = {"reply": "", "rounds": 20_000}
+    if processes:
+        engine = ProcessPoolEngine(FakeCPUEngine, options, processes=processes)
+        atexit.register(engine.close)
+    else:
+        engine = FakeCPUEngine(**options)
+    workers = max(processes * 2, 4)
+
+    def run():
+        for _ in EvaluationRunner({"CPU": engine}, workers=workers).run(samples):
+            pass
+
+    return run, PAGES
+
+
+@benchmark(params={"configs": [1, 4, 8]}, repeat=3)
+def sweep_shared_payloads(configs):
+    """OpenAI configurations of one sweep against a local fake service, sharing each page's payload."""
+
+    samples = synthetic_samples(16, page=synthetic_page(1000, 1300, lines=20), gt_chars=0)
+    server = FakeOpenAIServer(reply="fake transcription").start()
+    atexit.register(server.stop)
+    base = OpenAIVLMEngine(api_key="sk-fake", base_url=server.base_url, max_connections=16)
+    engines = {f"tokens={256 * (i + 1)}": base.with_options(max_completion_tokens=256 * (i + 1)) for i in range(configs)}
+
+    def run():
+        for _ in EvaluationRunner(engines, workers=16).run(samples):
+            pass
+
+    return run, len(samples) * configs
@@ -0,0 +1,62 @@
+"""CLI start-up: import time of ``ocr_eval.cli`` and of ``--help``.
+
+Each case runs in a fresh interpreter. Setup fails the run if importing the CLI
+takes longer than ``IMPORT_BUDGET_S``, so regressions show up as a benchmark
+error. Which dependencies each module may import is checked by
+``tests/test_import_time.py``.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from .common import benchmark
+
+IMPORT_BUDGET_S = 0.5
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def _probe(module):
+    code = _PROBE.format(module=module)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def check_import_budget():
+    """Raise if importing the CLI takes longer than the budget."""
+
+    # Best of three, so a cold disk cache does not count against the budget.
+    seconds = min(_probe("ocr_eval.cli")["seconds"] for _ in range(3))
+    if seconds > IMPORT_BUDGET_S:
+        raise RuntimeError(
+            f"import-time budget exceeded: importing ocr_eval.cli took {seconds:.3f}s (budget {IMPORT_BUDGET_S}s)"
+        )
+
+
+@benchmark(repeat=5)
+def import_cli():
+    check_import_budget()
+    return lambda: _probe("ocr_eval.cli")
+
+
+@benchmark(repeat=5)
+def cli_help():
+    command = [sys.executable, "-m", "ocr_eval.cli", "--help"]
+
+    def run():
+        subprocess.run(command, capture_output=True, check=True)
+
+    return run
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    check_import_budget()
+    print(f"import-time budget OK ({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,100 @@
+"""Benchmark registry, timing and synthetic inputs.
+
+Benchmarks are asv-style: a function decorated with :func:`benchmark` does its
+setup and returns the callable to time (optionally with the number of items it
+processes, for a throughput figure). Parametrized benchmarks run once per
+combination of ``params``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import itertools
+import random
+import statistics
+import string
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Page/sample/dataset generators live in the package so the load test and tests can share them.
+from ocr_eval.fakes import (  # noqa: F401
+    local_dataset,
+    synthetic_hf_dataset,
+    synthetic_page,
+    synthetic_samples,
+    synthetic_text,
+)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[..., Any]
+    params: Dict[str, List[Any]] = field(default_factory=dict)
+    repeat: int = 5
+    number: int = 1
+
+    def cases(self) -> Iterator[Dict[str, Any]]:
+        keys = list(self.params)
+        for values in itertools.product(*(self.params[k] for k in keys)):
+            yield dict(zip(keys, values))
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(params: Optional[Dict[str, List[Any]]] = None, repeat: int = 5, number: int = 1):
+    """Register ``setup(**case)``, which returns ``fn`` or ``(fn, items)`` to be timed."""
+
+    def decorator(setup: Callable[..., Any]) -> Callable[..., Any]:
+        module = setup.__module__.rsplit(".", 1)[-1].removeprefix("bench_")
+        REGISTRY.append(Benchmark(f"{module}.{setup.__name__}", setup, params or {}, repeat, number))
+        return setup
+
+    return decorator
+
+
+def measure(fn: Callable[[], Any], repeat: int, number: int) -> Dict[str, float]:
+    """Time ``fn`` ``repeat`` x ``number`` times with ``perf_counter``; seconds per call."""
+
+    timings = []
+    # The runner prints per-sample progress; keep it out of the benchmark output.
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()  # warm-up (imports, caches, thread start-up)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - start) / number)
+    return {
+        "mean": statistics.fmean(timings),
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def run_case(bench: Benchmark, case: Dict[str, Any], repeat: Optional[int] = None) -> Dict[str, Any]:
+    target = bench.setup(**case)
+    fn, items = target if isinstance(target, tuple) else (target, None)
+    stats = measure(fn, repeat or bench.repeat, bench.number)
+    result = {"name": bench.name, "params": case, "repeat": repeat or bench.repeat, "number": bench.number, **stats}
+    if items:
+        result["items"] = items
+        result["items_per_s"] = items / stats["median"] if stats["median"] > 0 else None
+    return result
+
+
+def perturb(text: str, rate: float = 0.05, seed: int = 1) -> str:
+    """Apply random character substitutions/deletions, like a noisy OCR hypothesis."""
+
+    rng = random.Random(seed)
+    out = []
+    for ch in text:
+        roll = rng.random()
+        if roll < rate / 2:
+            continue
+        out.append(rng.choice(string.ascii_lowercase) if roll < rate else ch)
+    return "".join(out)
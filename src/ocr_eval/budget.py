@@ -0,0 +1,131 @@
+"""Budget-aware admission of samples into a run.
+
+:class:`BudgetScheduler` is consulted before each sample is submitted. It keeps
+running totals of observed cost and tokens, per-engine averages over successful
+live (non-cached) calls and the number of calls still in flight, and only admits a
+sample if
+
+    spent + (in flight + this sample) x average cost per call
+
+stays within ``max_cost`` (and likewise for ``max_tokens``). Failed calls are
+left out of the averages, so a burst of free 429s does not make calls look
+cheaper. Until an engine has produced its first successful result there is
+nothing to project from, so its calls are admitted one at a time as probes; a
+cache hit ends probing too, since cached calls cost nothing. When the projection does not
+fit but calls are still in flight, admission waits for them, because their
+actual usage may come in lower. Once nothing is in flight and the next sample
+still does not fit, the budget is exhausted and no further samples are admitted.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+
+class BudgetScheduler:
+    """Thread-safe admission control against a cost and/or token budget.
+
+    Args:
+        max_cost: Budget in USD (``None`` for no cost limit).
+        max_tokens: Budget in total (prompt + completion) tokens (``None`` for no limit).
+        spent_cost: Cost already spent, e.g. by the earlier part of a resumed run.
+        spent_tokens: Tokens already spent.
+    """
+
+    def __init__(
+        self,
+        max_cost: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        spent_cost: float = 0.0,
+        spent_tokens: int = 0,
+    ):
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.spent_cost = spent_cost
+        self.spent_tokens = spent_tokens
+        self.exhausted = False
+        self._observed: Dict[str, int] = defaultdict(int)
+        self._live_calls: Dict[str, int] = defaultdict(int)
+        self._live_cost: Dict[str, float] = defaultdict(float)
+        self._live_tokens: Dict[str, int] = defaultdict(int)
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_cost is not None or self.max_tokens is not None
+
+    def _projection(self, names: Iterable[str]) -> tuple[float, float]:
+        cost, tokens = self.spent_cost, float(self.spent_tokens)
+        pending = dict(self._in_flight)
+        for name in names:
+            pending[name] = pending.get(name, 0) + 1
+        for name, count in pending.items():
+            calls = self._live_calls[name]
+            if calls:
+                cost += count * self._live_cost[name] / calls
+                tokens += count * self._live_tokens[name] / calls
+        return cost, tokens
+
+    def _fits(self, names: Iterable[str]) -> bool:
+        cost, tokens = self._projection(names)
+        return (self.max_cost is None or cost <= self.max_cost) and (
+            self.max_tokens is None or tokens <= self.max_tokens
+        )
+
+    def admit(self, names: Iterable[str]) -> bool:
+        """Block until one call per engine in ``names`` can be admitted; ``False`` once the budget is exhausted."""
+
+        names = list(names)
+        if not self.enabled:
+            return True
+        with self._cond:
+            while True:
+                if self.exhausted:
+                    return False
+                # An engine without a successful observation yet is probed with one call at a time.
+                probing = any(not self._observed[n] and self._in_flight[n] for n in names)
+                fits = not probing and self._fits(names)
+                if fits:
+                    for name in names:
+                        self._in_flight[name] += 1
+                    return True
+                if not any(self._in_flight.values()):
+                    self.exhausted = True
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait()
+
+    def observe(
+        self, name: str, cost: float, tokens: int, cached: bool = False, ok: bool = True, release: bool = True
+    ) -> None:
+        """Record a finished call admitted for engine ``name`` (errors and cache hits included).
+
+        Every call counts towards the spend; only successful live calls feed the
+        per-call averages used for projection.
+
+        Pass ``release=False`` for an attempt that will be retried: its usage counts,
+        but the (sample, engine) pair keeps its admission until its last attempt.
+        """
+
+        with self._cond:
+            self.spent_cost += cost
+            self.spent_tokens += tokens
+            if ok:
+                self._observed[name] += 1
+            if ok and not cached:
+                self._live_calls[name] += 1
+                self._live_cost[name] += cost
+                self._live_tokens[name] += tokens
+            if release:
+                self._in_flight[name] -= 1
+            self._cond.notify_all()
+
+    def remaining(self) -> Dict[str, Optional[float]]:
+        with self._cond:
+            return {
+                "cost": None if self.max_cost is None else self.max_cost - self.spent_cost,
+                "tokens": None if self.max_tokens is None else self.max_tokens - self.spent_tokens,
+            }
@@ -0,0 +1,192 @@
+"""Content-addressed cache of engine predictions.
+
+Entries are keyed by a SHA-256 over the image bytes plus the engine's
+:meth:`~ocr_eval.engines.base.BaseOCREngine.cache_identity` (engine name,
+model, prompt, token limit), so any change to those inputs misses cleanly.
+Values live in a single SQLite file with size- and age-based eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .engines.base import BaseOCREngine, ImageData
+
+if TYPE_CHECKING:
+    from .preprocess import Payload
+
+_MISSING = object()
+
+
+def make_cache_key(image_bytes: bytes, identity: Dict[str, Any], image_digest: Optional[bytes] = None) -> str:
+    """Key for ``identity`` applied to ``image_bytes``; pass ``image_digest`` if the image's SHA-256 is known."""
+
+    digest = hashlib.sha256()
+    digest.update(image_digest or hashlib.sha256(image_bytes).digest())
+    digest.update(json.dumps(identity, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """SQLite-backed prediction store shared by all engines of a run.
+
+    Args:
+        path: SQLite file to create or reuse.
+        max_bytes: Evict least-recently-used entries above this total value size.
+        max_age_days: Evict entries written longer ago than this.
+    """
+
+    # Run eviction every N writes rather than on every put.
+    EVICT_EVERY = 200
+
+    def __init__(self, path: str | Path, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions(accessed)")
+        self.evict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM predictions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._conn.execute("UPDATE predictions SET accessed = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._writes += 1
+            due = self._writes % self.EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries until under ``max_bytes``. Returns rows removed."""
+
+        removed = 0
+        with self._lock:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM predictions WHERE created < ?", (cutoff,)).rowcount
+            if self.max_bytes:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM predictions").fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    doomed, freed = [], 0
+                    for key, size in self._conn.execute("SELECT key, size FROM predictions ORDER BY accessed"):
+                        if freed >= excess:
+                            break
+                        doomed.append((key,))
+                        freed += size
+                    self._conn.executemany("DELETE FROM predictions WHERE key = ?", doomed)
+                    removed += len(doomed)
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEngine(BaseOCREngine):
+    """Wrap an engine so repeated (image, configuration) calls are served from cache.
+
+    Args:
+        engine: Engine to delegate misses to.
+        cache: Shared :class:`PredictionCache`.
+        refresh: Ignore existing entries but still write fresh results.
+    """
+
+    def __init__(self, engine: BaseOCREngine, cache: PredictionCache, refresh: bool = False):
+        self.engine = engine
+        self.cache = cache
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped engine's attributes (model, client, ...) transparently.
+        engine = self.__dict__.get("engine")
+        if engine is None:
+            raise AttributeError(name)
+        return getattr(engine, name)
+
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        return self.engine.cache_identity(method)
+
+    def _cached_call(
+        self, method: str, image_bytes: ImageData, call: Callable[[], Any], image_digest: Optional[bytes] = None
+    ) -> Any:
+        # Path and bytes entry points share one key space: same image, same answer.
+        key = make_cache_key(image_bytes, self.engine.cache_identity(method), image_digest)
+        if not self.refresh:
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                with self._counter_lock:
+                    self.hits += 1
+                self._record_call_info(cached=True)
+                return value
+        with self._counter_lock:
+            self.misses += 1
+        value = call()
+        self.cache.put(key, value)
+        self._record_call_info(cached=False)
+        return value
+
+    def process_image(self, image_path: str) -> str:
+        data = Path(image_path).read_bytes()
+        return self._cached_call("process_image", data, lambda: self.engine.process_image(image_path))
+
+    def process_bytes(self, data: ImageData, mime: Optional[str] = None) -> str:
+        return self._cached_call("process_image", data, lambda: self.engine.process_bytes(data, mime))
+
+    def process_payload(self, payload: Payload) -> str:
+        return self._cached_call(
+            "process_image", payload.data, lambda: self.engine.process_payload(payload), payload.digest
+        )
+
+    def extract_text_with_boxes(self, image_path: str):
+        data = Path(image_path).read_bytes()
+        return self._cached_call(
+            "extract_text_with_boxes", data, lambda: self.engine.extract_text_with_boxes(image_path)
+        )
+
+    def extract_text_with_boxes_from_bytes(self, data: ImageData, mime: Optional[str] = None):
+        return self._cached_call(
+            "extract_text_with_boxes", data, lambda: self.engine.extract_text_with_boxes_from_bytes(data, mime)
+        )
+
+    def call_cost(self, info: Dict[str, Any]) -> float:
+        return 0.0 if info.get("cached") else self.engine.call_cost(info)
+
+    def pop_call_info(self) -> Dict[str, Any]:
+        info = self.engine.pop_call_info()
+        info.update(super().pop_call_info())
+        return info
@@ -1,108 +1,337 @@
 import typer
-import os
-import time
-import pandas as pd
-from dotenv import load_dotenv
-from typing import Optional
-from .engines.textract import TextractEngine
-from .engines.openai import OpenAIVLMEngine
-from .data.loader import SUPPORTED_DATASETS, load_dataset_samples
-from .utils.metrics import calculate_wer, calculate_cer
-
-load_dotenv()
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from .commands.common import (
+    DEAD_LETTER_FILE,
+    METRICS_JSON,
+    METRICS_PROM,
+    _budget_note,
+    _close_all,
+    _make_runner,
+    _parse_processes,
+    _parse_profiles,
+    _qa_summary,
+    _read_manifest,
+    _report_sections,
+    _retry_note,
+    _run_and_record,
+    _truth_index,
+    _with_cache,
+)
+from .commands.loadtest import loadtest
+from .commands.merge import merge
+from .commands.sweep import sweep
+from .config import DATASET_CONFIG, get_settings
+from .engines.registry import BUILTIN_ENGINES, resolve_engines
+from .journal import RunJournal, default_run_dir
+
+# Engines, datasets, pandas and pyarrow are imported inside the commands that use
+# them so `--help` and single-engine runs stay fast (see benchmarks/bench_startup.py).
 
 app = typer.Typer()
 
+
+def _collect_questions(samples, questions: Dict[int, List[Dict]]):
+    """Pass samples through, remembering each one's questions by sample index for the QA stage."""
+
+    for sample in samples:
+        # Keep the list itself: page grouping may still append to it after the sample is yielded.
+        if "questions" in sample:
+            questions[sample["index"]] = sample["questions"]
+        yield sample
+
+
+def _answer_questions(run_dir: Path, questions: Dict[int, List[Dict]], model: Optional[str], workers: int) -> None:
+    """QA stage: ask the reader each unanswered question about every engine's transcription."""
+
+    from .engines.openai import OpenAIVLMEngine
+    from .qa import QA_FILE, answer_questions, pending_questions
+
+    items = pending_questions(run_dir, questions)
+    if not items:
+        return
+    try:
+        reader = OpenAIVLMEngine(model=model or get_settings().openai_qa_model)
+    except Exception as e:
+        print(f"Failed to initialize the QA reader: {e}")
+        return
+    print(f"Answering {len(items)} questions with {reader.model}...")
+    answers = RunJournal(run_dir, filename=QA_FILE)
+    try:
+        answer_questions(reader, items, workers=workers, on_answer=answers.append)
+    finally:
+        answers.close()
+
+
 @app.command()
 def evaluate(
-    dataset: str = typer.Option("docvqa", help=f"Dataset to use: {', '.join(SUPPORTED_DATASETS)}"),
+    dataset: str = typer.Option("docvqa", help=f"Dataset to use: {', '.join(DATASET_CONFIG)}"),
     split: Optional[str] = typer.Option(None, help="HF split to load (defaults vary by dataset)"),
-    engine: str = typer.Option("all", help="Engine to use: textract, openai, or all"),
+    engine: str = typer.Option(
+        "all", help=f"Engines to use: 'all' or a comma-separated list ({', '.join(BUILTIN_ENGINES)} or a plugin)"
+    ),
     samples: int = typer.Option(10, help="Number of samples to evaluate"),
     output: str = typer.Option("results.md", help="Output file for the report"),
+    workers: int = typer.Option(1, help="Maximum number of engine calls in flight across all engines"),
+    concurrency_per_engine: Optional[int] = typer.Option(
+        None, help="Maximum in-flight calls per engine (defaults to --workers)"
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Call engines directly without the prediction cache"),
+    refresh_cache: bool = typer.Option(
+        False, "--refresh-cache", help="Ignore cached predictions but overwrite them with fresh results"
+    ),
+    cache_dir: Optional[str] = typer.Option(None, help="Prediction cache directory (defaults to OCR_EVAL_CACHE_DIR)"),
+    gt_index: bool = typer.Option(
+        True, help="Reuse/extend the ground-truth index (extracted reference text) in the cache directory"
+    ),
+    keep_responses: bool = typer.Option(
+        True, help="Store raw Textract responses (compressed) in the cache directory for offline projection"
+    ),
+    streaming: bool = typer.Option(True, help="Stream the HF split instead of downloading it up front"),
+    prefetch: int = typer.Option(8, help="Samples to fetch and materialize ahead of the engines (0 disables)"),
+    save_images: bool = typer.Option(False, "--save-images", help="Also write each sample image to OCR_EVAL_TEMP_DIR"),
+    preprocess: str = typer.Option(
+        "original",
+        help="Preprocessing profile for all engines or per engine, e.g. 'openai=jpeg-1600,textract=original' "
+        "or 'jpeg:q80:max1600:gray'",
+    ),
+    run_dir: Optional[str] = typer.Option(
+        None, help="Directory for the run journal (defaults to runs/<dataset>-<timestamp>)"
+    ),
+    resume: Optional[str] = typer.Option(
+        None, help="Resume a run from its run directory, skipping (sample, engine) pairs that already succeeded"
+    ),
+    shard_index: int = typer.Option(0, help="Which shard of the samples this process evaluates (0-based)"),
+    num_shards: int = typer.Option(1, help="Total number of shards the samples are split into"),
+    shard_by: str = typer.Option("index", help="Shard assignment: 'index' (round-robin) or 'hash' (of sample ID)"),
+    prometheus_file: Optional[str] = typer.Option(
+        None, help="Also write stage metrics here in Prometheus text format (e.g. a node_exporter textfile dir)"
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, help="Stop admitting samples once the projected spend (USD) would exceed this budget"
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None, help="Stop admitting samples once projected prompt + completion tokens would exceed this budget"
+    ),
+    engine_processes: Optional[str] = typer.Option(
+        None,
+        help="Run CPU-bound engines in worker processes, e.g. 'tesseract=4' "
+        "(set --concurrency-per-engine to at least N)",
+    ),
+    adaptive: bool = typer.Option(
+        False, "--adaptive", help="Adapt each engine's in-flight calls (AIMD, up to --concurrency-per-engine): "
+        "grow while healthy, halve on 429/throttling or timeouts"
+    ),
+    max_attempts: int = typer.Option(
+        3, help="Tries per (sample, engine); failures are requeued with jittered backoff, then dead-lettered"
+    ),
+    retry_backoff: float = typer.Option(1.0, help="Base delay (seconds) of the exponential retry backoff"),
+    group_pages: bool = typer.Option(
+        True, help="One sample per page image with all of its questions (DocVQA), so engines run once per page"
+    ),
+    qa: bool = typer.Option(
+        False, "--qa", help="Answer the dataset's questions (DocVQA) from each engine's transcription; "
+        "adds EM / Answer F1 / ANLS to the report"
+    ),
+    qa_model: Optional[str] = typer.Option(None, help="Model answering the questions (defaults to OPENAI_QA_MODEL)"),
+    qa_processes: Optional[int] = typer.Option(
+        None, help="Worker processes for QA scoring on large runs (defaults to all cores)"
+    ),
 ):
     """
     Run OCR evaluation.
     """
-    print(f"Loading dataset: {dataset} ({samples} samples)...")
+    from .data.loader import iter_dataset_samples
+    from .report import summarize, write_report
+    from .responses import RESPONSES_FILE, ResponseStore
+    from .results import RESULTS_DIR, read_results
+
+    done = set()
+    journal = None
+    if resume:
+        manifest = _read_manifest(resume, "evaluate")
+        if manifest is None:
+            return
+        journal, config = manifest
+        # A resumed run must see the same samples and engines it started with.
+        dataset, split, samples = config["dataset"], config["split"], config["samples"]
+        engine, preprocess = config["engine"], config["preprocess"]
+        shard_index, num_shards = config.get("shard_index", 0), config.get("num_shards", 1)
+        shard_by = config.get("shard_by", "index")
+        # Runs from before page grouping have one sample per question row.
+        group_pages = config.get("group_pages", False)
+        done = journal.completed()
+        print(f"Resuming {resume}: {len(done)} results already done.")
+
     try:
-        data = load_dataset_samples(name=dataset, split=split, num_samples=samples)
-    except Exception as e:
-        print(f"Failed to load dataset '{dataset}': {e}")
+        specs = resolve_engines(engine)
+    except ValueError as e:
+        print(f"Invalid --engine: {e}")
+        return
+    process_counts = _parse_processes(engine_processes, [spec.name for spec in specs])
+    profiles = _parse_profiles(preprocess, [spec.title for spec in specs])
+    if max_attempts < 1:
+        print("Invalid --max-attempts: must be >= 1")
         return
-    
+
+    # Engines come up before the run directory and the dataset, so a run with
+    # nothing to evaluate leaves no worker processes, journal or loader behind.
     engines = {}
-    if engine in ["textract", "all"]:
+    hosts = {}
+    on_close: List[Callable[[], None]] = []
+    for spec in specs:
         try:
-            engines["Textract"] = TextractEngine()
-        except Exception as e:
-            print(f"Failed to initialize Textract: {e}")
+            options = {}
+            if spec.name == "textract":
+                settings = get_settings()
+                # Size the connection pool so every in-flight call gets a connection.
+                pool_size = max(workers, settings.textract_max_pool_connections)
+                options = {"max_pool_connections": pool_size}
+                if keep_responses and spec.name in process_counts:
+                    # The store holds an open database; it cannot be sent to worker processes.
+                    print(f"--keep-responses is not supported for process-hosted {spec.title}; not keeping responses.")
+                elif keep_responses:
+                    response_store = ResponseStore(Path(cache_dir or settings.cache_dir) / RESPONSES_FILE)
+                    on_close.append(response_store.close)
+                    options["response_store"] = response_store
+            if spec.name in process_counts:
+                from .engines.process_pool import ProcessPoolEngine
 
-    if engine in ["openai", "all"]:
-        try:
-            engines["OpenAI"] = OpenAIVLMEngine()
+                print(f"Starting {process_counts[spec.name]} {spec.title} worker process(es)...")
+                hosts[spec.title] = ProcessPoolEngine(spec.target, options, processes=process_counts[spec.name])
+                on_close.append(hosts[spec.title].close)
+                engines[spec.title] = hosts[spec.title]
+            else:
+                engines[spec.title] = spec.create(**options)
         except Exception as e:
-            print(f"Failed to initialize OpenAI: {e}")
-            
+            print(f"Failed to initialize {spec.title}: {e}")
+
     if not engines:
         print("No engines available. Exiting.")
+        _close_all(on_close)
+        return
+
+    shard_note = f", shard {shard_index + 1}/{num_shards}" if num_shards > 1 else ""
+    print(f"Loading dataset: {dataset} ({samples} samples{shard_note})...")
+    truth_index = _truth_index(gt_index, dataset, split, cache_dir)
+    try:
+        data = iter_dataset_samples(
+            name=dataset,
+            split=split,
+            num_samples=samples,
+            streaming=streaming,
+            prefetch_size=prefetch,
+            save_images=save_images,
+            shard_index=shard_index,
+            num_shards=num_shards,
+            shard_by=shard_by,
+            gt_index=truth_index,
+            group_pages=group_pages,
+        )
+    except Exception as e:
+        print(f"Failed to load dataset '{dataset}': {e}")
+        _close_all(on_close)
         return
+    if truth_index is not None:
+        on_close.append(truth_index.save)  # also covers runs that stopped before the end of the split
+    questions: Dict[int, List[Dict]] = {}
+    if qa:
+        data = _collect_questions(data, questions)
 
-    results = []
-
-    for sample in data:
-        image_path = sample["image_path"]
-        ground_truth = sample["ground_truth"]
-        
-        print(f"Processing sample {sample['id']}...")
-        
-        for name, engine_instance in engines.items():
-            start_time = time.time()
-            try:
-                prediction = engine_instance.process_image(image_path)
-                latency = time.time() - start_time
-                
-                wer = calculate_wer(ground_truth, prediction)
-                cer = calculate_cer(ground_truth, prediction)
-                
-                results.append({
-                    "Sample ID": sample["id"],
-                    "Engine": name,
-                    "Latency (s)": round(latency, 2),
-                    "WER": round(wer, 4),
-                    "CER": round(cer, 4),
-                    "Ground Truth": ground_truth[:50] + "...", # Truncate for display
-                    "Prediction": prediction[:50] + "..."
-                })
-            except Exception as e:
-                print(f"Error processing sample {sample['id']} with {name}: {e}")
-                results.append({
-                    "Sample ID": sample["id"],
-                    "Engine": name,
-                    "Latency (s)": -1,
-                    "WER": -1,
-                    "CER": -1,
-                    "Ground Truth": "Error",
-                    "Prediction": str(e)
-                })
-
-    df = pd.DataFrame(results)
-    
-    # Calculate averages
-    summary = df.groupby("Engine")[["Latency (s)", "WER", "CER"]].mean().reset_index()
-    
-    print("\nEvaluation Complete!")
+    if journal is None:
+        default_dir = default_run_dir(dataset if num_shards == 1 else f"{dataset}-shard{shard_index}of{num_shards}")
+        journal = RunJournal(run_dir or default_dir)
+        journal.write_config({
+            "mode": "evaluate",
+            "dataset": dataset,
+            "split": split,
+            "samples": samples,
+            "engine": engine,
+            "preprocess": preprocess,
+            "shard_index": shard_index,
+            "num_shards": num_shards,
+            "shard_by": shard_by,
+            "group_pages": group_pages,
+        })
+
+    engines, cache = _with_cache(engines, no_cache, refresh_cache, cache_dir)
+    dead_letters = RunJournal(journal.run_dir, filename=DEAD_LETTER_FILE)
+    runner = _make_runner(
+        engines,
+        profiles,
+        journal,
+        dead_letters,
+        workers=workers,
+        concurrency_per_engine=concurrency_per_engine,
+        max_cost=max_cost,
+        max_tokens=max_tokens,
+        adaptive=adaptive,
+        max_attempts=max_attempts,
+        retry_backoff=retry_backoff,
+    )
+    if cache is not None:
+        on_close.append(cache.close)
+    interrupted = _run_and_record(runner, data, done, journal, dead_letters, on_close)
+
+    qa_note = None
+    if qa:
+        qa_note = f"{sum(map(len, questions.values()))} questions on {len(questions)} pages"
+        print(f"QA: {qa_note}")
+    if qa and not interrupted:
+        _answer_questions(journal.run_dir, questions, qa_model, workers)
+    stats = runner.stats
+    telemetry = runner.telemetry
+    telemetry.write_json(journal.run_dir / METRICS_JSON)
+    labels = {"dataset": dataset}
+    telemetry.write_prometheus(journal.run_dir / METRICS_PROM, labels=labels)
+    if prometheus_file:
+        telemetry.write_prometheus(prometheus_file, labels=labels)
+
+    # The report always comes from the store so resumed runs include earlier results.
+    df = read_results([journal.run_dir], texts=False)
+    if df.empty:
+        print("No results recorded.")
+        return
+    qa_summary = _qa_summary([journal.run_dir], qa_processes)
+    summary = summarize(df, qa_summary)
+    cache_lines = [f"- {name}: {eng.hits} hits, {eng.misses} misses" for name, eng in engines.items()] if cache else []
+
+    throughput = (
+        f"{stats.throughput:.2f} pages/s ({stats.pages} pages, {stats.calls} calls in {stats.wall_time:.1f}s, "
+        f"workers={runner.workers}, per-engine={runner.concurrency_per_engine})"
+    )
+    retry_note = _retry_note(stats, max_attempts, dead_letters)
+
+    print("\nEvaluation Interrupted!" if interrupted else "\nEvaluation Complete!")
     print(summary)
-    
+    print(f"Throughput: {throughput}")
+    print(f"Retries: {retry_note}")
+    budget_note = _budget_note(runner.budget, stats.budget_exhausted)
+    if budget_note:
+        print(f"Budget: {budget_note}")
+    if cache_lines:
+        print("Cache:\n" + "\n".join(cache_lines))
+
     # Generate Markdown report
-    with open(output, "w") as f:
-        f.write("# OCR Evaluation Results\n\n")
-        f.write("## Summary\n\n")
-        f.write(summary.to_markdown(index=False))
-        f.write("\n\n## Detailed Results\n\n")
-        f.write(df.to_markdown(index=False))
-        
+    write_report(
+        output,
+        summary,
+        header=[
+            f"Run directory: `{journal.run_dir}` (full per-sample results in `{RESULTS_DIR}/`)",
+            f"**Throughput:** {throughput}",
+            f"**Retries:** {retry_note}",
+        ]
+        + ([f"**Budget:** {budget_note}"] if budget_note else [])
+        + ([f"**QA:** {qa_note}"] if qa_note else []),
+        sections=_report_sections(df, qa_summary, runner, hosts, cache_lines),
+    )
     print(f"Report saved to {output}")
 
+
+# The other commands live in ocr_eval.commands; registered after evaluate to keep the --help order.
+app.command()(sweep)
+app.command()(merge)
+app.command()(loadtest)
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,5 @@
+"""CLI commands besides ``evaluate``, registered on the app in :mod:`ocr_eval.cli`.
+
+Like ``evaluate``, each command imports engines, datasets, pandas and pyarrow only
+when it runs, so importing these modules keeps ``--help`` fast.
+"""
@@ -0,0 +1,259 @@
+"""Helpers shared by the CLI commands: option parsing, caches, runners, run directories and reports."""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import typer
+
+from ..budget import BudgetScheduler
+from ..cache import CachedEngine, PredictionCache
+from ..config import DATASET_CONFIG, get_settings
+from ..journal import RUN_FILE, RunJournal
+
+METRICS_JSON = "metrics.json"
+METRICS_PROM = "metrics.prom"
+# Pairs that still failed after every retry, one JSON record per line.
+DEAD_LETTER_FILE = "dead_letter.jsonl"
+
+
+def _parse_profiles(spec: str, engine_names) -> dict:
+    """Parse ``profile`` or ``engine=profile,engine=profile`` into per-engine profiles.
+
+    Raises :class:`typer.BadParameter` for unknown profiles and for engines that are not selected.
+    """
+
+    from ..preprocess import parse_profile
+
+    engine_names = list(engine_names)
+    profiles = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        key, sep, value = part.partition("=")
+        targets = [n for n in engine_names if n.lower() == key.strip().lower()] if sep else engine_names
+        if not targets:
+            raise typer.BadParameter(
+                f"{key.strip()!r} is not a selected engine (selected: {', '.join(engine_names)})",
+                param_hint="'--preprocess'",
+            )
+        try:
+            profile = parse_profile(value if sep else key)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="'--preprocess'") from e
+        for name in targets:
+            profiles[name] = profile
+    return profiles
+
+
+def _parse_processes(spec: Optional[str], engine_names: Sequence[str]) -> Dict[str, int]:
+    """Parse ``engine=N,engine=N`` into worker-process counts keyed by (selected) engine name."""
+
+    counts = {}
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, sep, value = part.partition("=")
+        if not sep or not value.strip().isdigit() or int(value) < 1:
+            raise typer.BadParameter(f"expected engine=N with N >= 1, got {part!r}", param_hint="'--engine-processes'")
+        name = name.strip().lower()
+        if name not in engine_names:
+            raise typer.BadParameter(
+                f"{name!r} is not a selected engine (selected: {', '.join(engine_names)})",
+                param_hint="'--engine-processes'",
+            )
+        counts[name] = int(value)
+    return counts
+
+
+def _read_manifest(resume: str, mode: str) -> Optional[Tuple[RunJournal, Dict]]:
+    """Journal and ``run.json`` of a run to resume, provided the ``mode`` command started it."""
+
+    journal = RunJournal(resume)
+    config = journal.read_config()
+    if config is None:
+        print(f"No run found in {resume} (missing {RUN_FILE}).")
+        return None
+    # Runs from before sweeps existed were all started by evaluate.
+    started = config.get("mode", "evaluate")
+    if started != mode:
+        print(f"{resume} was started by `{started}`; continue it with `{started} --resume {resume}`.")
+        return None
+    return journal, config
+
+
+def _truth_index(enabled: bool, dataset: str, split: Optional[str], cache_dir: Optional[str]):
+    """The dataset split's ground-truth index in the cache directory, if enabled and known."""
+
+    if not enabled or dataset.lower() not in DATASET_CONFIG:
+        return None
+    from ..data.gt_index import GroundTruthIndex, default_index_path
+
+    index_split = split or DATASET_CONFIG[dataset.lower()]["default_split"]
+    return GroundTruthIndex(default_index_path(cache_dir or get_settings().cache_dir, dataset.lower(), index_split))
+
+
+def _prediction_cache(cache_dir: Optional[str]) -> PredictionCache:
+    settings = get_settings()
+    return PredictionCache(
+        Path(cache_dir or settings.cache_dir) / "predictions.sqlite",
+        max_bytes=int(settings.cache_max_mb * 1024 * 1024) if settings.cache_max_mb else None,
+        max_age_days=settings.cache_max_age_days or None,
+    )
+
+
+def _with_cache(
+    engines: Dict, no_cache: bool, refresh_cache: bool, cache_dir: Optional[str]
+) -> Tuple[Dict, Optional[PredictionCache]]:
+    """``engines`` wrapped in the prediction cache (unless ``no_cache``), and the cache to close."""
+
+    if no_cache:
+        return engines, None
+    cache = _prediction_cache(cache_dir)
+    return {name: CachedEngine(eng, cache, refresh=refresh_cache) for name, eng in engines.items()}, cache
+
+
+def _budget_scheduler(
+    journal: RunJournal, max_cost: Optional[float], max_tokens: Optional[int]
+) -> Optional[BudgetScheduler]:
+    if max_cost is None and max_tokens is None:
+        return None
+    # A resumed run keeps counting against the budget from what it already spent.
+    spent_cost, spent_tokens = journal.spend()
+    return BudgetScheduler(max_cost, max_tokens, spent_cost=spent_cost, spent_tokens=spent_tokens)
+
+
+def _budget_note(budget: Optional[BudgetScheduler], exhausted: bool) -> Optional[str]:
+    if budget is None:
+        return None
+    limits = ", ".join(
+        f"{label} {spent:,.4g} of {limit:,.4g}"
+        for label, spent, limit in (
+            ("cost ($)", budget.spent_cost, budget.max_cost),
+            ("tokens", budget.spent_tokens, budget.max_tokens),
+        )
+        if limit is not None
+    )
+    stopped = " (budget reached; remaining samples were not run)" if exhausted else ""
+    return f"{limits}{stopped}"
+
+
+def _make_runner(
+    engines: Dict,
+    profiles: Dict,
+    journal: RunJournal,
+    dead_letters: RunJournal,
+    *,
+    workers: int,
+    concurrency_per_engine: Optional[int],
+    max_cost: Optional[float],
+    max_tokens: Optional[int],
+    adaptive: bool,
+    max_attempts: int,
+    retry_backoff: float,
+) -> "EvaluationRunner":
+    from ..runner import EvaluationRunner
+
+    return EvaluationRunner(
+        engines,
+        workers=workers,
+        concurrency_per_engine=concurrency_per_engine,
+        profiles=profiles,
+        budget=_budget_scheduler(journal, max_cost, max_tokens),
+        adaptive=adaptive,
+        max_attempts=max_attempts,
+        retry_backoff=retry_backoff,
+        dead_letter=dead_letters.append,
+    )
+
+
+def _run_and_record(
+    runner: "EvaluationRunner",
+    data,
+    done,
+    journal: RunJournal,
+    dead_letters: RunJournal,
+    on_close: Sequence[Callable[[], None]] = (),
+) -> bool:
+    """Run ``runner`` over ``data``, journaling and storing each row as it finishes.
+
+    The journal, dead letters and results store are closed, and ``on_close`` called,
+    however the run ends. Returns whether it was interrupted.
+    """
+
+    store = _open_store(journal)
+
+    def record(index: int, row: Dict) -> None:
+        journal.append(index, row)
+        store.append(index, row)
+
+    try:
+        for _ in runner.run(data, done=done, on_result=record):
+            pass
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; finished results are in {journal.path}. Continue with --resume {journal.run_dir}")
+        return True
+    finally:
+        journal.close()
+        dead_letters.close()
+        store.close()
+        _close_all(on_close)
+    return False
+
+
+def _close_all(on_close: Sequence[Callable[[], None]]) -> None:
+    for close in on_close:
+        close()
+
+
+def _retry_note(stats, max_attempts: int, dead_letters: RunJournal) -> str:
+    note = f"{stats.retries} requeued, {stats.dead_letters} dead-lettered (max {max_attempts} attempts)"
+    if stats.dead_letters:
+        note += f", see `{dead_letters.path}`"
+    return note
+
+
+def _report_sections(df, qa_summary=None, runner=None, hosts=None, cache_lines: Sequence[str] = ()) -> Dict[str, str]:
+    """Report sections from result rows, plus this session's timings when ``runner`` is given."""
+
+    from ..report import concurrency_table, payload_table, retry_table, stage_table, usage_table, worker_table
+
+    tables = {
+        "Question Answering": (qa_summary, ".4g"),
+        "Payload Size vs Latency and Accuracy": (payload_table(df), "g"),
+        "Retries and Throttling": (retry_table(df), "g"),
+        "Usage and Cost": (usage_table(df), ".4g"),
+    }
+    if runner is not None:
+        tables["Stage Latency (this session)"] = (stage_table(runner.telemetry), ".4g")
+        tables["Adaptive Concurrency (this session)"] = (concurrency_table(runner.controllers), "g")
+    if hosts:
+        tables["Worker Processes (this session)"] = (worker_table(hosts), ".4g")
+    sections = {
+        title: table.to_markdown(index=False, floatfmt=floatfmt)
+        for title, (table, floatfmt) in tables.items()
+        if table is not None and not table.empty
+    }
+    if cache_lines:
+        sections["Cache"] = "\n".join(cache_lines)
+    return sections
+
+
+def _open_store(journal: RunJournal) -> "ResultStore":
+    """The run's results store, rebuilt from the journal if a session died before closing its part."""
+
+    from ..results import ResultStore
+
+    store = ResultStore(journal.run_dir)
+    if store.sync(journal.records(), sum(1 for _ in journal.records())):
+        print(f"Rebuilt {store.path} from {journal.path}.")
+    return store
+
+
+def _qa_summary(run_dirs: List, processes: Optional[int] = None):
+    """Per-engine QA table over the answers recorded in ``run_dirs`` (empty if there are none)."""
+
+    import pandas as pd
+
+    from ..qa import read_answers, score_answer_frame
+    from ..report import qa_table
+
+    answers = read_answers(run_dirs)
+    if answers.empty:
+        return pd.DataFrame()
+    return qa_table(score_answer_frame(answers, processes=processes))
@@ -0,0 +1,127 @@
+"""``loadtest``: drive the real engine code paths against local fake services."""
+
+from typing import Dict, Optional
+
+import typer
+
+from ..engines.registry import resolve_engines
+from .common import _parse_profiles
+
+
+def loadtest(
+    engine: str = typer.Option("all", help="Engine code path to drive: textract, openai, or all"),
+    pages: int = typer.Option(1000, help="Number of synthetic pages to push through each engine"),
+    workers: int = typer.Option(32, help="Maximum number of engine calls in flight across all engines"),
+    concurrency_per_engine: Optional[int] = typer.Option(None, help="Maximum in-flight calls per engine"),
+    latency: str = typer.Option(
+        "lognormal:0.3:0.5", help="Service latency: seconds or uniform:a:b, exp:mean, normal:mean:sd, lognormal:median:sigma"
+    ),
+    throttle_rate: float = typer.Option(0.02, help="Fraction of requests rejected with 429 / ThrottlingException"),
+    error_rate: float = typer.Option(0.01, help="Fraction of requests failing with a 5xx error"),
+    reply_chars: int = typer.Option(2000, help="Size of the transcription each fake service returns"),
+    page_width: int = typer.Option(1000, help="Synthetic page width in pixels"),
+    page_height: int = typer.Option(1300, help="Synthetic page height in pixels"),
+    preprocess: str = typer.Option("original", help="Preprocessing profile(s), as for evaluate"),
+    openai_max_retries: int = typer.Option(4, help="OpenAI SDK retries per call"),
+    textract_max_attempts: Optional[int] = typer.Option(None, help="botocore attempts per call (TEXTRACT_MAX_ATTEMPTS)"),
+    seed: int = typer.Option(0, help="Seed for latency and fault injection"),
+    adaptive: bool = typer.Option(False, "--adaptive", help="Adapt per-engine in-flight calls (AIMD), as for evaluate"),
+    output: str = typer.Option("loadtest.md", help="Output file for the load-test report"),
+):
+    """
+    Drive the real engine code paths against local fake services to tune concurrency and timeouts.
+    """
+    import pandas as pd
+
+    from ..fakes import FakeOpenAIServer, FakeTextractServer, synthetic_page, synthetic_samples, synthetic_text
+    from ..report import concurrency_table, loadtest_table, stage_table, write_report
+    from ..runner import EvaluationRunner
+
+    try:
+        selected = {spec.name for spec in resolve_engines(engine)}
+    except ValueError as e:
+        print(f"Invalid --engine: {e}")
+        return
+    if pages < 1:
+        print("Invalid --pages: must be >= 1")
+        return
+    # Only the built-in engines have fake services to run against.
+    for name in sorted(selected - {"textract", "openai"}):
+        print(f"No fake service for engine {name!r}; skipping it.")
+
+    reply = synthetic_text(reply_chars, seed=seed)
+    faults = {"latency": latency, "throttle_rate": throttle_rate, "error_rate": error_rate}
+    servers: Dict[str, object] = {}
+    engines = {}
+    try:
+        if "textract" in selected:
+            import boto3
+
+            from ..engines.textract import TextractEngine
+
+            servers["Textract"] = FakeTextractServer(reply=reply, seed=seed, **faults).start()
+            # Static fake credentials: the stub does not verify signatures.
+            session = boto3.Session(aws_access_key_id="fake", aws_secret_access_key="fake", region_name="us-east-1")
+            engines["Textract"] = TextractEngine(
+                session=session,
+                endpoint_url=servers["Textract"].endpoint_url,
+                max_pool_connections=workers,
+                max_attempts=textract_max_attempts,
+            )
+        if "openai" in selected:
+            from ..engines.openai import OpenAIVLMEngine
+
+            # Offset the seed so the two services do not fail in lockstep.
+            servers["OpenAI"] = FakeOpenAIServer(reply=reply, seed=seed + 1, **faults).start()
+            engines["OpenAI"] = OpenAIVLMEngine(
+                api_key="sk-fake",
+                base_url=servers["OpenAI"].base_url,
+                max_connections=workers,
+                max_retries=openai_max_retries,
+            )
+        if not engines:
+            print("No engines selected. Use --engine textract, openai, or all.")
+            return
+        profiles = _parse_profiles(preprocess, engines)
+
+        samples = synthetic_samples(pages, page=synthetic_page(page_width, page_height), gt_chars=0)
+        for sample in samples:
+            sample["ground_truth"] = reply
+        runner = EvaluationRunner(
+            engines,
+            workers=workers,
+            concurrency_per_engine=concurrency_per_engine,
+            profiles=profiles,
+            quiet=True,
+            adaptive=adaptive,
+        )
+        print(f"Load test: {pages} pages x {len(engines)} engine(s), workers={workers}, latency={latency}, "
+              f"throttle={throttle_rate:.1%}, 5xx={error_rate:.1%}")
+        df = pd.DataFrame(list(runner.run(samples)))
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    stats = runner.stats
+    table = loadtest_table(df, stats.wall_time, servers, runner.telemetry)
+    throughput = f"{stats.throughput:.2f} pages/s, {stats.call_rate:.2f} calls/s over {stats.wall_time:.1f}s"
+    print(table.to_string(index=False))
+    print(f"Sustained throughput: {throughput}")
+    write_report(
+        output,
+        table,
+        header=[
+            f"**Load test:** {pages} synthetic pages, workers={runner.workers}, per-engine={runner.concurrency_per_engine}",
+            f"**Faults:** latency `{latency}`, throttle {throttle_rate:.1%}, 5xx {error_rate:.1%}, seed {seed}",
+            f"**Sustained throughput:** {throughput}",
+        ],
+        sections={
+            "Stage Latency": stage_table(runner.telemetry).to_markdown(index=False, floatfmt=".4g"),
+            **(
+                {"Adaptive Concurrency": concurrency_table(runner.controllers).to_markdown(index=False)}
+                if runner.controllers
+                else {}
+            ),
+        },
+    )
+    print(f"Load-test report saved to {output}")
@@ -0,0 +1,63 @@
+"""``merge``: one report over several run directories (e.g. the shards of a run)."""
+
+from pathlib import Path
+from typing import List
+
+import typer
+
+from ..journal import JOURNAL_FILE, RunJournal
+from .common import _open_store, _qa_summary, _report_sections
+
+
+def merge(
+    run_dirs: List[str] = typer.Argument(..., help="Run directories (e.g. one per shard) to combine"),
+    output: str = typer.Option("results.md", help="Output file for the merged report"),
+):
+    """
+    Merge run journals (e.g. shards) into one report with global averages and percentiles.
+    """
+    from ..report import summarize, write_report
+    from ..results import read_results
+
+    missing = [d for d in run_dirs if not (Path(d) / JOURNAL_FILE).exists()]
+    if missing:
+        print(f"No journal found in: {', '.join(missing)}")
+        return
+    # Results are keyed by (sample index, engine), so only shards of one run can be
+    # merged: everything in run.json but the shard index must match.
+    configs = [RunJournal(d).read_config() or {} for d in run_dirs]
+    options = [{k: v for k, v in c.items() if k != "shard_index"} for c in configs]
+    differing = [k for k in sorted({k for c in options for k in c}) if len({repr(c.get(k)) for c in options}) > 1]
+    if differing:
+        print(f"Cannot merge runs started with different options ({', '.join(differing)}); "
+              "merge the shards of one run.")
+        return
+    shard_indices = [c.get("shard_index", 0) for c in configs]
+    repeated = sorted({i for i in shard_indices if shard_indices.count(i) > 1})
+    if repeated:
+        print(f"Cannot merge: shard(s) {', '.join(map(str, repeated))} appear in more than one run directory.")
+        return
+    num_shards = configs[0].get("num_shards", 1)
+    if len(shard_indices) != num_shards:
+        print(f"Warning: got {len(shard_indices)} distinct shard(s) of {num_shards}; the merged report is partial.")
+
+    for run_dir in run_dirs:
+        _open_store(RunJournal(run_dir)).close()
+    df = read_results(run_dirs, texts=False)
+    if df.empty:
+        print("No results found in the given run directories.")
+        return
+    # Rows carry raw counts, so global means, corpus rates and percentiles are recomputed
+    # over all samples rather than averaged across shard summaries.
+    qa_summary = _qa_summary(run_dirs)
+    summary = summarize(df, qa_summary)
+    sections = _report_sections(df, qa_summary)
+
+    print(summary)
+    write_report(
+        output,
+        summary,
+        header=[f"Merged from: {', '.join(f'`{d}`' for d in run_dirs)}", f"**Results:** {len(df)} rows"],
+        sections=sections,
+    )
+    print(f"Merged report saved to {output}")
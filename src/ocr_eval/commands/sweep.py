@@ -0,0 +1,206 @@
+"""``sweep``: compare OpenAI configurations (models, prompts, token limits, profiles) in one run."""
+
+from typing import Optional
+
+import typer
+
+from ..config import DATASET_CONFIG, get_settings
+from ..journal import RunJournal, default_run_dir
+from .common import (
+    DEAD_LETTER_FILE,
+    METRICS_JSON,
+    _budget_note,
+    _make_runner,
+    _read_manifest,
+    _report_sections,
+    _retry_note,
+    _run_and_record,
+    _truth_index,
+    _with_cache,
+)
+
+
+def sweep(
+    dataset: str = typer.Option("docvqa", help=f"Dataset to use: {', '.join(DATASET_CONFIG)}"),
+    split: Optional[str] = typer.Option(None, help="HF split to load (defaults vary by dataset)"),
+    samples: int = typer.Option(10, help="Number of samples to evaluate"),
+    models: Optional[str] = typer.Option(None, help="Comma-separated OpenAI models (defaults to OPENAI_MODEL)"),
+    prompts: str = typer.Option(
+        "default", help="Comma-separated transcription prompts: presets (default, layout, verbatim) or @file"
+    ),
+    max_completion_tokens: str = typer.Option("1024", help="Comma-separated completion-token limits"),
+    preprocess: str = typer.Option(
+        "original", help="Comma-separated preprocessing profiles, e.g. 'original,jpeg-1600,jpeg:q80:max1600:gray'"
+    ),
+    output: str = typer.Option("sweep.md", help="Output file for the comparative report"),
+    workers: int = typer.Option(8, help="Maximum number of calls in flight across all configurations"),
+    concurrency_per_engine: Optional[int] = typer.Option(
+        None, help="Maximum in-flight calls per configuration (defaults to --workers)"
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Call the API directly without the prediction cache"),
+    refresh_cache: bool = typer.Option(
+        False, "--refresh-cache", help="Ignore cached predictions but overwrite them with fresh results"
+    ),
+    cache_dir: Optional[str] = typer.Option(None, help="Prediction cache directory (defaults to OCR_EVAL_CACHE_DIR)"),
+    gt_index: bool = typer.Option(
+        True, help="Reuse/extend the ground-truth index (extracted reference text) in the cache directory"
+    ),
+    streaming: bool = typer.Option(True, help="Stream the HF split instead of downloading it up front"),
+    prefetch: int = typer.Option(8, help="Samples to fetch and materialize ahead of the engines (0 disables)"),
+    group_pages: bool = typer.Option(True, help="One sample per page image (DocVQA), as for evaluate"),
+    run_dir: Optional[str] = typer.Option(
+        None, help="Directory for the run journal (defaults to runs/<dataset>-sweep-<timestamp>)"
+    ),
+    resume: Optional[str] = typer.Option(
+        None, help="Resume a sweep from its run directory, skipping (sample, configuration) pairs that succeeded"
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, help="Stop admitting samples once the projected spend (USD) would exceed this budget"
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None, help="Stop admitting samples once projected prompt + completion tokens would exceed this budget"
+    ),
+    adaptive: bool = typer.Option(False, "--adaptive", help="Adapt each configuration's in-flight calls (AIMD)"),
+    max_attempts: int = typer.Option(3, help="Tries per (sample, configuration) before dead-lettering"),
+    retry_backoff: float = typer.Option(1.0, help="Base delay (seconds) of the exponential retry backoff"),
+):
+    """
+    Compare OpenAI models, prompts, token limits and preprocessing profiles in one run.
+
+    Every combination runs concurrently on the same samples, each loaded once and
+    encoded once per profile, and the report ranks the configurations side by side.
+    """
+    from ..data.loader import iter_dataset_samples
+    from ..report import summarize, sweep_table, write_report
+    from ..results import RESULTS_DIR, read_results
+    from ..sweep import build_engines, sweep_matrix
+
+    done = set()
+    if resume:
+        manifest = _read_manifest(resume, "sweep")
+        if manifest is None:
+            return
+        journal, config = manifest
+        # A resumed sweep must see the same samples and configurations it started with.
+        dataset, split, samples = config["dataset"], config["split"], config["samples"]
+        models, prompts = config["models"], config["prompts"]
+        max_completion_tokens, preprocess = config["max_completion_tokens"], config["preprocess"]
+        group_pages = config["group_pages"]
+        done = journal.completed()
+        print(f"Resuming {resume}: {len(done)} results already done.")
+    else:
+        models = models or get_settings().openai_model
+        journal = RunJournal(run_dir or default_run_dir(f"{dataset}-sweep"))
+        journal.write_config({
+            "mode": "sweep",
+            "dataset": dataset,
+            "split": split,
+            "samples": samples,
+            "models": models,
+            "prompts": prompts,
+            "max_completion_tokens": max_completion_tokens,
+            "preprocess": preprocess,
+            "group_pages": group_pages,
+        })
+
+    try:
+        configs = sweep_matrix(models, prompts, max_completion_tokens, preprocess)
+    except (OSError, ValueError) as e:
+        print(f"Invalid sweep matrix: {e}")
+        return
+    if max_attempts < 1:
+        print("Invalid --max-attempts: must be >= 1")
+        return
+    try:
+        engines = build_engines(configs)
+    except Exception as e:
+        print(f"Failed to initialize OpenAI: {e}")
+        return
+    profile_names = sorted({config.profile.name for config in configs})
+    print(f"Sweeping {len(configs)} configurations over {samples} {dataset} samples:")
+    for config in configs:
+        print(f"- {config.name}")
+
+    truth_index = _truth_index(gt_index, dataset, split, cache_dir)
+    try:
+        data = iter_dataset_samples(
+            name=dataset,
+            split=split,
+            num_samples=samples,
+            streaming=streaming,
+            prefetch_size=prefetch,
+            gt_index=truth_index,
+            group_pages=group_pages,
+        )
+    except Exception as e:
+        print(f"Failed to load dataset '{dataset}': {e}")
+        return
+
+    engines, cache = _with_cache(engines, no_cache, refresh_cache, cache_dir)
+    dead_letters = RunJournal(journal.run_dir, filename=DEAD_LETTER_FILE)
+    runner = _make_runner(
+        engines,
+        {config.name: config.profile for config in configs},
+        journal,
+        dead_letters,
+        workers=workers,
+        concurrency_per_engine=concurrency_per_engine,
+        max_cost=max_cost,
+        max_tokens=max_tokens,
+        adaptive=adaptive,
+        max_attempts=max_attempts,
+        retry_backoff=retry_backoff,
+    )
+    on_close = [truth_index.save] if truth_index is not None else []
+    if cache is not None:
+        on_close.append(cache.close)
+    interrupted = _run_and_record(runner, data, done, journal, dead_letters, on_close)
+
+    stats = runner.stats
+    runner.telemetry.write_json(journal.run_dir / METRICS_JSON)
+    df = read_results([journal.run_dir], texts=False)
+    if df.empty:
+        print("No results recorded.")
+        return
+    comparison = sweep_table(df, [config.as_row() for config in configs])
+
+    matrix = " x ".join(
+        f"{len(set(values))} {label}"
+        for label, values in (
+            ("models", [c.model for c in configs]),
+            ("prompts", [c.prompt for c in configs]),
+            ("token limits", [c.max_completion_tokens for c in configs]),
+            ("profiles", profile_names),
+        )
+    )
+    shared = (
+        f"{stats.pages} pages loaded once; {len(profile_names)} payload(s) per page shared by "
+        f"{len(configs)} configurations ({stats.calls} calls in {stats.wall_time:.1f}s, workers={runner.workers})"
+    )
+    retry_note = _retry_note(stats, max_attempts, dead_letters)
+    budget_note = _budget_note(runner.budget, stats.budget_exhausted)
+
+    print("\nSweep Interrupted!" if interrupted else "\nSweep Complete!")
+    print(comparison.to_string(index=False))
+    print(f"Shared work: {shared}")
+    print(f"Retries: {retry_note}")
+    if budget_note:
+        print(f"Budget: {budget_note}")
+
+    sections = {
+        "Per-Configuration Details": summarize(df).to_markdown(index=False, floatfmt=".4g"),
+        **_report_sections(df, runner=runner),
+    }
+    write_report(
+        output,
+        comparison,
+        header=[
+            f"Run directory: `{journal.run_dir}` (full per-sample results in `{RESULTS_DIR}/`)",
+            f"**Sweep:** {matrix} = {len(configs)} configurations, best corpus CER first",
+            f"**Shared work:** {shared}",
+            f"**Retries:** {retry_note}",
+        ]
+        + ([f"**Budget:** {budget_note}"] if budget_note else []),
+        sections=sections,
+    )
+    print(f"Sweep report saved to {output}")
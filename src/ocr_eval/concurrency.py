@@ -0,0 +1,208 @@
+"""Adaptive per-engine concurrency and delayed retries for the runner.
+
+:class:`AIMDController` caps one engine's in-flight calls at a limit that adapts
+like TCP congestion control. The limit starts low and grows by one per
+successful call (slow start) until the first backoff. After that it grows by
+one per window of ``limit`` healthy successes (additive increase). Whenever a
+call is throttled (HTTP 429, ``ThrottlingException``...) or times out, the
+limit is multiplied by ``decrease``. A burst of such signals from calls that
+were already in flight only counts once. Growth pauses while the smoothed
+latency is well above its best level or the recent error rate is high.
+
+:class:`RetryScheduler` runs callbacks after a delay on one background
+thread. The runner uses it as its retry queue: failed calls are resubmitted
+after a jittered exponential backoff (:func:`backoff_delay`).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Seconds; latencies below this never count as degraded.
+_LATENCY_FLOOR = 0.05
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0, rng: Optional[random.Random] = None) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**(attempt - 1))]``."""
+
+    return (rng or random).uniform(0.0, min(cap, base * 2 ** max(0, attempt - 1)))
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on one engine's in-flight calls.
+
+    Args:
+        maximum: Upper bound for the limit (e.g. the engine's thread-pool size).
+        initial: Starting limit; defaults to ``min(4, maximum)``.
+        minimum: Lower bound for the limit.
+        decrease: Factor applied to the limit on throttling or a timeout.
+        latency_tolerance: Hold the limit while the latency EWMA exceeds this
+            multiple of the lowest EWMA seen.
+        error_tolerance: Hold the limit while more than this fraction of the last
+            ``window`` calls failed (other than by throttling/timeouts).
+        window: Number of recent outcomes used for the error rate.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        initial: Optional[int] = None,
+        minimum: int = 1,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        error_tolerance: float = 0.1,
+        window: int = 50,
+    ):
+        if maximum < minimum or minimum < 1:
+            raise ValueError("need 1 <= minimum <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be in (0, 1)")
+        self.maximum = maximum
+        self.minimum = minimum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.error_tolerance = error_tolerance
+        self.limit = max(minimum, min(maximum, initial if initial is not None else 4))
+        self.in_flight = 0
+        self.peak = self.limit
+        self.increases = 0
+        self.decreases = 0
+        self.signals: Dict[str, int] = {"throttled": 0, "timeout": 0, "error": 0}
+        self._slow_start = True
+        self._epoch = 0  # bumped on every decrease
+        self._successes = 0
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._recent: deque = deque(maxlen=window)
+        self._cond = threading.Condition()
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns a token to pass to :meth:`release`."""
+
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+            return self._epoch
+
+    def release(self, token: int, outcome: str, latency: Optional[float] = None) -> None:
+        """Free the slot and adapt the limit.
+
+        Args:
+            token: What :meth:`acquire` returned for this call.
+            outcome: ``"ok"``, or an :func:`~ocr_eval.engines.base.error_kind`.
+            latency: Seconds the call took (successful calls).
+        """
+
+        with self._cond:
+            self.in_flight -= 1
+            self._recent.append(outcome == "error")
+            if outcome in ("throttled", "timeout"):
+                self.signals[outcome] += 1
+                # Calls that started before the last decrease saw the old limit; don't punish twice.
+                if token == self._epoch:
+                    self._backoff()
+            elif outcome == "error":
+                self.signals["error"] += 1
+            else:
+                self._on_success(latency)
+            self._cond.notify_all()
+
+    def _backoff(self) -> None:
+        new_limit = max(self.minimum, int(self.limit * self.decrease))
+        self._epoch += 1
+        self._slow_start = False
+        self._successes = 0
+        if new_limit < self.limit:
+            self.limit = new_limit
+            self.decreases += 1
+
+    def _healthy(self) -> bool:
+        if self._recent and sum(self._recent) / len(self._recent) > self.error_tolerance:
+            return False
+        if self._latency is None:
+            return True
+        # The floor keeps jitter on near-instant calls from reading as congestion.
+        return self._latency <= self.latency_tolerance * max(self._best_latency, _LATENCY_FLOOR)
+
+    def _on_success(self, latency: Optional[float]) -> None:
+        if latency is not None:
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            self._best_latency = self._latency if self._best_latency is None else min(self._best_latency, self._latency)
+        if self.limit >= self.maximum or not self._healthy():
+            return
+        self._successes += 1
+        if self._slow_start or self._successes >= self.limit:
+            self._successes = 0
+            self.limit += 1
+            self.increases += 1
+            self.peak = max(self.peak, self.limit)
+
+    def as_row(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "Limit": self.limit,
+                "Peak Limit": self.peak,
+                "Max": self.maximum,
+                "Increases": self.increases,
+                "Decreases": self.decreases,
+                "Throttled": self.signals["throttled"],
+                "Timeouts": self.signals["timeout"],
+                "Errors": self.signals["error"],
+            }
+
+
+class RetryScheduler:
+    """Run callbacks after a delay on one daemon thread (the runner's retry queue)."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("retry scheduler is closed")
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="ocr-retry", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                _, _, callback = heapq.heappop(self._heap)
+            # One failing callback must not take the only retry thread down with it.
+            try:
+                callback()
+            except Exception as e:
+                print(f"Retry callback failed: {e!r}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Drop pending callbacks and stop the thread."""
+
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
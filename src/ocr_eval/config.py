@@ -7,22 +7,62 @@ so engines/CLI don't need to repeat os.getenv logic.
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
 
-load_dotenv()
+
+def _env(name: str, default: str, cast: Callable[[str], Any] = str) -> Any:
+    # Read when Settings() is built (not at import), so .env and test overrides apply.
+    return field(default_factory=lambda: cast(os.getenv(name, default)))
+
+
+def _path(value: str) -> str:
+    # Values from .env are used verbatim, so "~/..." would otherwise become a literal "./~" directory.
+    return os.path.expanduser(os.path.expandvars(value))
 
 
 @dataclass
 class Settings:
-    openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
-    openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o")
-    aws_region: str = os.getenv("AWS_REGION", "us-east-1")
-    aws_profile: str = os.getenv("AWS_PROFILE", "textract-profile")
-    temp_dir: str = os.getenv("OCR_EVAL_TEMP_DIR", "/tmp/ocr_eval_images")
+    openai_api_key: str = _env("OPENAI_API_KEY", "")
+    openai_model: str = _env("OPENAI_MODEL", "gpt-4o")
+    openai_base_url: str = _env("OPENAI_BASE_URL", "")
+    # Reader for the QA stage (evaluate --qa): answers questions from OCR text, no image.
+    openai_qa_model: str = _env("OPENAI_QA_MODEL", "gpt-4o-mini")
+    # Client-side limits; 0 disables. Set these to the org quota to avoid 429s.
+    openai_rpm: int = _env("OPENAI_RPM", "0", int)
+    openai_tpm: int = _env("OPENAI_TPM", "0", int)
+    openai_max_connections: int = _env("OPENAI_MAX_CONNECTIONS", "32", int)
+    aws_region: str = _env("AWS_REGION", "us-east-1")
+    aws_profile: str = _env("AWS_PROFILE", "textract-profile")
+    # Textract client: pool size should cover --workers; "adaptive" retries back off on throttles.
+    textract_max_pool_connections: int = _env("TEXTRACT_MAX_POOL_CONNECTIONS", "50", int)
+    textract_retry_mode: str = _env("TEXTRACT_RETRY_MODE", "adaptive")
+    textract_max_attempts: int = _env("TEXTRACT_MAX_ATTEMPTS", "8", int)
+    textract_connect_timeout: float = _env("TEXTRACT_CONNECT_TIMEOUT", "10", float)
+    textract_read_timeout: float = _env("TEXTRACT_READ_TIMEOUT", "60", float)
+    textract_endpoint_url: str = _env("TEXTRACT_ENDPOINT_URL", "")
+    # Prices for usage/cost accounting; 0 falls back to MODEL_PRICING / TEXTRACT_PRICE_PER_PAGE.
+    openai_input_price_per_1m: float = _env("OPENAI_INPUT_PRICE_PER_1M", "0", float)
+    openai_output_price_per_1m: float = _env("OPENAI_OUTPUT_PRICE_PER_1M", "0", float)
+    textract_price_per_page: float = _env("TEXTRACT_PRICE_PER_PAGE", "0", float)
+    temp_dir: str = _env("OCR_EVAL_TEMP_DIR", "/tmp/ocr_eval_images", _path)
+    cache_dir: str = _env("OCR_EVAL_CACHE_DIR", "~/.cache/ocr_eval", _path)
+    cache_max_mb: float = _env("OCR_EVAL_CACHE_MAX_MB", "1024", float)
+    cache_max_age_days: float = _env("OCR_EVAL_CACHE_MAX_AGE_DAYS", "30", float)
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load ``.env`` into the environment once, on first use rather than at import."""
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 def get_settings() -> Settings:
+    load_env()
     return Settings()
 
 
@@ -47,3 +87,17 @@ DATASET_CONFIG = {
         "title": "CORD",
     },
 }
+
+
+# List prices in USD per 1M (input, output) tokens, used to estimate run cost.
+# Longest matching prefix wins, so dated snapshots (e.g. gpt-4o-2024-08-06) resolve too.
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+# Textract DetectDocumentText list price in USD per page (first million pages/month).
+TEXTRACT_PRICE_PER_PAGE = 0.0015
@@ -0,0 +1,117 @@
+"""Precomputed ground-truth index.
+
+Ground truth is otherwise re-extracted from the raw dataset rows on every load
+(the recursive CORD walk in particular). A :class:`GroundTruthIndex` keeps the
+extracted reference text per dataset/split and global sample index. It is stored
+as a columnar ``.npz`` sidecar (one UTF-8 blob plus offsets) and filled
+incrementally: samples already in the index skip extraction on later loads, and
+new ones are added as they are seen.
+
+Several processes (e.g. shards) may share one sidecar. :meth:`GroundTruthIndex.save`
+merges with whatever is on disk under a file lock, so no process drops another's
+entries.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves still merge, but without a lock.
+    fcntl = None
+
+# Bump when the extraction or the file layout changes so stale sidecars are rebuilt.
+INDEX_VERSION = 2
+
+
+def default_index_path(cache_dir: str | Path, dataset: str, split: str) -> Path:
+    return Path(cache_dir) / "gt_index" / f"{dataset}-{split}.npz"
+
+
+def _read_sidecar(path: Path) -> Dict[int, str]:
+    if not path.exists():
+        return {}
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != INDEX_VERSION:
+            return {}
+        blob = data["text"].tobytes()
+        offsets = data["text_offsets"]
+        return {
+            index: blob[offsets[row]:offsets[row + 1]].decode("utf-8")
+            for row, index in enumerate(data["indices"].tolist())
+        }
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_suffix(".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class GroundTruthIndex:
+    """Reference text per sample index for one dataset split.
+
+    Args:
+        path: ``.npz`` sidecar to load (if present) and save to.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._texts: Dict[int, str] = _read_sidecar(self.path)
+        self._added: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._texts
+
+    def get(self, index: int) -> Optional[str]:
+        return self._texts.get(index)
+
+    def add(self, index: int, text: str) -> None:
+        """Add (or replace) a sample's reference text."""
+
+        with self._lock:
+            self._texts[index] = text
+            self._added[index] = text
+
+    def save(self) -> None:
+        """Merge what was added since loading into the sidecar on disk."""
+
+        with self._lock:
+            if not self._added:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _locked(self.path):
+                # Re-read under the lock: another shard may have saved since we loaded.
+                texts = {**_read_sidecar(self.path), **self._added}
+                indices = sorted(texts)
+                encoded = [texts[i].encode("utf-8") for i in indices]
+                columns = {
+                    "version": np.array(INDEX_VERSION),
+                    "indices": np.array(indices, dtype=np.int64),
+                    "text": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                    "text_offsets": np.concatenate([[0], np.cumsum([len(b) for b in encoded])]).astype(np.int64),
+                }
+                # Atomic replace, so readers that don't take the lock never see a half-written sidecar.
+                tmp = self.path.with_suffix(f".{os.getpid()}.tmp.npz")
+                np.savez_compressed(tmp, **columns)
+                tmp.replace(self.path)
+            self._texts.update(texts)
+            self._added.clear()
@@ -1,26 +1,72 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from datasets import Image as ImageFeature
 from datasets import load_dataset
 
 from ..config import DATASET_CONFIG, get_settings
+from ..preprocess import sniff_mime
+from .gt_index import GroundTruthIndex
 
-settings = get_settings()
-TMP_DIR = Path(settings.temp_dir)
 SUPPORTED_DATASETS = tuple(DATASET_CONFIG.keys())
+SHARD_STRATEGIES = ("index", "hash")
 
 
-def _save_image(image, stem: str) -> str:
-    TMP_DIR.mkdir(parents=True, exist_ok=True)
-    image_path = TMP_DIR / f"{stem}.png"
-    image.save(image_path)
+_MIME_SUFFIXES = {"image/png": ".png", "image/jpeg": ".jpg", "image/tiff": ".tif", "image/webp": ".webp", "image/gif": ".gif"}
+
+
+def _image_bytes(image) -> bytes:
+    """Return the encoded bytes of a dataset image cell without re-encoding when possible.
+
+    Undecoded Arrow image cells are ``{"bytes": ..., "path": ...}`` dicts; decoded
+    PIL images (e.g. when the feature type is unknown) fall back to an in-memory PNG.
+    """
+
+    if isinstance(image, dict):
+        if image.get("bytes"):
+            return image["bytes"]
+        if image.get("path"):
+            return Path(image["path"]).read_bytes()
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def temp_dir() -> Path:
+    """Directory for saved sample images (``OCR_EVAL_TEMP_DIR``), read when first needed."""
+
+    return Path(get_settings().temp_dir)
+
+
+def _save_image(image_bytes: bytes, stem: str) -> str:
+    directory = temp_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    image_path = directory / f"{stem}{_MIME_SUFFIXES[sniff_mime(image_bytes)]}"
+    image_path.write_bytes(image_bytes)
     return str(image_path)
 
 
+def _undecoded_images(ds):
+    """Cast image columns to raw bytes so samples skip the decode/re-encode round trip."""
+
+    features = getattr(ds, "features", None) or {}
+    for column, feature in features.items():
+        if isinstance(feature, ImageFeature) and feature.decode:
+            ds = ds.cast_column(column, ImageFeature(decode=False))
+    return ds
+
+
 def _extract_docvqa_text(example: Dict) -> str:
     """Join OCR lines from the DocVQA WDS sample."""
     try:
@@ -67,63 +113,269 @@ def _extract_cord_text(example: Dict) -> str:
     return text.strip()
 
 
-def load_dataset_samples(
+def prefetch(items: Iterable[Dict], size: int) -> Iterator[Dict]:
+    """Materialize ``items`` on a background thread, keeping at most ``size`` ready ahead.
+
+    Lets download/decode/image-saving for later samples overlap with OCR on earlier
+    ones, while the bounded queue keeps memory flat. Producer errors are re-raised
+    in the consumer; closing the generator stops the producer.
+    """
+
+    if size <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+
+    def _put(value) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put(item):
+                    return
+            _put(done)
+        except BaseException as e:  # surface loader failures to the consumer
+            _put(e)
+
+    producer = threading.Thread(target=_produce, name="ocr-eval-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def _timed_rows(ds: Iterable[Dict]) -> Iterator[tuple]:
+    """Yield ``(row, seconds)`` where ``seconds`` is the time spent reading/decoding the row."""
+
+    rows = iter(ds)
+    while True:
+        start = time.perf_counter()
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        yield row, time.perf_counter() - start
+
+
+def shard_of(index: int, sample_id: Optional[str], num_shards: int, by: str = "index") -> int:
+    """Deterministically assign a sample to a shard.
+
+    ``index`` round-robins by position in the split; ``hash`` uses a stable hash
+    of the sample ID, so assignment survives changes in ordering.
+    """
+
+    if num_shards <= 1:
+        return 0
+    if by == "hash":
+        digest = hashlib.sha1(str(sample_id).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % num_shards
+    return index % num_shards
+
+
+# Dispatch to the appropriate sample builder.
+def _sample_builders() -> Dict[str, Callable[[Dict, int, Optional[str]], Dict]]:
+    return {
+        "docvqa": _build_docvqa_sample,
+        "funsd": _build_funsd_sample,
+        "cord": _build_cord_sample,
+    }
+
+
+# Datasets with one row per question about a page: (page key, the row's questions).
+def _page_groupers() -> Dict[str, Tuple[Callable[[Dict], str], Callable[[Dict, int], List[Dict]]]]:
+    return {
+        "docvqa": (_docvqa_page_key, _docvqa_questions),
+    }
+
+
+def iter_dataset_samples(
     name: str = "docvqa",
     split: Optional[str] = None,
     num_samples: Optional[int] = None,
-) -> List[Dict]:
-    """Load a supported dataset and return a list of samples with image + text."""
+    *,
+    streaming: bool = True,
+    prefetch_size: int = 8,
+    save_images: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    shard_by: str = "index",
+    gt_index: Optional[GroundTruthIndex] = None,
+    group_pages: bool = True,
+) -> Iterator[Dict]:
+    """Lazily yield samples with image bytes + text for a supported dataset.
+
+    With ``streaming`` the HF split is read incrementally instead of being
+    downloaded up front, and each sample is built only as the consumer approaches
+    it. Opening the dataset happens eagerly so that configuration errors surface
+    at call time rather than on first iteration.
+
+    Samples carry the encoded image as ``image_bytes`` straight from the Arrow
+    column. ``image_path`` is only written (under :func:`temp_dir`) when
+    ``save_images`` is set, e.g. for debugging or previews.
+
+    With ``num_shards > 1`` only the samples assigned to ``shard_index`` are
+    yielded (see :func:`shard_of`); every sample keeps its global ``index`` so
+    shard results can be merged without collisions.
+
+    With a ``gt_index`` (for this dataset and split), ground truth already in the
+    index is reused instead of re-extracted and new samples are added to it. The
+    index is saved once the split has been read to the end.
+
+    With ``group_pages``, datasets that have one row per question (DocVQA) yield
+    one sample per page image instead: the first row showing a page becomes the
+    sample (its ``index`` is that row's position), and the questions of later
+    rows with the same image are appended to its ``questions`` list, even after
+    it was yielded. Engines then run, and images are saved, once per page.
+    ``num_samples`` still counts rows.
+    """
 
     name = name.lower()
     if name not in SUPPORTED_DATASETS:
         raise ValueError(f"Unsupported dataset '{name}'. Supported: {SUPPORTED_DATASETS}")
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+    if shard_by not in SHARD_STRATEGIES:
+        raise ValueError(f"Unsupported shard_by '{shard_by}'. Supported: {SHARD_STRATEGIES}")
 
     cfg = DATASET_CONFIG[name]
-    ds = load_dataset(cfg["hf_id"], split=split or cfg["default_split"], trust_remote_code=cfg.get("trust_remote_code", False))
+    ds = load_dataset(
+        cfg["hf_id"],
+        split=split or cfg["default_split"],
+        trust_remote_code=cfg.get("trust_remote_code", False),
+        streaming=streaming,
+    )
     if num_samples:
-        ds = ds.select(range(num_samples))
+        ds = ds.take(num_samples) if streaming else ds.select(range(num_samples))
+    ds = _undecoded_images(ds)
 
-    # Dispatch to the appropriate sample builder.
-    SAMPLE_BUILDERS: Dict[str, Callable[[Dict, int], Dict]] = {
-        "docvqa": _build_docvqa_sample,
-        "funsd": _build_funsd_sample,
-        "cord": _build_cord_sample,
-    }
+    builder = _sample_builders()[name]
+
+    def _build(item: Dict, idx: int, load_time: float) -> Optional[Dict]:
+        if shard_by == "index" and shard_of(idx, None, num_shards, shard_by) != shard_index:
+            return None  # skip without building the sample at all
+        start = time.perf_counter()
+        known = gt_index.get(idx) if gt_index is not None else None
+        sample = builder(item, idx, known)
+        if shard_by == "hash" and shard_of(idx, sample["id"], num_shards, shard_by) != shard_index:
+            return None
+        if gt_index is not None and known is None:
+            gt_index.add(idx, sample["ground_truth"])
+        sample["index"] = idx
+        sample["image_path"] = _save_image(sample["image_bytes"], f"{name}_{idx}") if save_images else None
+        sample["timings"] = {"load": load_time, "materialize": time.perf_counter() - start}
+        return sample
+
+    grouper = _page_groupers().get(name) if group_pages else None
+    # Page key -> the questions list of the sample already built for that page
+    # (a throwaway list when another shard owns the page).
+    pages: Dict[str, List[Dict]] = {}
+
+    def _built() -> Iterator[Dict]:
+        for i, (item, load_time) in enumerate(_timed_rows(ds)):
+            if grouper is not None:
+                page_key, row_questions = grouper
+                key = page_key(item)
+                if key in pages:
+                    pages[key].extend(row_questions(item, i))
+                    continue
+            sample = _build(item, i, load_time)
+            if grouper is not None:
+                pages[key] = sample["questions"] if sample is not None else []
+            if sample is not None:
+                yield sample
+        if gt_index is not None:
+            gt_index.save()
 
-    builder = SAMPLE_BUILDERS[name]
-    return [builder(item, i) for i, item in enumerate(ds)]
+    return prefetch(_built(), prefetch_size)
 
 
-def _build_docvqa_sample(item: Dict, idx: int) -> Dict:
+def load_dataset_samples(
+    name: str = "docvqa",
+    split: Optional[str] = None,
+    num_samples: Optional[int] = None,
+) -> List[Dict]:
+    """Load a supported dataset and return a list of samples with image + text.
+
+    Images are also written to :func:`temp_dir` so notebooks can open ``image_path``.
+    """
+
+    return list(
+        iter_dataset_samples(
+            name, split=split, num_samples=num_samples, streaming=False, prefetch_size=0, save_images=True
+        )
+    )
+
+
+def _build_docvqa_sample(item: Dict, idx: int, ground_truth: Optional[str] = None) -> Dict:
     image = item.get("png") or item.get("image")
-    text = _extract_docvqa_text(item)
+    text = ground_truth if ground_truth is not None else _extract_docvqa_text(item)
     meta = item.get("json", {})
     question = meta.get("question") or ""
     answer = meta.get("answers") or ""
     return {
         "id": str(meta.get("questionId", idx)),
-        "image_path": _save_image(image, f"docvqa_{idx}"),
+        "image_bytes": _image_bytes(image),
         "ground_truth": text,
         "question": question,
         "answer": answer,
+        # What the QA stage asks about this page (see ocr_eval.qa); page grouping
+        # appends the questions of later rows showing the same page.
+        "questions": _docvqa_questions(item, idx),
     }
 
 
-def _build_funsd_sample(item: Dict, idx: int) -> Dict:
+def _docvqa_questions(item: Dict, idx: int) -> List[Dict]:
+    meta = item.get("json", {})
+    if not meta.get("question"):
+        return []
+    answers = _answer_list(meta.get("answers"))
+    return [{"id": str(meta.get("questionId", idx)), "question": meta["question"], "answers": answers}]
+
+
+def _docvqa_page_key(item: Dict) -> str:
+    """Identify the page image of a DocVQA question row (its content hash)."""
+    image = item.get("png") or item.get("image")
+    return hashlib.blake2b(_image_bytes(image), digest_size=16).hexdigest()
+
+
+def _answer_list(answers) -> List[str]:
+    if isinstance(answers, str):
+        return [answers] if answers else []
+    return [str(a) for a in answers or []]
+
+
+def _build_funsd_sample(item: Dict, idx: int, ground_truth: Optional[str] = None) -> Dict:
     image = item["image"]
-    text = _extract_funsd_text(item)
+    text = ground_truth if ground_truth is not None else _extract_funsd_text(item)
     return {
         "id": item.get("id", str(idx)),
-        "image_path": _save_image(image, f"funsd_{idx}"),
+        "image_bytes": _image_bytes(image),
         "ground_truth": text,
     }
 
 
-def _build_cord_sample(item: Dict, idx: int) -> Dict:
+def _build_cord_sample(item: Dict, idx: int, ground_truth: Optional[str] = None) -> Dict:
     image = item["image"]
-    text = _extract_cord_text(item)
+    text = ground_truth if ground_truth is not None else _extract_cord_text(item)
     return {
         "id": str(idx),
-        "image_path": _save_image(image, f"cord_{idx}"),
+        "image_bytes": _image_bytes(image),
         "ground_truth": text,
     }
@@ -1,4 +1,44 @@
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from ..preprocess import Payload
+
+ImageData = Union[bytes, bytearray, memoryview]
+
+# Error codes botocore's retry handlers treat as throttling for Textract.
+THROTTLING_CODES = {
+    "ThrottlingException",
+    "ProvisionedThroughputExceededException",
+    "LimitExceededException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+}
+
+
+def error_kind(error: BaseException) -> str:
+    """Classify an engine failure as ``"throttled"``, ``"timeout"`` or ``"error"``.
+
+    Recognizes HTTP 429s (OpenAI SDK), botocore throttling error codes and
+    timeout exceptions by their attributes and names, so no SDK has to be imported.
+    """
+    if getattr(error, "status_code", None) == 429:
+        return "throttled"
+    response = getattr(error, "response", None)
+    if isinstance(response, dict) and response.get("Error", {}).get("Code") in THROTTLING_CODES:
+        return "throttled"
+    if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__:
+        return "timeout"
+    return "error"
+
+# Call info per engine (keyed by id) for the current context. Each thread has its own
+# context and each asyncio task a copy of its creator's, so concurrent calls on threads
+# or tasks never see each other's info. Updated copy-on-write so copies stay isolated.
+_CALL_INFO: ContextVar[Dict[int, Dict[str, Any]]] = ContextVar("ocr_eval_call_info", default={})
+
 
 class BaseOCREngine(ABC):
     """Abstract base class for OCR engines."""
@@ -15,3 +55,64 @@ class BaseOCREngine(ABC):
             str: Extracted text from the image.
         """
         pass
+
+    def process_bytes(self, data: ImageData, mime: Optional[str] = None) -> str:
+        """
+        Process an already-encoded image (PNG/JPEG/...) held in memory.
+
+        The default spills to a temporary file and calls :meth:`process_image`;
+        engines that can send bytes directly should override this to skip the
+        disk round trip.
+
+        Args:
+            data (bytes | memoryview): Encoded image bytes.
+            mime (str, optional): MIME type of ``data`` if already known.
+
+        Returns:
+            str: Extracted text from the image.
+        """
+        suffix = {"image/jpeg": ".jpg", "image/webp": ".webp", "image/tiff": ".tif"}.get(mime or "", ".png")
+        fd, path = tempfile.mkstemp(prefix="ocr_eval_", suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return self.process_image(path)
+        finally:
+            os.unlink(path)
+
+    def process_payload(self, payload: "Payload") -> str:
+        """
+        Process a preprocessed :class:`~ocr_eval.preprocess.Payload` (what the runner sends).
+
+        Defaults to :meth:`process_bytes`. Engines that derive something from the
+        bytes (e.g. base64) can use the payload's cached values instead, so
+        engines sharing one payload derive it only once.
+        """
+        return self.process_bytes(payload.data, payload.mime)
+
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        """Describe everything besides the image that determines ``method``'s output.
+
+        Used to key the prediction cache; engines should include model names,
+        prompts and limits so that changing any of them invalidates old entries.
+        """
+        return {"engine": type(self).__name__, "method": method}
+
+    def call_cost(self, info: Dict[str, Any]) -> float:
+        """Estimated USD cost of one call from its :meth:`pop_call_info` (tokens, pages...)."""
+        return 0.0
+
+    def _record_call_info(self, **info: Any) -> None:
+        """Attach metadata (cache hits, retries, usage...) to the last call in this thread or task."""
+        infos = _CALL_INFO.get()
+        _CALL_INFO.set({**infos, id(self): {**infos.get(id(self), {}), **info}})
+
+    def pop_call_info(self) -> Dict[str, Any]:
+        """Return and clear metadata recorded by the last call made in this thread or task."""
+        infos = _CALL_INFO.get()
+        if id(self) not in infos:
+            return {}
+        infos = dict(infos)
+        info = infos.pop(id(self))
+        _CALL_INFO.set(infos)
+        return info
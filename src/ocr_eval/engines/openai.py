@@ -1,26 +1,179 @@
+import asyncio
 import base64
+import copy
+import io
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+import httpx
 from PIL import Image
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from .base import BaseOCREngine, ImageData
+from ..config import MODEL_PRICING, get_settings
+from ..preprocess import Payload, sniff_mime
+from ..utils.ratelimit import RateLimiter
+
+TRANSCRIBE_SYSTEM_PROMPT = (
+    "You are a text transcription assistant. Your task is to output the text found in the image. "
+    "The provided image is a synthetic sample from a public research dataset (CORD) used for benchmarking "
+    "OCR systems. It does not contain real personally identifiable information. Please transcribe it fully."
+)
+TRANSCRIBE_USER_PROMPT = (
+    "Transcribe the text in this image exactly as it appears. "
+    "Do not provide any conversational response, just the text."
+)
+# User-prompt variants for transcription, by name (see ``sweep --prompts``).
+TRANSCRIBE_PROMPTS = {
+    "default": TRANSCRIBE_USER_PROMPT,
+    "layout": (
+        "Transcribe all text in this image, keeping its line breaks and reading order "
+        "(top to bottom, left to right). Output only the text."
+    ),
+    "verbatim": (
+        "Transcribe the text in this image character for character, including punctuation, numbers "
+        "and symbols, without correcting spelling or formatting. Output only the text."
+    ),
+}
+BOXES_SYSTEM_PROMPT = (
+    "You are an OCR assistant. Extract every visible text span and return JSON only. "
+    "Each item should be {\"text\": string, \"bbox\": [x1, y1, x2, y2]} where bbox is in pixels "
+    "relative to the original image width and height provided. Do not add extra keys or prose."
+)
+QA_SYSTEM_PROMPT = (
+    "You answer questions about a document using only its OCR transcription. "
+    "Reply with the shortest answer, copied from the document text where possible, with no explanation."
+)
+
+# Rough prompt-side cost of one high-detail page image, used only to pre-reserve
+# tokens-per-minute budget; the real usage is reconciled after each response.
+IMAGE_TOKEN_ESTIMATE = 1105
+
+
+def _b64(data: ImageData) -> str:
+    return base64.b64encode(data).decode("utf-8")
+
+
+def _strip_code_fence(content: str) -> str:
+    content = content.strip()
+    # Remove markdown code blocks if present
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1]
+        if content.endswith("```"):
+            content = content.rsplit("\n", 1)[0]
+    return content.strip()
+
+
+def _parse_boxes(content: str) -> List[Dict[str, Any]]:
+    try:
+        parsed = json.loads(content)
+        if isinstance(parsed, list):
+            return parsed
+    except Exception:
+        pass
+    # If parsing fails, return the raw text so callers can inspect.
+    return [{"text": content, "bbox": []}]
+
+
+def _model_prices(model: str, settings) -> tuple[float, float]:
+    """USD per 1M (input, output) tokens: settings overrides, else the longest matching MODEL_PRICING prefix."""
+
+    known = [name for name in MODEL_PRICING if model.startswith(name)]
+    default = MODEL_PRICING[max(known, key=len)] if known else (0.0, 0.0)
+    return (
+        settings.openai_input_price_per_1m or default[0],
+        settings.openai_output_price_per_1m or default[1],
+    )
 
-from .base import BaseOCREngine
-from ..config import get_settings
 
 class OpenAIVLMEngine(BaseOCREngine):
-    def __init__(self, model: str | None = None):
+    """OpenAI vision model engine with sync and asyncio entry points.
+
+    Both clients keep a pooled keep-alive HTTP connection set (``max_connections``)
+    and share one :class:`RateLimiter`, so threads and tasks draw from the same
+    requests/min and tokens/min budget. :meth:`with_options` derives variants with
+    another prompt or token limit that share them too.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        *,
+        base_url: str | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_connections: int | None = None,
+        max_completion_tokens: int = 1024,
+        user_prompt: str = TRANSCRIBE_USER_PROMPT,
+        api_key: str | None = None,
+        max_retries: int | None = None,
+        timeout: float | None = None,
+    ):
         settings = get_settings()
-        api_key = settings.openai_api_key
+        api_key = api_key or settings.openai_api_key
         if not api_key:
             raise ValueError("OPENAI_API_KEY is not set")
-        self.client = OpenAI(api_key=api_key)
         self.model = model or settings.openai_model
+        self.prices = _model_prices(self.model, settings)
+        self.max_completion_tokens = max_completion_tokens
+        self.user_prompt = user_prompt
+        self._api_key = api_key
+        self._base_url = base_url or settings.openai_base_url or None
+        self._limits = httpx.Limits(
+            max_connections=max_connections or settings.openai_max_connections,
+            max_keepalive_connections=max_connections or settings.openai_max_connections,
+        )
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=requests_per_minute or settings.openai_rpm or None,
+            tokens_per_minute=tokens_per_minute or settings.openai_tpm or None,
+        )
+        # The SDK retries 429/5xx itself with backoff; its defaults apply unless overridden.
+        self._client_options: Dict[str, Any] = {
+            k: v for k, v in (("max_retries", max_retries), ("timeout", timeout)) if v is not None
+        }
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=self._base_url,
+            http_client=DefaultHttpxClient(limits=self._limits),
+            **self._client_options,
+        )
+        self._async_client: Optional[AsyncOpenAI] = None
 
-    def _encode_image(self, image_path: str) -> str:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+    def with_options(
+        self, *, user_prompt: str | None = None, max_completion_tokens: int | None = None
+    ) -> "OpenAIVLMEngine":
+        """A copy with another transcription prompt or token limit.
+
+        The copy shares this engine's clients, connection pool and rate limiter, so
+        variants of one model (e.g. in a sweep) draw from the same quota.
+        """
+
+        variant = copy.copy(self)
+        if user_prompt is not None:
+            variant.user_prompt = user_prompt
+        if max_completion_tokens is not None:
+            variant.max_completion_tokens = max_completion_tokens
+        return variant
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Lazily created async client; reuse it from a single event loop."""
+
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                http_client=DefaultAsyncHttpxClient(limits=self._limits),
+                **self._client_options,
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
     def list_available_models(self) -> list[str]:
         """Return the model IDs available to the configured OpenAI account.
@@ -35,47 +188,152 @@ class OpenAIVLMEngine(BaseOCREngine):
         """Return a token limit param; default to max_completion_tokens to satisfy newer models."""
 
         # Use the newer param to avoid 400s on models that reject max_tokens.
-        return {"max_completion_tokens": 1024}
+        return {"max_completion_tokens": self.max_completion_tokens}
 
-    def process_image(self, image_path: str) -> str:
-        base64_image = self._encode_image(image_path)
-
-
-        kwargs = self._token_param()
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a text transcription assistant. Your task is to output the text found in the image. The provided image is a synthetic sample from a public research dataset (CORD) used for benchmarking OCR systems. It does not contain real personally identifiable information. Please transcribe it fully."
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Transcribe the text in this image exactly as it appears. Do not provide any conversational response, just the text.",
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}"
-                            },
-                        },
-                    ],
-                }
-            ],
-            **kwargs,
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        prompts = {
+            "process_image": [TRANSCRIBE_SYSTEM_PROMPT, self.user_prompt],
+            "extract_text_with_boxes": [BOXES_SYSTEM_PROMPT],
+            "answer_question": [QA_SYSTEM_PROMPT],
+        }
+        identity = {
+            "engine": "openai",
+            "method": method,
+            "model": self.model,
+            "prompt": prompts.get(method, []),
+            "max_completion_tokens": self.max_completion_tokens,
+        }
+        # Another endpoint (a proxy, a local server) may serve a different model under the
+        # same name. Only added when set, so entries for the default endpoint stay valid.
+        if self._base_url:
+            identity["base_url"] = self._base_url
+        return identity
+
+    def call_cost(self, info: Dict[str, Any]) -> float:
+        input_price, output_price = self.prices
+        return (info.get("prompt_tokens", 0) * input_price + info.get("completion_tokens", 0) * output_price) / 1e6
+
+    def _record_usage(self, usage) -> None:
+        if usage is not None:
+            self._record_call_info(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+
+    def _estimate_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        text_chars = images = 0
+        for message in messages:
+            content = message["content"]
+            parts = [content] if isinstance(content, str) else [p.get("text", "") for p in content]
+            text_chars += sum(len(p) for p in parts)
+            if not isinstance(content, str):
+                images += sum(1 for p in content if p.get("type") == "image_url")
+        return text_chars // 4 + images * IMAGE_TOKEN_ESTIMATE + self.max_completion_tokens
+
+    def _transcribe_messages(self, base64_image: str, mime: str = "image/png") -> List[Dict[str, Any]]:
+        return [
+            {"role": "system", "content": TRANSCRIBE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": self.user_prompt},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{base64_image}"}},
+                ],
+            },
+        ]
+
+    def _boxes_messages(
+        self, base64_image: str, width: int, height: int, mime: str = "image/png"
+    ) -> List[Dict[str, Any]]:
+        user_prompt = (
+            f"Image size: width={width}, height={height}. "
+            "Return JSON array of objects: [{\"text\":..., \"bbox\":[x1,y1,x2,y2]}]."
         )
+        return [
+            {"role": "system", "content": BOXES_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{base64_image}"}},
+                ],
+            },
+        ]
+
+    def _qa_messages(self, context: str, question: str) -> List[Dict[str, Any]]:
+        return [
+            {"role": "system", "content": QA_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Document:\n{context}\n\nQuestion: {question}"},
+        ]
+
+    def _complete(self, messages: List[Dict[str, Any]]) -> str:
+        estimate = self._estimate_tokens(messages)
+        self.rate_limiter.acquire(estimate)
+        try:
+            raw = self.client.chat.completions.with_raw_response.create(
+                model=self.model, messages=messages, **self._token_param()
+            )
+        except Exception:
+            # A failed request used none of the tokens reserved for it.
+            self.rate_limiter.settle(estimate, 0)
+            raise
+        return self._finish(raw, estimate)
+
+    async def _acomplete(self, messages: List[Dict[str, Any]]) -> str:
+        estimate = self._estimate_tokens(messages)
+        await self.rate_limiter.acquire_async(estimate)
+        try:
+            raw = await self.async_client.chat.completions.with_raw_response.create(
+                model=self.model, messages=messages, **self._token_param()
+            )
+        except Exception:
+            self.rate_limiter.settle(estimate, 0)
+            raise
+        return self._finish(raw, estimate)
+
+    def _finish(self, raw, estimate: int) -> str:
+        """Parse a raw completion, recording retries, usage and parse time, and settle its reservation."""
+
+        self._record_call_info(retries=raw.retries_taken)
+        start = time.perf_counter()
+        response = raw.parse()
+        text = _strip_code_fence(response.choices[0].message.content or "")
+        self._record_usage(response.usage)
+        self.rate_limiter.settle(estimate, response.usage.total_tokens if response.usage else None)
+        self._record_call_info(parse_time=time.perf_counter() - start)
+        return text
+
+    def process_image(self, image_path: str) -> str:
+        with open(image_path, "rb") as image_file:
+            return self.process_bytes(image_file.read())
 
-        content = response.choices[0].message.content.strip()
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1]
-            if content.endswith("```"):
-                content = content.rsplit("\n", 1)[0]
-        
-        return content.strip()
+    def process_bytes(self, data: ImageData, mime: str | None = None) -> str:
+        start = time.perf_counter()
+        messages = self._transcribe_messages(_b64(data), mime or sniff_mime(data))
+        self._record_call_info(encode_time=time.perf_counter() - start)
+        return self._complete(messages)
+
+    def process_payload(self, payload: Payload) -> str:
+        # The payload's base64 is shared by every engine that sends it.
+        start = time.perf_counter()
+        messages = self._transcribe_messages(payload.b64, payload.mime)
+        self._record_call_info(encode_time=time.perf_counter() - start)
+        return self._complete(messages)
+
+    async def aprocess_image(self, image_path: str) -> str:
+        data = await asyncio.to_thread(Path(image_path).read_bytes)
+        return await self.aprocess_bytes(data)
+
+    async def aprocess_bytes(self, data: ImageData, mime: str | None = None) -> str:
+        start = time.perf_counter()
+        messages = self._transcribe_messages(_b64(data), mime or sniff_mime(data))
+        self._record_call_info(encode_time=time.perf_counter() - start)
+        return await self._acomplete(messages)
+
+    def answer_question(self, context: str, question: str) -> str:
+        """Answer ``question`` from a document's text alone (the reader of the QA stage)."""
+
+        return self._complete(self._qa_messages(context, question))
+
+    async def aanswer_question(self, context: str, question: str) -> str:
+        return await self._acomplete(self._qa_messages(context, question))
 
     def extract_text_with_boxes(self, image_path: str) -> List[Dict[str, Any]]:
         """Ask the vision model to return text spans with bounding boxes.
@@ -84,48 +342,25 @@ class OpenAIVLMEngine(BaseOCREngine):
         relative to the provided image dimensions.
         """
 
-        base64_image = self._encode_image(image_path)
-        img = Image.open(image_path)
-        width, height = img.size
+        with open(image_path, "rb") as image_file:
+            return self.extract_text_with_boxes_from_bytes(image_file.read())
 
-        system_prompt = (
-            "You are an OCR assistant. Extract every visible text span and return JSON only. "
-            "Each item should be {\"text\": string, \"bbox\": [x1, y1, x2, y2]} where bbox is in pixels "
-            "relative to the original image width and height provided. Do not add extra keys or prose."
-        )
+    def extract_text_with_boxes_from_bytes(self, data: ImageData, mime: str | None = None) -> List[Dict[str, Any]]:
+        """In-memory variant of :meth:`extract_text_with_boxes`."""
 
-        user_prompt = (
-            f"Image size: width={width}, height={height}. "
-            "Return JSON array of objects: [{\"text\":..., \"bbox\":[x1,y1,x2,y2]}]."
-        )
+        width, height = Image.open(io.BytesIO(data)).size
+        messages = self._boxes_messages(_b64(data), width, height, mime or sniff_mime(data))
+        return _parse_boxes(self._complete(messages))
 
-        kwargs = self._token_param()
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": user_prompt},
-                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}},
-                    ],
-                },
-            ],
-            **kwargs,
-        )
+    async def aextract_text_with_boxes(self, image_path: str) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`extract_text_with_boxes`."""
 
-        content = response.choices[0].message.content.strip()
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1]
-            if content.endswith("```"):
-                content = content.rsplit("\n", 1)[0]
+        data = await asyncio.to_thread(Path(image_path).read_bytes)
+        return await self.aextract_text_with_boxes_from_bytes(data)
 
-        try:
-            parsed = json.loads(content)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            pass
-        # If parsing fails, return the raw text so callers can inspect.
-        return [{"text": content, "bbox": []}]
+    async def aextract_text_with_boxes_from_bytes(
+        self, data: ImageData, mime: str | None = None
+    ) -> List[Dict[str, Any]]:
+        width, height = Image.open(io.BytesIO(data)).size
+        messages = self._boxes_messages(_b64(data), width, height, mime or sniff_mime(data))
+        return _parse_boxes(await self._acomplete(messages))
@@ -0,0 +1,444 @@
+"""Host for CPU-bound engines in a pool of worker processes.
+
+The runner's thread pools only help engines that wait on the network; a local
+engine (a Tesseract binary, an ONNX model) holding the GIL keeps ``evaluate`` on
+one core. :class:`ProcessPoolEngine` wraps any :class:`BaseOCREngine` subclass:
+each worker process builds the engine once (model loading happens per worker,
+not per call) and then serves pages sent over its own pipe. The host looks like
+an ordinary thread-safe engine to the runner.
+
+- **Back pressure**: at most ``max_pending`` calls are accepted at once; further
+  ``process_bytes`` calls block the caller until a slot frees up.
+- **Health**: a dispatcher thread watches every worker's process sentinel, so a
+  crashed worker is noticed immediately. Its current call fails with
+  :class:`WorkerCrashedError` and the worker is restarted, up to ``max_crashes``
+  times in a row without a completed call; then the slot is retired, and once
+  every slot is retired the pending calls fail. Calls running longer than
+  ``task_timeout`` get the worker terminated and restarted (:class:`TimeoutError`).
+  With ``max_tasks_per_worker`` set, workers are recycled to bound memory leaks.
+- **Stats**: :meth:`ProcessPoolEngine.worker_stats` gives calls, errors,
+  restarts, busy time, pages/s and utilization per worker.
+
+Workers use the ``spawn`` start method by default (safe next to the runner's
+threads), so the engine class must be importable. Pass it as a class, as a
+``"module:Class"`` target or as a name from :mod:`ocr_eval.engines.registry`.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from importlib import import_module
+from multiprocessing.connection import Connection, wait
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type, Union
+
+from .base import BaseOCREngine, ImageData
+
+EngineTarget = Union[str, Type[BaseOCREngine]]
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died while handling a call."""
+
+
+def _target_string(engine: EngineTarget) -> str:
+    if not isinstance(engine, str):
+        return f"{engine.__module__}:{engine.__qualname__}"
+    if ":" in engine:
+        return engine
+    from .registry import available_engines
+
+    engines = available_engines()
+    if engine.lower() not in engines:
+        raise ValueError(f"unknown engine {engine!r} (available: {', '.join(engines)})")
+    return engines[engine.lower()].target
+
+
+def _load(target: str) -> Type[BaseOCREngine]:
+    module, _, attr = target.partition(":")
+    return getattr(import_module(module), attr)
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _worker_main(target: str, kwargs: Dict[str, Any], conn: Connection) -> None:
+    """Worker process: build the engine once, then serve ``(task_id, data, mime)`` until ``None``."""
+
+    # Ctrl-C goes to the whole process group; the host decides when workers stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        engine = _load(target)(**kwargs)
+        conn.send(("ready", os.getpid(), engine.cache_identity("process_image")))
+    except BaseException as e:
+        conn.send(("init_error", os.getpid(), _picklable(e)))
+        return
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):  # the host went away
+            return
+        if message is None:
+            return
+        task_id, data, mime = message
+        start = time.perf_counter()
+        try:
+            text, error = engine.process_bytes(data, mime), None
+        except Exception as e:
+            text, error = None, _picklable(e)
+        info = engine.pop_call_info()
+        info["cost"] = engine.call_cost(info)
+        conn.send(("done", task_id, text, error, info, time.perf_counter() - start))
+
+
+@dataclass
+class WorkerStats:
+    """Counters for one worker slot (kept across restarts of its process)."""
+
+    worker: int
+    pid: Optional[int] = None
+    calls: int = 0
+    errors: int = 0
+    restarts: int = 0
+    busy_time: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    def as_row(self) -> Dict[str, Any]:
+        uptime = time.perf_counter() - self.started
+        return {
+            "Worker": self.worker,
+            "PID": self.pid,
+            "Calls": self.calls,
+            "Errors": self.errors,
+            "Restarts": self.restarts,
+            "Busy (s)": round(self.busy_time, 3),
+            "Pages/s (busy)": self.calls / self.busy_time if self.busy_time > 0 else 0.0,
+            "Utilization": self.busy_time / uptime if uptime > 0 else 0.0,
+        }
+
+
+class _Worker:
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.conn: Optional[Connection] = None
+        self.ready = False
+        self.failed: Optional[BaseException] = None  # engine could not be rebuilt; slot retired
+        self.task: Optional[Tuple[int, float]] = None  # (task id, dispatch time)
+        self.tasks_since_start = 0
+        self.crashes = 0  # consecutive crashes since the last completed call
+        self.stats = WorkerStats(slot)
+
+
+class ProcessPoolEngine(BaseOCREngine):
+    """Run an engine in ``processes`` worker processes behind a thread-safe facade.
+
+    Args:
+        engine: Engine class, ``"module:Class"`` target or registry name.
+        engine_kwargs: Keyword arguments for the engine constructor (must be picklable).
+        processes: Number of worker processes; defaults to the CPU count.
+        max_pending: Calls accepted at once (queued + running); defaults to ``2 * processes``.
+        task_timeout: Seconds before a running call's worker is terminated and restarted.
+        max_tasks_per_worker: Restart a worker after this many calls (``None`` never).
+        start_method: ``multiprocessing`` start method for workers.
+        init_timeout: Seconds to wait for every worker's engine to be built on start.
+        max_crashes: Retire a worker slot after this many crashes in a row without a
+            completed call (e.g. an engine that crashes while being rebuilt).
+    """
+
+    def __init__(
+        self,
+        engine: EngineTarget,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        start_method: str = "spawn",
+        init_timeout: float = 300.0,
+        max_crashes: int = 5,
+    ):
+        self.target = _target_string(engine)
+        self.engine_kwargs = dict(engine_kwargs or {})
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.max_pending = max(1, max_pending or 2 * self.processes)
+        self.task_timeout = task_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_crashes = max(1, max_crashes)
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._task_ids = itertools.count()
+        self._futures: Dict[int, Future] = {}
+        self._queue: Deque[Tuple[int, bytes, Optional[str]]] = collections.deque()
+        self._lock = threading.Lock()
+        self._wake_recv, self._wake_send = self._context.Pipe(duplex=False)
+        self._closing = False
+        self._identity: Dict[str, Any] = {}
+        # (worker, old process, old pipe, graceful, respawn) to handle outside the lock.
+        self._replacing: List[Tuple[_Worker, Any, Connection, bool, bool]] = []
+
+        self._workers = [_Worker(slot) for slot in range(self.processes)]
+        for worker in self._workers:
+            self._spawn(worker)
+        try:
+            deadline = time.monotonic() + init_timeout
+            for worker in self._workers:
+                self._await_ready(worker, deadline)
+        except BaseException:
+            self._terminate_all()
+            raise
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="ocr-process-pool", daemon=True)
+        self._dispatcher.start()
+
+    # -- engine interface -------------------------------------------------
+
+    def process_image(self, image_path: str) -> str:
+        with open(image_path, "rb") as f:
+            return self.process_bytes(f.read())
+
+    def process_bytes(self, data: ImageData, mime: Optional[str] = None) -> str:
+        with self._slots:
+            future: Future = Future()
+            with self._lock:
+                if self._closing:
+                    raise RuntimeError("process pool engine is closed")
+                if all(w.failed is not None for w in self._workers):
+                    raise WorkerCrashedError(f"all workers failed: {self._workers[-1].failed}")
+                task_id = next(self._task_ids)
+                self._futures[task_id] = future
+                self._queue.append((task_id, bytes(data), mime))
+            self._wake()
+            text, info = future.result()
+        self._record_call_info(**info)
+        return text
+
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        if method == "process_image" and self._identity:
+            return dict(self._identity)
+        return {"engine": self.target, "method": method, **{k: repr(v) for k, v in self.engine_kwargs.items()}}
+
+    def call_cost(self, info: Dict[str, Any]) -> float:
+        return info.get("cost", 0.0)
+
+    def worker_stats(self) -> List[Dict[str, Any]]:
+        """One row per worker slot: calls, errors, restarts, busy time, pages/s and utilization."""
+
+        with self._lock:
+            return [worker.stats.as_row() for worker in self._workers]
+
+    def close(self) -> None:
+        """Finish queued calls, then stop the workers."""
+
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+        self._wake()
+        self._dispatcher.join()
+        for worker in self._workers:
+            if worker.conn is not None and worker.process.is_alive():
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+        self._terminate_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- worker management ------------------------------------------------
+
+    def _spawn(self, worker: _Worker) -> None:
+        # Called without the lock: starting a process (and importing the engine) takes a while.
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.target, self.engine_kwargs, child),
+            name=f"ocr-worker-{worker.slot}",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        with self._lock:
+            worker.process, worker.conn = process, parent
+            worker.ready, worker.task, worker.tasks_since_start = False, None, 0
+            worker.stats.pid = process.pid
+
+    def _await_ready(self, worker: _Worker, deadline: float) -> None:
+        remaining = max(0.0, deadline - time.monotonic())
+        if not wait([worker.conn, worker.process.sentinel], timeout=remaining):
+            raise TimeoutError(f"worker {worker.slot} did not build {self.target} in time")
+        if not worker.conn.poll():
+            raise WorkerCrashedError(f"worker {worker.slot} exited while building {self.target}")
+        self._on_message(worker, worker.conn.recv())
+
+    @staticmethod
+    def _stop(process: multiprocessing.process.BaseProcess, conn: Connection, graceful: bool = False) -> None:
+        if graceful and process.is_alive():
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=5)
+        conn.close()
+
+    def _replace(self, worker: _Worker, graceful: bool = False, respawn: bool = True) -> None:
+        """Detach the worker's process; the dispatcher stops it, and starts a new one, outside the lock."""
+
+        self._replacing.append((worker, worker.process, worker.conn, graceful, respawn))
+        worker.process, worker.conn = None, None
+        worker.ready, worker.task = False, None
+
+    def _restart(self, worker: _Worker, error: BaseException) -> None:
+        if worker.task is not None:
+            self._fail(worker.task[0], error)
+            worker.stats.errors += 1
+        worker.stats.restarts += 1
+        self._replace(worker)
+
+    def _retire(self, worker: _Worker, error: BaseException) -> None:
+        if worker.task is not None:
+            self._fail(worker.task[0], error)
+            worker.stats.errors += 1
+        if worker.process is not None:
+            self._replace(worker, respawn=False)
+        worker.failed = error
+        if all(w.failed is not None for w in self._workers):
+            # Nothing can run the queued calls any more.
+            while self._queue:
+                self._fail(self._queue.popleft()[0], WorkerCrashedError(f"all workers failed: {error}"))
+
+    def _terminate_all(self) -> None:
+        for worker in self._workers:
+            if worker.conn is not None:
+                self._stop(worker.process, worker.conn)
+                worker.process, worker.conn = None, None
+
+    # -- dispatcher -------------------------------------------------------
+
+    def _wake(self) -> None:
+        self._wake_send.send(None)
+
+    def _fail(self, task_id: int, error: BaseException) -> None:
+        future = self._futures.pop(task_id, None)
+        if future is not None:
+            future.set_exception(error)
+
+    def _on_message(self, worker: _Worker, message: Tuple) -> None:
+        kind = message[0]
+        if kind == "ready":
+            worker.ready = True
+            worker.stats.pid = message[1]
+            self._identity = message[2]
+        elif kind == "init_error":
+            raise message[2]
+        elif kind == "done":
+            _, task_id, text, error, info, seconds = message
+            worker.task = None
+            worker.crashes = 0
+            worker.tasks_since_start += 1
+            worker.stats.calls += 1
+            worker.stats.busy_time += seconds
+            future = self._futures.pop(task_id, None)
+            if error is not None:
+                worker.stats.errors += 1
+                if future is not None:
+                    future.set_exception(error)
+            elif future is not None:
+                future.set_result((text, info))
+            if self.max_tasks_per_worker and worker.tasks_since_start >= self.max_tasks_per_worker:
+                # Planned recycling (e.g. to bound leaks) is not counted as a restart.
+                self._replace(worker, graceful=True)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self._queue and all(w.task is None for w in self._workers)
+                if self._closing and idle:
+                    return
+            handles = [self._wake_recv]
+            for worker in self._workers:
+                if worker.conn is not None:
+                    handles += [worker.conn, worker.process.sentinel]
+            timeout = 0.5 if self.task_timeout else None
+            for handle in wait(handles, timeout=timeout):
+                if handle is self._wake_recv:
+                    while self._wake_recv.poll():
+                        self._wake_recv.recv()
+            with self._lock:
+                for worker in self._workers:
+                    if worker.conn is not None:
+                        self._service(worker)
+                sends = self._dispatch()
+                replacing, self._replacing = self._replacing, []
+            # Send, stop and start outside the lock: a large page can block on the pipe and
+            # joining or spawning a process takes seconds, and callers queueing work or
+            # reading stats should not wait for any of it.
+            for worker, message in sends:
+                try:
+                    worker.conn.send(message)
+                except OSError:
+                    pass  # the worker died; its sentinel fails the call on the next pass
+            for worker, process, conn, graceful, respawn in replacing:
+                self._stop(process, conn, graceful)
+                if not respawn:
+                    continue
+                try:
+                    self._spawn(worker)
+                except Exception as e:
+                    with self._lock:
+                        self._retire(worker, e)
+
+    def _service(self, worker: _Worker) -> None:
+        try:
+            while worker.conn is not None and worker.conn.poll():
+                self._on_message(worker, worker.conn.recv())
+        except (EOFError, OSError):
+            pass
+        except Exception as e:  # the engine could not be rebuilt after a restart
+            self._retire(worker, e)
+            return
+        if worker.conn is None:  # recycled after its last call
+            return
+        if not worker.process.is_alive():
+            code = worker.process.exitcode
+            error = WorkerCrashedError(f"worker {worker.slot} exited with code {code}")
+            worker.crashes += 1
+            if worker.crashes >= self.max_crashes:
+                self._retire(worker, WorkerCrashedError(f"{error} ({worker.crashes} crashes in a row)"))
+            else:
+                self._restart(worker, error)
+        elif self.task_timeout and worker.task and time.perf_counter() - worker.task[1] > self.task_timeout:
+            self._restart(worker, TimeoutError(f"call exceeded {self.task_timeout}s on worker {worker.slot}"))
+
+    def _dispatch(self) -> List[Tuple[_Worker, Tuple[int, bytes, Optional[str]]]]:
+        """Assign queued calls to idle workers; returns the ``(worker, message)`` pairs to send."""
+
+        sends = []
+        for worker in self._workers:
+            if not self._queue:
+                break
+            if worker.failed is None and worker.ready and worker.task is None:
+                message = self._queue.popleft()
+                worker.task = (message[0], time.perf_counter())
+                sends.append((worker, message))
+        return sends
@@ -0,0 +1,74 @@
+"""Lazy registry of OCR engines, keyed by CLI name.
+
+Engines are described by an import target (``"module:Class"``) and only
+imported when one is actually created, so choosing ``--engine textract`` never
+loads the OpenAI SDK and ``--help`` loads neither. Besides the built-in engines,
+installed packages can add their own through the ``ocr_eval.engines`` entry-point
+group::
+
+    [project.entry-points."ocr_eval.engines"]
+    tesseract = "my_package.engines:TesseractEngine"
+
+The entry-point name becomes the engine's CLI name and report title.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Type
+
+if TYPE_CHECKING:
+    from .base import BaseOCREngine
+
+ENTRY_POINT_GROUP = "ocr_eval.engines"
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    """A registered engine: CLI name, report title and lazy import target."""
+
+    name: str
+    title: str
+    target: str
+
+    def load(self) -> Type["BaseOCREngine"]:
+        module, _, attr = self.target.partition(":")
+        return getattr(import_module(module), attr)
+
+    def create(self, **kwargs: Any) -> "BaseOCREngine":
+        return self.load()(**kwargs)
+
+
+BUILTIN_ENGINES: Dict[str, EngineSpec] = {
+    "textract": EngineSpec("textract", "Textract", "ocr_eval.engines.textract:TextractEngine"),
+    "openai": EngineSpec("openai", "OpenAI", "ocr_eval.engines.openai:OpenAIVLMEngine"),
+}
+
+
+@lru_cache(maxsize=None)
+def available_engines() -> Dict[str, EngineSpec]:
+    """Built-in engines plus those registered by installed packages (built-ins win on name clashes)."""
+
+    from importlib.metadata import entry_points
+
+    engines = dict(BUILTIN_ENGINES)
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        engines.setdefault(ep.name.lower(), EngineSpec(ep.name.lower(), ep.name, ep.value))
+    return engines
+
+
+def resolve_engines(spec: str) -> List[EngineSpec]:
+    """Engines selected by ``all`` or a comma-separated list of names (case-insensitive)."""
+
+    engines = available_engines()
+    if spec.strip().lower() == "all":
+        return list(engines.values())
+    selected = []
+    for name in filter(None, (part.strip().lower() for part in spec.split(","))):
+        if name not in engines:
+            raise ValueError(f"unknown engine {name!r} (available: {', '.join(engines)})")
+        if engines[name] not in selected:
+            selected.append(engines[name])
+    return selected
@@ -1,27 +1,174 @@
+import io
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
 import boto3
-from .base import BaseOCREngine
-from ..config import get_settings
+from botocore.config import Config
+from PIL import Image
+
+from .base import THROTTLING_CODES, BaseOCREngine, ImageData
+from ..cache import make_cache_key
+from ..config import TEXTRACT_PRICE_PER_PAGE, get_settings
+from ..preprocess import Payload
+from ..responses import ResponseStore, textract_text, textract_words
+
 
 class TextractEngine(BaseOCREngine):
-    def __init__(self, region_name: str | None = None):
+    """AWS Textract ``DetectDocumentText`` engine.
+
+    The client is configured from settings (overridable per argument) with a
+    connection pool sized for concurrent use, botocore's ``adaptive`` retry mode
+    (client-side rate limiting on throttles) and explicit timeouts. boto3 clients
+    are thread-safe, so one client is shared by default; ``per_thread_clients``
+    gives each worker thread its own client (and pool) instead.
+
+    Each call records ``retries``, ``throttled`` (throttling responses seen) and
+    ``throttle_time`` (seconds spent waiting on backoff / the adaptive limiter
+    rather than on HTTP attempts) via :meth:`pop_call_info`.
+
+    With a ``response_store``, every raw response is kept (compressed) under
+    the same key as the cached prediction, so lines, words and boxes can be
+    re-derived offline with :mod:`ocr_eval.responses`.
+    """
+
+    def __init__(
+        self,
+        region_name: str | None = None,
+        *,
+        max_pool_connections: int | None = None,
+        retry_mode: str | None = None,
+        max_attempts: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        endpoint_url: str | None = None,
+        per_thread_clients: bool = False,
+        response_store: ResponseStore | None = None,
+        session: boto3.Session | None = None,
+    ):
         settings = get_settings()
         region = region_name or settings.aws_region
+        self.client_config = Config(
+            max_pool_connections=max_pool_connections or settings.textract_max_pool_connections,
+            retries={
+                "mode": retry_mode or settings.textract_retry_mode,
+                "max_attempts": max_attempts or settings.textract_max_attempts,
+            },
+            connect_timeout=connect_timeout or settings.textract_connect_timeout,
+            read_timeout=read_timeout or settings.textract_read_timeout,
+        )
+        self._endpoint_url = endpoint_url or settings.textract_endpoint_url or None
         # Prefer an explicit profile if provided (defaults to textract-profile in config).
-        if settings.aws_profile:
-            session = boto3.Session(profile_name=settings.aws_profile, region_name=region)
-            self.client = session.client("textract")
+        # Sessions are not thread-safe, so clients are only ever created under a lock.
+        if session is not None:
+            self._session = session
+        elif settings.aws_profile:
+            self._session = boto3.Session(profile_name=settings.aws_profile, region_name=region)
         else:
-            self.client = boto3.client("textract", region_name=region)
+            self._session = boto3.Session(region_name=region)
+        self.response_store = response_store
+        self.price_per_page = settings.textract_price_per_page or TEXTRACT_PRICE_PER_PAGE
+        self._client_lock = threading.Lock()
+        self._attempts = threading.local()
+        self.per_thread_clients = per_thread_clients
+        self._thread_clients = threading.local()
+        self._shared_client = None if per_thread_clients else self._new_client()
+
+    def _new_client(self):
+        with self._client_lock:
+            client = self._session.client("textract", config=self.client_config, endpoint_url=self._endpoint_url)
+        client.meta.events.register("before-send.textract", self._on_before_send)
+        client.meta.events.register("needs-retry.textract", self._on_needs_retry)
+        return client
+
+    @property
+    def client(self):
+        if self._shared_client is not None:
+            return self._shared_client
+        client = getattr(self._thread_clients, "client", None)
+        if client is None:
+            client = self._thread_clients.client = self._new_client()
+        return client
+
+    def _on_before_send(self, **kwargs) -> None:
+        # Registered after botocore's adaptive limiter, so any limiter wait is already over.
+        self._attempts.started = time.perf_counter()
+
+    def _on_needs_retry(self, response=None, caught_exception=None, **kwargs) -> None:
+        started = getattr(self._attempts, "started", None)
+        if started is not None:
+            self._attempts.in_flight += time.perf_counter() - started
+            self._attempts.started = None
+        code = None
+        if response is not None:
+            code = response[1].get("Error", {}).get("Code")
+        elif caught_exception is not None:
+            code = getattr(caught_exception, "response", {}).get("Error", {}).get("Code")
+        if code in THROTTLING_CODES:
+            self._attempts.throttled += 1
+
+    def call_cost(self, info: Dict[str, Any]) -> float:
+        return info.get("pages", 0) * self.price_per_page
+
+    def cache_identity(self, method: str) -> dict:
+        return {"engine": "textract", "method": method, "api": "DetectDocumentText"}
 
     def process_image(self, image_path: str) -> str:
         with open(image_path, "rb") as document:
-            image_bytes = document.read()
-
-        response = self.client.detect_document_text(Document={"Bytes": image_bytes})
-        
-        text = ""
-        for item in response["Blocks"]:
-            if item["BlockType"] == "LINE":
-                text += item["Text"] + "\n"
-        
-        return text.strip()
+            return self.process_bytes(document.read())
+
+    def detect_document_text(self, data: ImageData, digest: Optional[bytes] = None) -> Dict[str, Any]:
+        """Raw ``DetectDocumentText`` response for encoded image bytes (stored if configured).
+
+        ``digest`` is the bytes' SHA-256 if already known (e.g. :attr:`Payload.digest`),
+        so the response store key does not hash the image again.
+        """
+
+        # Textract detects PNG/JPEG/TIFF from the bytes; no MIME hint is needed.
+        image_bytes = data if isinstance(data, bytes) else bytes(data)
+        client = self.client
+        self._attempts.in_flight = 0.0
+        self._attempts.throttled = 0
+        self._attempts.started = None
+        start = time.perf_counter()
+        retries = 0
+        try:
+            response = client.detect_document_text(Document={"Bytes": image_bytes})
+            retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        except Exception as e:
+            retries = getattr(e, "response", {}).get("ResponseMetadata", {}).get("RetryAttempts", 0)
+            raise
+        finally:
+            self._record_call_info(
+                retries=retries,
+                throttled=self._attempts.throttled,
+                throttle_time=max(0.0, time.perf_counter() - start - self._attempts.in_flight),
+            )
+        # Billed per page processed.
+        self._record_call_info(pages=response.get("DocumentMetadata", {}).get("Pages", 1))
+        if self.response_store is not None:
+            key = make_cache_key(image_bytes, self.cache_identity("process_image"), digest)
+            self.response_store.put(key, response)
+        return response
+
+    def process_bytes(self, data: ImageData, mime: str | None = None) -> str:
+        return self._text(self.detect_document_text(data))
+
+    def process_payload(self, payload: Payload) -> str:
+        return self._text(self.detect_document_text(payload.data, payload.digest))
+
+    def _text(self, response: Dict[str, Any]) -> str:
+        start = time.perf_counter()
+        text = textract_text(response)
+        self._record_call_info(parse_time=time.perf_counter() - start)
+        return text
+
+    def extract_text_with_boxes(self, image_path: str) -> List[Dict[str, Any]]:
+        with open(image_path, "rb") as document:
+            return self.extract_text_with_boxes_from_bytes(document.read())
+
+    def extract_text_with_boxes_from_bytes(self, data: ImageData, mime: str | None = None) -> List[Dict[str, Any]]:
+        """WORD spans with pixel ``bbox`` ``[x0, y0, x1, y1]``, like the VLM engine's output."""
+
+        size = Image.open(io.BytesIO(data)).size
+        return textract_words(self.detect_document_text(data), size=size)
@@ -0,0 +1,22 @@
+"""Local stand-ins for remote OCR services, for tests and load experiments."""
+
+from .engine import FakeCPUEngine, FakeEngine
+from .faults import Faults, parse_latency
+from .hub import local_dataset, synthetic_hf_dataset
+from .openai_server import FakeOpenAIServer
+from .pages import synthetic_page, synthetic_samples, synthetic_text
+from .textract_server import FakeTextractServer
+
+__all__ = [
+    "FakeCPUEngine",
+    "FakeEngine",
+    "FakeOpenAIServer",
+    "FakeTextractServer",
+    "Faults",
+    "local_dataset",
+    "parse_latency",
+    "synthetic_hf_dataset",
+    "synthetic_page",
+    "synthetic_samples",
+    "synthetic_text",
+]
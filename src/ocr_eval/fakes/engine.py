@@ -0,0 +1,96 @@
+"""In-process fake OCR engines: latency-bound and CPU-bound."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+from ..engines.base import BaseOCREngine, ImageData
+
+
+class FakeEngine(BaseOCREngine):
+    """Engine that sleeps instead of calling a service and returns a fixed reply.
+
+    Args:
+        reply: Text returned for every page; ``None`` echoes ``"<n> bytes"`` of the input.
+        latency: Mean seconds per call.
+        jitter: Uniform +/- jitter around ``latency`` (seconds).
+        error_rate: Fraction of calls that raise ``RuntimeError``.
+        seed: Seed for the jitter/error random stream.
+    """
+
+    def __init__(
+        self,
+        reply: Optional[str] = "fake transcription",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.reply = reply
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        return {"engine": "fake", "method": method, "reply": self.reply}
+
+    def process_image(self, image_path: str) -> str:
+        with open(image_path, "rb") as f:
+            return self.process_bytes(f.read())
+
+    def process_bytes(self, data: ImageData, mime: Optional[str] = None) -> str:
+        self.calls += 1
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise RuntimeError("injected fake engine error")
+        return self.reply if self.reply is not None else f"{len(data)} bytes"
+
+
+class FakeCPUEngine(BaseOCREngine):
+    """Engine that burns CPU (holding the GIL) like a local OCR model, for the process-pool host.
+
+    Args:
+        reply: Text returned for every page; ``None`` echoes ``"<n> bytes"`` of the input.
+        rounds: SHA-256 rounds over (a prefix of) the page per call, i.e. the CPU cost.
+        load_time: Seconds of simulated model loading in the constructor.
+        crash_rate: Fraction of calls that kill the whole process (to exercise restarts).
+        seed: Seed for the crash random stream (mixed with the PID, so workers differ).
+    """
+
+    def __init__(
+        self,
+        reply: Optional[str] = "fake transcription",
+        rounds: int = 20_000,
+        load_time: float = 0.0,
+        crash_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if load_time > 0:
+            time.sleep(load_time)
+        self.reply = reply
+        self.rounds = rounds
+        self.crash_rate = crash_rate
+        self._random = random.Random(None if seed is None else seed + os.getpid())
+
+    def cache_identity(self, method: str) -> Dict[str, Any]:
+        return {"engine": "fake-cpu", "method": method, "reply": self.reply, "rounds": self.rounds}
+
+    def process_image(self, image_path: str) -> str:
+        with open(image_path, "rb") as f:
+            return self.process_bytes(f.read())
+
+    def process_bytes(self, data: ImageData, mime: Optional[str] = None) -> str:
+        if self.crash_rate and self._random.random() < self.crash_rate:
+            os._exit(70)
+        digest = bytes(data[:4096])
+        for _ in range(self.rounds):
+            digest = hashlib.sha256(digest).digest()
+        return self.reply if self.reply is not None else f"{len(data)} bytes"
@@ -0,0 +1,84 @@
+"""Latency distributions and error injection for the fake services.
+
+Latency specs are a number of seconds or ``<dist>:<args>``:
+
+- ``0.2``: constant
+- ``uniform:0.1:0.5``: uniform between the two bounds
+- ``exp:0.3``: exponential with the given mean
+- ``normal:0.3:0.05``: normal (mean, stddev), clipped at 0
+- ``lognormal:0.3:0.5``: lognormal with the given median and sigma (long tail)
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+from typing import Callable, Optional, Union
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exp", "normal", "lognormal")
+
+
+def parse_latency(spec: Union[float, str]) -> Callable[[random.Random], float]:
+    """Turn a latency spec into a sampler ``f(rng) -> seconds``."""
+
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda rng: value
+    name, *args = str(spec).strip().split(":")
+    try:
+        if not args:
+            value = float(name)
+            return lambda rng: value
+        values = [float(a) for a in args]
+        if name == "constant":
+            return lambda rng: values[0]
+        if name == "uniform":
+            return lambda rng: rng.uniform(values[0], values[1])
+        if name == "exp":
+            return lambda rng: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+        if name == "normal":
+            return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+        if name == "lognormal":
+            return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    except (ValueError, IndexError):
+        pass
+    raise ValueError(f"Invalid latency spec '{spec}'. Use seconds or one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+
+
+class Faults:
+    """Per-request latency and failure decisions shared by a fake service's handler threads.
+
+    Args:
+        latency: Latency spec (see module docstring).
+        throttle_rate: Fraction of requests rejected as throttled (HTTP 429 / ThrottlingException).
+        error_rate: Fraction of requests failing with a 5xx server error.
+        seed: Seed for reproducible latency/failure sequences.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, str] = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if throttle_rate + error_rate > 1:
+            raise ValueError("throttle_rate + error_rate must be <= 1")
+        self._latency = parse_latency(latency)
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next(self) -> tuple[float, Optional[str]]:
+        """Return ``(delay_seconds, failure)`` where failure is ``None``, ``"throttle"`` or ``"error"``."""
+
+        with self._lock:
+            delay = self._latency(self._random)
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return delay, "throttle"
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, "error"
+        return delay, None
@@ -0,0 +1,95 @@
+"""Threaded HTTP/1.1 keep-alive server shared by the fake services."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def json_response(status: int, payload: Dict[str, Any], content_type: str = "application/json") -> Response:
+    return status, {"Content-Type": content_type}, json.dumps(payload).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling is observable
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:  # silence per-request stderr logging
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.owner._count("connections")
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.owner.handle(method, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeHTTPService"
+
+
+class FakeHTTPService:
+    """Base for fake services: subclasses implement :meth:`handle`.
+
+    ``counters`` tracks ``connections`` and ``requests`` plus whatever the
+    subclass counts (e.g. injected ``throttled`` / ``errors``).
+    """
+
+    thread_name = "fake-service"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.counters: Dict[str, int] = {"requests": 0, "connections": 0}
+        self._lock = threading.Lock()
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+            return self.counters[key]
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Response:
+        raise NotImplementedError
+
+    def start(self) -> "FakeHTTPService":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=self.thread_name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
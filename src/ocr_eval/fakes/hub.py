@@ -0,0 +1,44 @@
+"""In-memory Hugging Face datasets served through the loader, so no Hub access is needed."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from .pages import synthetic_page, synthetic_text
+
+
+def synthetic_hf_dataset(count: int, size: Tuple[int, int] = (1000, 1300)):
+    """An in-memory FUNSD-shaped ``datasets.Dataset`` (``id``, ``words``, ``image``)."""
+
+    import datasets
+
+    pages = [synthetic_page(*size, lines=20, seed=i) for i in range(min(count, 8))]
+    return datasets.Dataset.from_dict(
+        {
+            "id": [str(i) for i in range(count)],
+            "words": [synthetic_text(1500, seed=i).split() for i in range(count)],
+            "image": [{"bytes": pages[i % len(pages)], "path": None} for i in range(count)],
+        },
+        features=datasets.Features(
+            {
+                "id": datasets.Value("string"),
+                "words": datasets.Sequence(datasets.Value("string")),
+                "image": datasets.Image(),
+            }
+        ),
+    )
+
+
+@contextmanager
+def local_dataset(ds) -> Iterator[None]:
+    """Serve ``ds`` from the loader's ``load_dataset`` (whatever name is asked for)."""
+
+    from ..data import loader
+
+    original = loader.load_dataset
+    loader.load_dataset = lambda *args, streaming=False, **kwargs: ds.to_iterable_dataset() if streaming else ds
+    try:
+        yield
+    finally:
+        loader.load_dataset = original
@@ -0,0 +1,102 @@
+"""Minimal OpenAI-compatible HTTP server for exercising engines offline.
+
+Serves ``POST /v1/chat/completions`` and ``GET /v1/models`` over HTTP/1.1
+keep-alive on a background thread. Point an engine at it with
+``OpenAIVLMEngine(base_url=server.base_url)``::
+
+    with FakeOpenAIServer(reply="hello") as server:
+        engine = OpenAIVLMEngine(base_url=server.base_url)
+        engine.process_image("page.png")
+
+Latency distributions and 429/5xx injection come from :class:`~ocr_eval.fakes.faults.Faults`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Optional, Union
+
+from .faults import Faults
+from .http import FakeHTTPService, Response, json_response
+
+
+class FakeOpenAIServer(FakeHTTPService):
+    """Threaded fake of the chat completions endpoint.
+
+    Args:
+        reply: Assistant message content returned for every request.
+        latency: Seconds (or a latency spec such as ``lognormal:0.4:0.5``) before answering.
+        throttle_rate: Fraction of requests answered with HTTP 429.
+        error_rate: Fraction of requests answered with HTTP 500/503.
+        seed: Seed for the latency/failure sequence.
+        host: Interface to bind; port 0 picks a free port.
+        port: Port to bind.
+    """
+
+    thread_name = "fake-openai"
+
+    def __init__(
+        self,
+        reply: str = "fake transcription",
+        latency: Union[float, str] = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        super().__init__(host, port)
+        self.reply = reply
+        self.faults = Faults(latency, throttle_rate, error_rate, seed)
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.address}/v1"
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Response:
+        path = path.rstrip("/")
+        if method == "GET" and path.endswith("/models"):
+            return json_response(
+                200, {"object": "list", "data": [{"id": "fake-vlm", "object": "model", "owned_by": "local"}]}
+            )
+        if method == "POST" and path.endswith("/chat/completions"):
+            status, payload = self.respond(json.loads(body or b"{}"))
+            return json_response(status, payload)
+        return json_response(404, {"error": {"message": "not found"}})
+
+    def respond(self, request: Dict[str, Any]):
+        """Return ``(status, payload)`` for one chat completion request."""
+
+        n = self._count("requests")
+        delay, failure = self.faults.next()
+        if delay:
+            time.sleep(delay)
+        if failure == "throttle":
+            self._count("throttled")
+            return 429, {"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}}
+        if failure == "error":
+            self._count("errors")
+            return 500, {"error": {"message": "The server had an error (fake)", "type": "server_error"}}
+        self._count("ok")
+        prompt_chars = sum(len(json.dumps(m.get("content", ""))) for m in request.get("messages", []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion_tokens = max(1, len(self.reply) // 4)
+        return 200, {
+            "id": f"chatcmpl-fake-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-vlm"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self.reply},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
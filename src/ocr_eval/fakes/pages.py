@@ -0,0 +1,44 @@
+"""Synthetic page images, text and samples for benchmarks and load tests."""
+
+from __future__ import annotations
+
+import io
+import random
+import string
+from typing import Any, Dict, List, Optional
+
+from PIL import Image, ImageDraw
+
+
+def synthetic_text(n_chars: int, seed: int = 0) -> str:
+    """Random lowercase words, ``n_chars`` long."""
+
+    rng = random.Random(seed)
+    words, size = [], 0
+    while size < n_chars:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:n_chars]
+
+
+def synthetic_page(width: int = 1700, height: int = 2200, lines: int = 40, fmt: str = "PNG", seed: int = 0) -> bytes:
+    """A scanned-page-like image (text lines on white) encoded as ``fmt``."""
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(lines):
+        draw.text((80, 80 + i * (height - 160) // lines), synthetic_text(90, seed + i), fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def synthetic_samples(count: int, page: Optional[bytes] = None, gt_chars: int = 2000) -> List[Dict[str, Any]]:
+    """Loader-shaped samples sharing one page image, each with its own ground truth."""
+
+    page = page or synthetic_page()
+    return [
+        {"id": f"synthetic-{i}", "index": i, "image_bytes": page, "ground_truth": synthetic_text(gt_chars, seed=i)}
+        for i in range(count)
+    ]
@@ -0,0 +1,95 @@
+"""Stub of the Textract ``DetectDocumentText`` JSON endpoint.
+
+Point the engine at it with ``TextractEngine(endpoint_url=server.endpoint_url)``
+(any static credentials work; requests are not verified). Throttled requests
+get ``ThrottlingException`` and failures ``InternalServerError``, so botocore's
+real retry and adaptive rate-limiting logic is exercised.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+from .faults import Faults
+from .http import FakeHTTPService, Response, json_response
+
+_AMZ_JSON = "application/x-amz-json-1.1"
+
+
+def _block(block_type: str, text: str, left: float, top: float, width: float, height: float) -> Dict[str, Any]:
+    return {
+        "BlockType": block_type,
+        "Id": str(uuid.uuid4()),
+        "Text": text,
+        "Confidence": 99.0,
+        "Geometry": {"BoundingBox": {"Left": left, "Top": top, "Width": width, "Height": height}},
+    }
+
+
+def detect_document_text_response(text: str, words_per_line: int = 10) -> Dict[str, Any]:
+    """A plausible ``DetectDocumentText`` response whose LINE/WORD blocks spell ``text``."""
+
+    words = text.split()
+    lines = [words[i:i + words_per_line] for i in range(0, len(words), words_per_line)]
+    height = 1.0 / max(len(lines) + 2, 10)
+    blocks: List[Dict[str, Any]] = [{"BlockType": "PAGE", "Id": str(uuid.uuid4())}]
+    for row, line in enumerate(lines):
+        top = height * (row + 1)
+        blocks.append(_block("LINE", " ".join(line), 0.05, top, 0.9, height * 0.8))
+        step = 0.9 / len(line)
+        for col, word in enumerate(line):
+            blocks.append(_block("WORD", word, 0.05 + col * step, top, step * 0.9, height * 0.8))
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks, "DetectDocumentTextModelVersion": "fake"}
+
+
+class FakeTextractServer(FakeHTTPService):
+    """Threaded fake of Textract's JSON protocol (``DetectDocumentText`` only).
+
+    Args:
+        reply: Text the returned LINE/WORD blocks spell out (controls response size).
+        latency: Seconds (or a latency spec such as ``uniform:0.5:2``) before answering.
+        throttle_rate: Fraction of requests rejected with ``ThrottlingException`` (HTTP 400).
+        error_rate: Fraction of requests failing with ``InternalServerError`` (HTTP 500).
+        seed: Seed for the latency/failure sequence.
+        host: Interface to bind; port 0 picks a free port.
+        port: Port to bind.
+    """
+
+    thread_name = "fake-textract"
+
+    def __init__(
+        self,
+        reply: str = "fake transcription",
+        latency: Union[float, str] = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        super().__init__(host, port)
+        self.faults = Faults(latency, throttle_rate, error_rate, seed)
+        self.response = detect_document_text_response(reply)
+
+    @property
+    def endpoint_url(self) -> str:
+        return self.address
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Response:
+        target = {k.lower(): v for k, v in headers.items()}.get("x-amz-target", "")
+        if method != "POST" or not target.endswith(".DetectDocumentText"):
+            return json_response(400, {"__type": "UnsupportedOperation", "message": target}, _AMZ_JSON)
+        self._count("requests")
+        delay, failure = self.faults.next()
+        if delay:
+            time.sleep(delay)
+        if failure == "throttle":
+            self._count("throttled")
+            return json_response(400, {"__type": "ThrottlingException", "message": "Rate exceeded (fake)"}, _AMZ_JSON)
+        if failure == "error":
+            self._count("errors")
+            return json_response(500, {"__type": "InternalServerError", "message": "fake failure"}, _AMZ_JSON)
+        self._count("ok")
+        return json_response(200, self.response, _AMZ_JSON)
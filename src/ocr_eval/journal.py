@@ -0,0 +1,116 @@
+"""Append-only run journal for checkpointed, resumable evaluations.
+
+A run directory holds ``run.json`` (the options the run was started with) and
+``journal.jsonl``, to which every finished (sample, engine) result is appended
+and flushed as soon as it completes. A crashed or interrupted run can be
+resumed from the same directory: pairs that already succeeded are skipped,
+failed ones are retried, and the report is rebuilt from the journal.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+JOURNAL_FILE = "journal.jsonl"
+RUN_FILE = "run.json"
+
+
+def default_run_dir(dataset: str, root: str = "runs") -> Path:
+    return Path(root) / f"{dataset}-{time.strftime('%Y%m%d-%H%M%S')}"
+
+
+class RunJournal:
+    """Thread-safe JSONL journal of per-(sample, engine) results.
+
+    Args:
+        run_dir: Directory for ``run.json`` and ``journal.jsonl``; created if missing.
+        fsync: Also fsync after every record (slower, survives power loss).
+        filename: Journal file inside ``run_dir``, for stages that keep their own (e.g. QA answers).
+    """
+
+    def __init__(self, run_dir: str | Path, fsync: bool = False, filename: str = JOURNAL_FILE):
+        self.run_dir = Path(run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.run_dir / filename
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write_config(self, config: Dict[str, Any]) -> None:
+        (self.run_dir / RUN_FILE).write_text(json.dumps(config, indent=2, sort_keys=True))
+
+    def read_config(self) -> Optional[Dict[str, Any]]:
+        path = self.run_dir / RUN_FILE
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def append(self, index: int, row: Dict[str, Any]) -> None:
+        """Record one finished result; ``index`` is the sample's position in the run."""
+
+        line = json.dumps({"index": index, **row}, default=str)
+        with self._lock:
+            if self._file is None:
+                self._file = self._open_for_append()
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _open_for_append(self):
+        f = open(self.path, "a+b")
+        # Terminate a torn last line from a crash so the next record starts cleanly.
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.close()
+        return open(self.path, "a", encoding="utf-8")
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield raw journal records in write order, skipping a torn final line."""
+
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partially written line from a crash
+
+    def latest(self) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """Latest record per (sample index, engine); successes are never overwritten by failures."""
+
+        latest: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for record in self.records():
+            key = (record["index"], record["Engine"])
+            previous = latest.get(key)
+            if previous is not None and previous.get("Status") == "ok" and record.get("Status") != "ok":
+                continue
+            latest[key] = record
+        return latest
+
+    def completed(self) -> Set[Tuple[int, str]]:
+        """(sample index, engine) pairs that already have a successful result."""
+
+        return {key for key, record in self.latest().items() if record.get("Status") == "ok"}
+
+    def spend(self) -> Tuple[float, int]:
+        """Total recorded cost and tokens over every call in the journal, retried failures included."""
+
+        cost, tokens = 0.0, 0
+        for record in self.records():
+            cost += record.get("Cost ($)") or 0.0
+            tokens += (record.get("Prompt Tokens") or 0) + (record.get("Completion Tokens") or 0)
+        return cost, tokens
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
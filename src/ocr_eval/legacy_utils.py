@@ -11,9 +11,11 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, Optional
 
 import matplotlib.pyplot as plt
-from datasets import Dataset, load_dataset
 from PIL import Image
 
+# Shares the process-wide dataset handle cache and O(1) row sampling with utils.preview.
+from .utils.preview import _pick_sample, open_dataset
+
 __all__ = [
     "preview_docvqa_sample",
     "preview_funsd_sample",
@@ -73,13 +75,6 @@ def _resolve_field(example: Dict[str, Any], candidates: Iterable[str]) -> Option
     return None
 
 
-def _pick_sample(dataset: Dataset, sample_idx: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
-    if sample_idx is not None:
-        return dataset[int(sample_idx)]
-    # Hugging Face Dataset.shuffle returns a new dataset, so only shuffle a handful for speed.
-    return dataset.shuffle(seed=seed).select(range(1))[0]
-
-
 def _show(image: Image.Image, title: str) -> None:
     plt.figure(figsize=(8, 8))
     plt.imshow(image)
@@ -102,7 +97,7 @@ def preview_docvqa_sample(
     Returns the raw example so callers can inspect additional metadata.
     """
 
-    ds = load_dataset(dataset_name, split=split)
+    ds = open_dataset(dataset_name, split)
     example = _pick_sample(ds, sample_idx=sample_idx, seed=seed)
     image = _ensure_image(example, Path(images_root) if images_root else None)
     question = _resolve_field(example, ("question", "questions", "qa", "qas"))
@@ -135,7 +130,7 @@ def preview_funsd_sample(
 ) -> Dict[str, Any]:
     """Visualise a FUNSD form with its first question/answer pair."""
 
-    ds = load_dataset(dataset_name, split=split)
+    ds = open_dataset(dataset_name, split)
     example = _pick_sample(ds, sample_idx=sample_idx, seed=seed)
     image = _ensure_image(example, Path(images_root) if images_root else None)
     question = _resolve_field(example, ("question", "questions", "text"))
@@ -0,0 +1,156 @@
+"""Image preprocessing between the loader and the engines.
+
+A :class:`PreprocessProfile` describes how to shrink a page before it is sent
+to an engine (max long side, grayscale, output format and quality). Profiles
+are chosen per engine so, e.g., the VLM can receive a small JPEG while Textract
+keeps the original PNG. The resulting :class:`Payload` carries the correct MIME
+type and byte size so reports can relate payload size to latency and accuracy.
+
+Profiles are given by preset name (see :data:`PROFILES`) or as a spec string of
+colon-separated tokens: a format (``original``, ``png``, ``jpeg``, ``webp``),
+``q<quality>``, ``max<pixels>`` and ``gray``, e.g. ``jpeg:q80:max1600:gray``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from PIL import Image
+
+_MAGIC_MIME = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"GIF8", "image/gif"),
+)
+_FORMAT_MIME = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def sniff_mime(data: bytes) -> str:
+    """Best-effort MIME type from the leading magic bytes (defaults to PNG)."""
+
+    head = bytes(data[:12])
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime in _MAGIC_MIME:
+        if head.startswith(magic):
+            return mime
+    return "image/png"
+
+
+@dataclass(frozen=True)
+class PreprocessProfile:
+    """How to transform a page image before sending it to an engine.
+
+    ``format=None`` keeps the original encoding; if no other option is set the
+    original bytes are passed through untouched.
+    """
+
+    name: str = "original"
+    max_side: Optional[int] = None
+    grayscale: bool = False
+    format: Optional[str] = None
+    quality: int = 85
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self.max_side is None and not self.grayscale and self.format is None
+
+
+@dataclass
+class Payload:
+    """Encoded image ready for an engine request."""
+
+    data: bytes
+    mime: str
+    width: int
+    height: int
+    profile: str = "original"
+    _b64: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _digest: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    # Computed once per payload, however many engines or configurations share it.
+    # Under a lock: engines of one sample ask for them concurrently.
+    @property
+    def b64(self) -> str:
+        with self._lock:
+            if self._b64 is None:
+                self._b64 = base64.b64encode(self.data).decode("utf-8")
+            return self._b64
+
+    @property
+    def digest(self) -> bytes:
+        """SHA-256 of the bytes, as used in prediction cache keys."""
+        with self._lock:
+            if self._digest is None:
+                self._digest = hashlib.sha256(self.data).digest()
+            return self._digest
+
+
+PROFILES: Dict[str, PreprocessProfile] = {
+    "original": PreprocessProfile(),
+    "png-2048": PreprocessProfile("png-2048", max_side=2048, format="PNG"),
+    "jpeg-2048": PreprocessProfile("jpeg-2048", max_side=2048, format="JPEG", quality=90),
+    "jpeg-1600": PreprocessProfile("jpeg-1600", max_side=1600, format="JPEG", quality=85),
+    "jpeg-1024-gray": PreprocessProfile("jpeg-1024-gray", max_side=1024, grayscale=True, format="JPEG", quality=80),
+    "webp-1600": PreprocessProfile("webp-1600", max_side=1600, format="WEBP", quality=80),
+}
+
+
+def parse_profile(spec: str) -> PreprocessProfile:
+    """Resolve a preset name or a ``format:q<n>:max<n>:gray`` spec string."""
+
+    spec = spec.strip()
+    if spec in PROFILES:
+        return PROFILES[spec]
+    fmt: Optional[str] = None
+    max_side: Optional[int] = None
+    quality = 85
+    grayscale = False
+    for token in filter(None, spec.lower().split(":")):
+        if token in ("png", "jpeg", "jpg", "webp"):
+            fmt = "JPEG" if token == "jpg" else token.upper()
+        elif token == "original":
+            fmt = None
+        elif token in ("gray", "grey", "grayscale"):
+            grayscale = True
+        elif token.startswith("q") and token[1:].isdigit():
+            quality = int(token[1:])
+        elif token.startswith("max") and token[3:].isdigit():
+            max_side = int(token[3:])
+        else:
+            raise ValueError(f"Unknown preprocessing token '{token}' in '{spec}'. Presets: {', '.join(PROFILES)}")
+    return PreprocessProfile(spec, max_side=max_side, grayscale=grayscale, format=fmt, quality=quality)
+
+
+def preprocess(data: bytes, profile: PreprocessProfile) -> Payload:
+    """Apply ``profile`` to encoded image bytes and return the request payload."""
+
+    image = Image.open(io.BytesIO(data))
+    source_format = image.format
+    if profile.is_passthrough:
+        return Payload(bytes(data), sniff_mime(data), image.width, image.height, profile.name)
+
+    if profile.max_side and max(image.size) > profile.max_side:
+        image.thumbnail((profile.max_side, profile.max_side), Image.Resampling.LANCZOS)
+    fmt = profile.format or (source_format if source_format in _FORMAT_MIME else "PNG")
+    if profile.grayscale:
+        image = image.convert("L")
+    elif fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    save_kwargs = {"optimize": True} if fmt == "PNG" else {"quality": profile.quality}
+    image.save(buffer, format=fmt, **save_kwargs)
+    return Payload(buffer.getvalue(), _FORMAT_MIME[fmt], image.width, image.height, profile.name)
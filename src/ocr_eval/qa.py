@@ -0,0 +1,241 @@
+"""Question answering on top of OCR: EM, token F1 and ANLS per engine.
+
+For datasets with questions (DocVQA), each engine's transcription is handed to a
+reader (any object with ``answer_question(context, question)``, e.g.
+:class:`~ocr_eval.engines.openai.OpenAIVLMEngine`) together with the page's
+questions. Answers are appended to ``qa.jsonl`` in the run directory as they
+arrive, so a resumed run only asks what is still missing; scoring happens
+afterwards over all answers at once.
+
+Scoring follows the usual DocVQA conventions, each taking the best value over a
+question's gold answers:
+
+- ``EM``: exact match after SQuAD-style normalization (lowercase, no
+  punctuation or articles, collapsed whitespace).
+- ``Answer F1``: token-overlap F1 of the normalized answers.
+- ``ANLS``: ``1 - normalized Levenshtein distance`` of the lowercased, stripped
+  answers, or 0 when the distance is ``>= 0.5``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import string
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from .journal import RunJournal
+from .results import read_results
+
+QA_FILE = "qa.jsonl"
+ANLS_THRESHOLD = 0.5
+# Questions per scoring task; smaller inputs are scored in-process.
+QA_CHUNK_SIZE = 8192
+SCORE_COLUMNS = ("EM", "Answer F1", "ANLS")
+
+_PUNCTUATION = re.compile(f"[{re.escape(string.punctuation)}]")
+_ARTICLES = re.compile(r"\b(a|an|the)\b")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_answers(texts: Sequence[Optional[str]]) -> List[str]:
+    """SQuAD-style normalization of many answers at once (pandas string ops)."""
+
+    series = pd.Series(list(texts), dtype=object).fillna("").astype(str).str.lower()
+    series = series.str.replace(_PUNCTUATION, "", regex=True).str.replace(_ARTICLES, " ", regex=True)
+    return series.str.replace(_SPACES, " ", regex=True).str.strip().tolist()
+
+
+def _token_f1(prediction: str, gold: str) -> float:
+    predicted, expected = prediction.split(), gold.split()
+    if not predicted or not expected:
+        return float(predicted == expected)
+    common = sum((Counter(predicted) & Counter(expected)).values())
+    if not common:
+        return 0.0
+    precision, recall = common / len(predicted), common / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _score_chunk(predictions: Sequence[str], gold_answers: Sequence[Sequence[str]]) -> Dict[str, np.ndarray]:
+    # Every (prediction, gold) pair is scored in one flat batch, then reduced to the
+    # best value per question with maximum.reduceat over each question's slice.
+    counts = np.fromiter((len(golds) for golds in gold_answers), dtype=np.int64, count=len(gold_answers))
+    flat_gold = [gold for golds in gold_answers for gold in golds]
+    flat_pred = [predictions[i] for i in np.repeat(np.arange(len(predictions)), counts).tolist()]
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    norm_pred, norm_gold = normalize_answers(flat_pred), normalize_answers(flat_gold)
+    em = np.fromiter((p == g for p, g in zip(norm_pred, norm_gold)), dtype=np.float64, count=len(flat_gold))
+    f1 = np.fromiter((_token_f1(p, g) for p, g in zip(norm_pred, norm_gold)), dtype=np.float64, count=len(flat_gold))
+    distance = process.cpdist(
+        [p.strip().lower() for p in flat_pred],
+        [g.strip().lower() for g in flat_gold],
+        scorer=Levenshtein.normalized_distance,
+        workers=1,
+    )
+    distance = distance.astype(np.float64)
+    anls = np.where(distance < ANLS_THRESHOLD, 1.0 - distance, 0.0)
+    return {
+        "EM": np.maximum.reduceat(em, offsets),
+        "Answer F1": np.maximum.reduceat(f1, offsets),
+        "ANLS": np.maximum.reduceat(anls, offsets),
+    }
+
+
+def score_answers(
+    predictions: Sequence[Optional[str]],
+    gold_answers: Sequence[Sequence[str]],
+    processes: Optional[int] = None,
+    chunk_size: int = QA_CHUNK_SIZE,
+) -> Dict[str, np.ndarray]:
+    """
+    Per-question EM, token F1 and ANLS (best over each question's gold answers).
+
+    Questions are scored in chunks of ``chunk_size``; with more than one chunk they
+    are spread over ``processes`` worker processes (default: all cores). A question
+    without gold answers is scored against the empty answer.
+    """
+
+    predictions = ["" if p is None else str(p) for p in predictions]
+    gold_answers = [[str(g) for g in golds] or [""] for golds in gold_answers]
+    if len(predictions) != len(gold_answers):
+        raise ValueError(f"predictions and gold_answers differ in length ({len(predictions)} != {len(gold_answers)})")
+    if not predictions:
+        return {column: np.zeros(0) for column in SCORE_COLUMNS}
+    chunks = [
+        (predictions[start : start + chunk_size], gold_answers[start : start + chunk_size])
+        for start in range(0, len(predictions), chunk_size)
+    ]
+    processes = processes or os.cpu_count() or 1
+    if len(chunks) == 1 or processes == 1:
+        parts = [_score_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as pool:
+            parts = list(pool.map(_score_chunk, *zip(*chunks)))
+    return {column: np.concatenate([part[column] for part in parts]) for column in SCORE_COLUMNS}
+
+
+def score_answer_frame(answers: pd.DataFrame, processes: Optional[int] = None) -> pd.DataFrame:
+    """``answers`` (see :func:`read_answers`) with score columns; failed reader calls score NaN."""
+
+    scored = answers.copy()
+    ok = (scored["Status"] == "ok").to_numpy()
+    scores = score_answers(
+        scored.loc[ok, "Answer"].tolist(), scored.loc[ok, "Gold Answers"].tolist(), processes=processes
+    )
+    for column in SCORE_COLUMNS:
+        scored[column] = np.nan
+        scored.loc[ok, column] = scores[column]
+    return scored
+
+
+def answer_questions(
+    reader: Any,
+    items: Iterable[Dict[str, Any]],
+    workers: int = 1,
+    on_answer: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Ask ``reader`` every item's question about its ``Context`` on ``workers`` threads.
+
+    Items carry ``index``, ``Engine``, ``Question ID``, ``Question``, ``Gold Answers``
+    and ``Context``; returns one answer row per item (without the context), also
+    passed to ``on_answer(index, row)`` as soon as it is ready.
+    """
+
+    lock = threading.Lock()
+    rows: List[Dict[str, Any]] = []
+
+    def _ask(item: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            answer, status = reader.answer_question(item["Context"], item["Question"]), "ok"
+        except Exception as e:
+            answer, status = str(e), "error"
+        info = reader.pop_call_info()
+        row = {
+            "Engine": item["Engine"],
+            "Question ID": item["Question ID"],
+            "Question": item["Question"],
+            "Gold Answers": list(item["Gold Answers"]),
+            "Answer": answer,
+            "Status": status,
+            "Latency (s)": round(time.perf_counter() - start, 2),
+            "Prompt Tokens": info.get("prompt_tokens", 0),
+            "Completion Tokens": info.get("completion_tokens", 0),
+            "Cost ($)": round(reader.call_cost(info), 6),
+        }
+        if on_answer is not None:
+            on_answer(item["index"], row)
+        with lock:
+            rows.append({"index": item["index"], **row})
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ocr-qa") as pool:
+        for future in [pool.submit(_ask, item) for item in items]:
+            future.result()
+    return rows
+
+
+def answered(run_dir: str | Path) -> Set[Tuple[int, str, str]]:
+    """(sample index, engine, question ID) triples that already have a successful answer."""
+
+    return {
+        (record["index"], record["Engine"], str(record["Question ID"]))
+        for record in RunJournal(run_dir, filename=QA_FILE).records()
+        if record.get("Status") == "ok"
+    }
+
+
+def pending_questions(
+    run_dir: str | Path, questions: Dict[int, List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Reader items for every successful transcription in ``run_dir`` whose questions are unanswered.
+
+    ``questions`` maps sample index to the sample's ``questions`` (see the loader).
+    """
+
+    if not questions:
+        return []
+    predictions = read_results([run_dir], columns=["Prediction"])
+    if predictions.empty:
+        return []
+    done = answered(run_dir)
+    items = []
+    for row in predictions[predictions["Status"] == "ok"].to_dict("records"):
+        index, engine = int(row["index"]), row["Engine"]
+        for question in questions.get(index, []):
+            if (index, engine, str(question["id"])) in done:
+                continue
+            items.append({
+                "index": index,
+                "Engine": engine,
+                "Question ID": str(question["id"]),
+                "Question": question["question"],
+                "Gold Answers": question["answers"],
+                "Context": row["Prediction"],
+            })
+    return items
+
+
+def read_answers(run_dirs: Sequence[str | Path]) -> pd.DataFrame:
+    """Latest answer per (sample index, engine, question) across runs; a success is never replaced by a failure."""
+
+    records = [record for run_dir in run_dirs for record in RunJournal(run_dir, filename=QA_FILE).records()]
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    df["Question ID"] = df["Question ID"].astype(str)
+    df["_ok"] = df["Status"] == "ok"
+    df = df.sort_values("_ok", kind="stable").drop_duplicates(["index", "Engine", "Question ID"], keep="last")
+    return df.drop(columns="_ok").sort_values(["index", "Engine", "Question ID"]).reset_index(drop=True)
@@ -0,0 +1,229 @@
+"""Summary tables and the Markdown report, computed from result rows.
+
+Every function takes a DataFrame of result rows as produced by the runner (or
+read back with :func:`ocr_eval.results.read_results`); the text columns are not
+needed. Kept apart from the CLI so pandas is only imported once a report is built.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Per-row edit/length counts used for corpus metrics.
+COUNT_COLUMNS = ("Char Edits", "Ref Chars", "Word Edits", "Ref Words")
+
+
+def payload_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Relate payload size to latency and CER per engine/profile (errors and cache hits excluded)."""
+
+    live = df[(df["Latency (s)"] >= 0) & ~df["Cached"]]
+    rows = []
+    for (engine_name, profile), group in live.groupby(["Engine", "Profile"]):
+        # One payload size per profile is common (fixed page size); its correlation is simply NaN.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rows.append({
+                "Engine": engine_name,
+                "Profile": profile,
+                "Payload (KB)": group["Payload (KB)"].mean(),
+                "Latency (s)": group["Latency (s)"].mean(),
+                "CER": group["CER"].mean(),
+                "corr(payload, latency)": group["Payload (KB)"].corr(group["Latency (s)"]),
+                "corr(payload, CER)": group["Payload (KB)"].corr(group["CER"]),
+            })
+    return pd.DataFrame(rows)
+
+
+def retry_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-engine retries and time lost to throttling/backoff (engines that report them)."""
+
+    if "Retries" not in df.columns:
+        return pd.DataFrame()
+    live = df[~df["Cached"]].fillna({"Retries": 0, "Throttled": 0, "Throttle (s)": 0})
+    table = live.groupby("Engine").agg(
+        **{
+            "Calls": ("Retries", "size"),
+            "Retries": ("Retries", "sum"),
+            "Throttled": ("Throttled", "sum"),
+            "Throttle (s)": ("Throttle (s)", "sum"),
+            "Throttle / call (s)": ("Throttle (s)", "mean"),
+        }
+    )
+    return table[(table["Retries"] > 0) | (table["Throttle (s)"] > 0)].reset_index()
+
+
+def usage_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-engine token/page usage and estimated cost, with a total row (engines that report usage)."""
+
+    if "Cost ($)" not in df.columns:
+        return pd.DataFrame()
+    usage_columns = ["Prompt Tokens", "Completion Tokens", "Billed Pages", "Cost ($)"]
+    usage = df.reindex(columns=["Engine", "Cached", *usage_columns]).fillna(dict.fromkeys(usage_columns, 0))
+    table = usage.groupby("Engine", sort=False).agg(
+        **{
+            "Calls": ("Cached", "size"),
+            "Live Calls": ("Cached", lambda cached: int((~cached.astype(bool)).sum())),
+            **{column: (column, "sum") for column in usage_columns},
+        }
+    )
+    table = table[table[usage_columns].sum(axis=1) > 0]
+    if table.empty:
+        return pd.DataFrame()
+    table.loc["Total"] = table.sum()
+    table["Cost / call ($)"] = table["Cost ($)"] / table["Live Calls"].where(table["Live Calls"] > 0)
+    return table.reset_index()
+
+
+def summarize(df: pd.DataFrame, qa: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Per-engine means over successful calls, error rate, corpus-level WER/CER and latency tails.
+
+    With a :func:`qa_table`, its EM / Answer F1 / ANLS columns are added per engine.
+    """
+
+    # Error rows carry -1 placeholders, so they only count towards the error rate.
+    ok = df[df["Status"] == "ok"]
+    engines = df["Engine"].unique()
+    summary = ok.groupby("Engine")[["Latency (s)", "WER", "CER"]].mean().reindex(engines)
+    summary.index.name = "Engine"
+    # Cache hits would drag latency towards zero, so time only live calls.
+    live = ok[~ok["Cached"].astype(bool)].groupby("Engine")["Latency (s)"]
+    summary["Latency (s)"] = live.mean()
+    summary["Error Rate"] = (df["Status"] != "ok").groupby(df["Engine"]).mean()
+    # Corpus-level rates: total edits over total reference length across the run.
+    totals = ok.groupby("Engine")[list(COUNT_COLUMNS)].sum()
+    summary["Corpus WER"] = totals["Word Edits"] / totals["Ref Words"].where(totals["Ref Words"] > 0)
+    summary["Corpus CER"] = totals["Char Edits"] / totals["Ref Chars"].where(totals["Ref Chars"] > 0)
+    for q in (50, 90, 99):
+        summary[f"Latency p{q} (s)"] = live.quantile(q / 100)
+    summary = summary.reset_index()
+    if qa is not None and not qa.empty:
+        summary = summary.merge(qa[["Engine", "EM", "Answer F1", "ANLS"]], on="Engine", how="left")
+    return summary
+
+
+def qa_table(answers: pd.DataFrame) -> pd.DataFrame:
+    """Per-engine QA scores from scored answer rows (see :func:`ocr_eval.qa.score_answer_frame`).
+
+    Means are over answered questions; failed reader calls only count towards the error rate.
+    """
+
+    if answers.empty:
+        return pd.DataFrame()
+    answers = answers.assign(_ok=answers["Status"] == "ok")
+    table = answers.groupby("Engine", sort=False).agg(
+        **{
+            "Questions": ("Status", "size"),
+            "Error Rate": ("_ok", lambda ok: 1.0 - ok.mean()),
+            "EM": ("EM", "mean"),
+            "Answer F1": ("Answer F1", "mean"),
+            "ANLS": ("ANLS", "mean"),
+            "Reader Cost ($)": ("Cost ($)", "sum"),
+        }
+    )
+    return table.reset_index()
+
+
+def sweep_table(df: pd.DataFrame, configs: List[Dict]) -> pd.DataFrame:
+    """One row per sweep configuration (see :meth:`ocr_eval.sweep.SweepConfig.as_row`), best corpus CER first.
+
+    Adds accuracy, latency tails and error rate from :func:`summarize`, plus mean
+    payload size, completion tokens and cost per page.
+    """
+
+    summary = summarize(df).set_index("Engine")
+    ok = df[df["Status"] == "ok"]
+    usage = df.reindex(columns=["Engine", "Completion Tokens", "Cost ($)"]).fillna(0).groupby("Engine")
+    rows = []
+    for config in configs:
+        name = config["Engine"]
+        if name not in summary.index:
+            continue
+        stats = summary.loc[name]
+        rows.append({
+            **config,
+            "Corpus WER": stats["Corpus WER"],
+            "Corpus CER": stats["Corpus CER"],
+            "CER": stats["CER"],
+            "Latency p50 (s)": stats["Latency p50 (s)"],
+            "Latency p90 (s)": stats["Latency p90 (s)"],
+            "Error Rate": stats["Error Rate"],
+            "Payload (KB)": ok.loc[ok["Engine"] == name, "Payload (KB)"].mean(),
+            "Completion Tokens / page": usage["Completion Tokens"].mean().get(name),
+            "Cost / page ($)": usage["Cost ($)"].mean().get(name),
+        })
+    if not rows:
+        return pd.DataFrame()
+    table = pd.DataFrame(rows).sort_values(["Corpus CER", "CER"], kind="stable", na_position="last")
+    return table.reset_index(drop=True)
+
+
+def stage_table(telemetry) -> pd.DataFrame:
+    """Per-(engine, stage) latency rows from a :class:`~ocr_eval.telemetry.Telemetry`."""
+
+    return pd.DataFrame(telemetry.stage_summary())
+
+
+def worker_table(hosts: Dict[str, object]) -> pd.DataFrame:
+    """Per-worker calls, restarts and throughput of process-pool engines, keyed by engine name."""
+
+    return pd.DataFrame([{"Engine": name, **row} for name, host in hosts.items() for row in host.worker_stats()])
+
+
+def concurrency_table(controllers: Dict[str, object]) -> pd.DataFrame:
+    """Final and peak in-flight limits and the backoff signals of each engine's AIMD controller."""
+
+    return pd.DataFrame([{"Engine": name, **controller.as_row()} for name, controller in controllers.items()])
+
+
+def write_report(
+    output: str,
+    summary: pd.DataFrame,
+    header: List[str],
+    sections: Dict[str, str],
+) -> None:
+    """Write the compact Markdown report: header lines, summary, then extra sections.
+
+    Per-sample rows (with full texts) live in each run's results store, not here.
+    """
+
+    with open(output, "w") as f:
+        f.write("# OCR Evaluation Results\n\n")
+        for line in header:
+            f.write(f"{line}\n\n")
+        f.write("## Summary\n\n")
+        f.write(summary.to_markdown(index=False))
+        f.write("\n")
+        for title, body in sections.items():
+            f.write(f"\n## {title}\n\n{body}\n")
+
+
+def loadtest_table(df: pd.DataFrame, wall_time: float, servers: Dict[str, object], telemetry) -> pd.DataFrame:
+    """Per-engine sustained throughput, queueing delay and error recovery for a load test."""
+
+    stages = {(r["Engine"], r["Stage"]): r for r in telemetry.stage_summary()}
+    rows = []
+    for engine_name, group in df.groupby("Engine", sort=False):
+        counters = servers[engine_name].counters
+        queue = stages.get((engine_name, "queue"), {})
+        request = stages.get((engine_name, "request"), {})
+        ok = group["Status"] == "ok"
+        rows.append({
+            "Engine": engine_name,
+            "Calls": len(group),
+            "OK": int(ok.sum()),
+            "Failed": int((~ok).sum()),
+            "Calls/s": len(group) / wall_time if wall_time > 0 else 0.0,
+            "Queue p50 (s)": queue.get("p50 (s)"),
+            "Queue p99 (s)": queue.get("p99 (s)"),
+            "Request p50 (s)": request.get("p50 (s)"),
+            "Request p99 (s)": request.get("p99 (s)"),
+            "Server Requests": counters.get("requests", 0),
+            "Injected 429/Throttle": counters.get("throttled", 0),
+            "Injected 5xx": counters.get("errors", 0),
+            "Client Retries": int(group["Retries"].sum()),
+            "Recovered Calls": int((ok & (group["Retries"] > 0)).sum()),
+            "Connections": counters.get("connections", 0),
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,141 @@
+"""Raw engine responses kept for offline re-projection.
+
+Textract's ``DetectDocumentText`` returns far more than the line text the
+evaluation uses: every LINE and WORD block with geometry and confidence.
+:class:`ResponseStore` keeps each raw response zlib-compressed in SQLite, keyed
+like the prediction cache (image bytes + engine identity, see
+:func:`~ocr_eval.cache.make_cache_key`), so word-level text, boxes or
+confidence filtering can be derived later without calling the service again.
+
+The ``textract_*`` projections work on a stored (or live) response dict and
+never touch the network. Boxes are ``[x0, y0, x1, y1]`` in Textract's
+normalized page coordinates (0-1), or in pixels when ``size=(width, height)``
+is given, matching the ``{"text", "bbox"}`` spans of the VLM engine.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cache import make_cache_key
+
+RESPONSES_FILE = "responses.sqlite"
+
+
+def compress_response(response: Dict[str, Any]) -> bytes:
+    """Compact JSON + zlib; HTTP bookkeeping (``ResponseMetadata``) is dropped."""
+
+    body = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+    return zlib.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decompress_response(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+class ResponseStore:
+    """SQLite store of compressed raw responses, safe to share between threads.
+
+    Args:
+        path: SQLite file to create or reuse.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, engine TEXT NOT NULL, body BLOB NOT NULL,"
+            " size INTEGER NOT NULL, created REAL NOT NULL)"
+        )
+
+    def put(self, key: str, response: Dict[str, Any], engine: str = "textract") -> None:
+        blob = compress_response(response)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, engine, body, size, created) VALUES (?, ?, ?, ?, ?)",
+                (key, engine, blob, len(blob), time.time()),
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+        return decompress_response(row[0]) if row else None
+
+    def get_for_image(self, image_bytes: bytes, identity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Look up the response for the exact bytes sent and the engine's ``cache_identity``."""
+
+        return self.get(make_cache_key(image_bytes, identity))
+
+    def items(self, engine: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(key, response)`` for every stored response (optionally of one engine)."""
+
+        query, params = "SELECT key, body FROM responses", ()
+        if engine is not None:
+            query, params = query + " WHERE engine = ?", (engine,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for key, blob in rows:
+            yield key, decompress_response(blob)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _bbox(block: Dict[str, Any], size: Optional[Tuple[int, int]]) -> List[float]:
+    box = block.get("Geometry", {}).get("BoundingBox")
+    if not box:
+        return []
+    x0, y0 = box["Left"], box["Top"]
+    x1, y1 = x0 + box["Width"], y0 + box["Height"]
+    if size is not None:
+        width, height = size
+        return [x0 * width, y0 * height, x1 * width, y1 * height]
+    return [x0, y0, x1, y1]
+
+
+def textract_blocks(
+    response: Dict[str, Any],
+    block_type: str,
+    min_confidence: Optional[float] = None,
+    size: Optional[Tuple[int, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Spans (``text``, ``bbox``, ``confidence``) for one block type, in reading order."""
+
+    spans = []
+    for block in response.get("Blocks", []):
+        if block.get("BlockType") != block_type:
+            continue
+        confidence = block.get("Confidence")
+        if min_confidence is not None and (confidence or 0.0) < min_confidence:
+            continue
+        spans.append({"text": block.get("Text", ""), "bbox": _bbox(block, size), "confidence": confidence})
+    return spans
+
+
+def textract_lines(response: Dict[str, Any], min_confidence: Optional[float] = None, size=None) -> List[Dict[str, Any]]:
+    return textract_blocks(response, "LINE", min_confidence, size)
+
+
+def textract_words(response: Dict[str, Any], min_confidence: Optional[float] = None, size=None) -> List[Dict[str, Any]]:
+    return textract_blocks(response, "WORD", min_confidence, size)
+
+
+def textract_text(response: Dict[str, Any], min_confidence: Optional[float] = None) -> str:
+    """Newline-joined LINE text, the same prediction :class:`TextractEngine` returns."""
+
+    return "\n".join(span["text"] for span in textract_lines(response, min_confidence)).strip()
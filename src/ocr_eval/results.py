@@ -0,0 +1,204 @@
+"""Columnar results store: full per-(sample, engine) rows as Parquet.
+
+Each session of a run writes one part file, ``results/part-NNNNN.parquet`` in
+the run directory, streamed in row groups so memory stays flat however many
+rows a run produces. Unlike the Markdown report, the store keeps the full
+ground truth and prediction texts. Read it back with :func:`read_results`,
+which applies the journal's rules across parts: per (sample index, engine) the
+latest result wins, but a success is never replaced by a later failure.
+
+The JSONL journal stays the crash-safe record used for resuming; a part file
+only becomes readable once closed, so :meth:`ResultStore.sync` rebuilds the
+store from the journal when the two disagree (e.g. after a hard kill).
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RESULTS_DIR = "results"
+DEFAULT_ROW_GROUP_SIZE = 2048
+# Columns whose texts can be large; report code reads everything else.
+TEXT_COLUMNS = ("Ground Truth", "Prediction")
+
+# Explicit types keep every row group (and part) on one schema, e.g. error rows'
+# integer -1 placeholders stay floats in the latency column.
+COLUMN_TYPES: Dict[str, pa.DataType] = {
+    "index": pa.int64(),
+    "Sample ID": pa.string(),
+    "Engine": pa.string(),
+    "Status": pa.string(),
+    "Latency (s)": pa.float64(),
+    "WER": pa.float64(),
+    "CER": pa.float64(),
+    "Cached": pa.bool_(),
+    "Profile": pa.string(),
+    "Payload (KB)": pa.float64(),
+    "Char Edits": pa.int64(),
+    "Ref Chars": pa.int64(),
+    "Word Edits": pa.int64(),
+    "Ref Words": pa.int64(),
+    "Retries": pa.int64(),
+    "Throttled": pa.int64(),
+    "Throttle (s)": pa.float64(),
+    "Prompt Tokens": pa.int64(),
+    "Completion Tokens": pa.int64(),
+    "Billed Pages": pa.int64(),
+    "Cost ($)": pa.float64(),
+    "Attempts": pa.int64(),
+    "Error Kind": pa.string(),
+    "Ground Truth": pa.large_string(),
+    "Prediction": pa.large_string(),
+}
+
+
+def _infer_type(value: Any) -> pa.DataType:
+    if isinstance(value, bool):
+        return pa.bool_()
+    if isinstance(value, int):
+        return pa.int64()
+    if isinstance(value, float):
+        return pa.float64()
+    return pa.string()
+
+
+def schema_for(row: Dict[str, Any]) -> pa.Schema:
+    """Schema for rows shaped like ``row`` (known columns typed explicitly, others inferred)."""
+
+    names = ["index", *(k for k in row if k != "index")]
+    return pa.schema([(name, COLUMN_TYPES.get(name) or _infer_type(row.get(name))) for name in names])
+
+
+def _coerce(value: Any, type_: pa.DataType) -> Any:
+    if value is None:
+        return None
+    if pa.types.is_string(type_) or pa.types.is_large_string(type_):
+        return str(value)
+    if pa.types.is_floating(type_):
+        return float(value)
+    if pa.types.is_integer(type_):
+        return int(value)
+    return value
+
+
+class ResultStore:
+    """Thread-safe writer of one Parquet part per session under ``<run_dir>/results``.
+
+    Args:
+        run_dir: Run directory (the store lives in its ``results`` subdirectory).
+        row_group_size: Rows buffered before a row group is flushed.
+    """
+
+    def __init__(self, run_dir: str | Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        self.path = Path(run_dir) / RESULTS_DIR
+        self.row_group_size = row_group_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+        self._lock = threading.Lock()
+
+    def parts(self) -> List[Path]:
+        return sorted(self.path.glob("part-*.parquet"))
+
+    def _next_part(self) -> Path:
+        self.path.mkdir(parents=True, exist_ok=True)
+        parts = self.parts()
+        number = int(parts[-1].stem.split("-")[1]) + 1 if parts else 0
+        return self.path / f"part-{number:05d}.parquet"
+
+    def append(self, index: int, row: Dict[str, Any]) -> None:
+        """Buffer one finished result (same signature as :meth:`RunJournal.append`)."""
+
+        with self._lock:
+            self._buffer.append({"index": index, **row})
+            if len(self._buffer) >= self.row_group_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._schema = schema_for(self._buffer[0])
+            self._writer = pq.ParquetWriter(self._next_part(), self._schema, compression="zstd")
+        columns = {
+            field.name: [_coerce(row.get(field.name), field.type) for row in self._buffer] for field in self._schema
+        }
+        self._writer.write_table(pa.table(columns, schema=self._schema), row_group_size=self.row_group_size)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def num_rows(self) -> Optional[int]:
+        """Rows across all parts from their footers, or ``None`` if a part is unreadable."""
+
+        try:
+            return sum(pq.ParquetFile(part).metadata.num_rows for part in self.parts())
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def sync(self, records: Iterable[Dict[str, Any]], expected: int) -> bool:
+        """Rewrite the store from journal ``records`` unless it already holds ``expected`` rows.
+
+        Returns whether the store was rebuilt.
+        """
+
+        if self.num_rows() == expected:
+            return False
+        for part in self.parts():
+            part.unlink()
+        for record in records:
+            record = dict(record)
+            self.append(record.pop("index"), record)
+        self.close()
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_results(
+    run_dirs: Sequence[str | Path], columns: Optional[Sequence[str]] = None, texts: bool = True
+) -> pd.DataFrame:
+    """Latest result per (sample index, engine) across the stores of ``run_dirs``.
+
+    Args:
+        run_dirs: Run directories (e.g. one per shard); later ones win ties like the journal.
+        columns: Columns to read (``index``, ``Engine`` and ``Status`` are always read).
+        texts: Read the full ground-truth/prediction texts; set ``False`` for summaries.
+
+    Rows are ordered by sample index, then engine in order of first appearance.
+    """
+
+    parts = [part for run_dir in run_dirs for part in ResultStore(run_dir).parts()]
+    if not parts:
+        return pd.DataFrame()
+    if columns is not None:
+        columns = list(dict.fromkeys(["index", "Engine", "Status", *columns]))
+    tables = []
+    for part in parts:
+        names = pq.read_schema(part).names
+        wanted = [n for n in (columns or names) if n in names and (texts or n not in TEXT_COLUMNS)]
+        tables.append(pq.read_table(part, columns=wanted))
+    df = pa.concat_tables(tables, promote_options="default").to_pandas()
+    engine_order = {name: i for i, name in enumerate(pd.unique(df["Engine"]))}
+    # Stable sort puts each key's successes after its failures, so keep="last" takes
+    # the latest success if there is one and the latest failure otherwise.
+    df["_ok"] = df["Status"] == "ok"
+    df = df.sort_values("_ok", kind="stable").drop_duplicates(["index", "Engine"], keep="last")
+    df["_engine"] = df["Engine"].map(engine_order)
+    df = df.sort_values(["index", "_engine"], kind="stable").drop(columns=["_ok", "_engine"])
+    return df.reset_index(drop=True)
@@ -0,0 +1,380 @@
+"""Concurrent execution of OCR engines over dataset samples.
+
+Each (sample, engine) pair is submitted to a per-engine thread pool so that
+slow network calls overlap, while a global semaphore caps total in-flight
+calls. Results are yielded in sample/engine submission order regardless of
+completion order, so reports stay deterministic.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .budget import BudgetScheduler
+from .concurrency import AIMDController, RetryScheduler, backoff_delay
+from .engines.base import BaseOCREngine, error_kind
+from .preprocess import PROFILES, Payload, PreprocessProfile, preprocess
+from .telemetry import Telemetry
+from .utils.metrics import score_pair
+
+
+# Per-call info recorded by engines (see BaseOCREngine.pop_call_info) that is kept as report columns.
+INFO_COLUMNS = {
+    "retries": "Retries",
+    "throttled": "Throttled",
+    "throttle_time": "Throttle (s)",
+    "prompt_tokens": "Prompt Tokens",
+    "completion_tokens": "Completion Tokens",
+    "pages": "Billed Pages",
+}
+
+
+def _info_columns(info: Dict) -> Dict:
+    return {column: round(info.get(key, 0), 3) for key, column in INFO_COLUMNS.items()}
+
+
+@dataclass
+class RunStats:
+    """Aggregate counters for a single evaluation run."""
+
+    pages: int = 0
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    dead_letters: int = 0
+    wall_time: float = 0.0
+    budget_exhausted: bool = False
+
+    @property
+    def throughput(self) -> float:
+        """Pages per second over the whole run."""
+        return self.pages / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def call_rate(self) -> float:
+        """Engine calls per second over the whole run."""
+        return self.calls / self.wall_time if self.wall_time > 0 else 0.0
+
+
+class _PayloadMemo:
+    """Per-sample cache so engines sharing a preprocessing profile share one payload."""
+
+    def __init__(self, image_bytes: bytes, ground_truth: str):
+        self.image_bytes = image_bytes
+        # Tokenize the reference once per sample rather than once per engine.
+        self.ref_words = ground_truth.split()
+        self._payloads: Dict[str, Payload] = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile: PreprocessProfile) -> Payload:
+        with self._lock:
+            payload = self._payloads.get(profile.name)
+            if payload is None:
+                payload = self._payloads[profile.name] = preprocess(self.image_bytes, profile)
+            return payload
+
+
+class EvaluationRunner:
+    """Run every engine over every sample with bounded concurrency.
+
+    Args:
+        engines: Mapping of display name to engine instance.
+        workers: Maximum number of engine calls in flight across all engines.
+        concurrency_per_engine: Maximum in-flight calls per engine; defaults to ``workers``.
+        profiles: Preprocessing profile per engine name; engines not listed get the original bytes.
+        telemetry: Collector for per-stage timings and outcomes; a fresh one by default.
+        budget: Cost/token budget consulted before each sample is submitted; samples
+            stop being admitted once the projected spend would exceed it.
+        quiet: Skip per-sample progress output (e.g. for load tests).
+        adaptive: Let an :class:`~ocr_eval.concurrency.AIMDController` per engine vary
+            its in-flight calls between 1 and ``concurrency_per_engine``.
+        max_attempts: Calls per (sample, engine) before giving up; failed calls are
+            requeued after a jittered exponential backoff starting at ``retry_backoff`` seconds.
+            Preprocessing failures (``"Error Kind"`` ``"preprocess"``) are not retried.
+        retry_backoff: Base delay for the retry backoff.
+        dead_letter: Called as ``dead_letter(index, record)`` for pairs that still
+            failed after ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        engines: Dict[str, BaseOCREngine],
+        workers: int = 1,
+        concurrency_per_engine: Optional[int] = None,
+        profiles: Optional[Dict[str, PreprocessProfile]] = None,
+        telemetry: Optional[Telemetry] = None,
+        budget: Optional[BudgetScheduler] = None,
+        quiet: bool = False,
+        adaptive: bool = False,
+        max_attempts: int = 1,
+        retry_backoff: float = 1.0,
+        dead_letter: Optional[Callable[[int, Dict], None]] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.engines = engines
+        self.workers = workers
+        self.concurrency_per_engine = max(1, min(concurrency_per_engine or workers, workers))
+        self.profiles = {name: (profiles or {}).get(name, PROFILES["original"]) for name in engines}
+        self.telemetry = telemetry or Telemetry()
+        self.budget = budget
+        self.quiet = quiet
+        self.controllers = (
+            {name: AIMDController(self.concurrency_per_engine) for name in engines} if adaptive else {}
+        )
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.dead_letter = dead_letter
+        self.stats = RunStats()
+        self._global_slots = threading.BoundedSemaphore(workers)
+        self._stats_lock = threading.Lock()
+
+    def _error_row(
+        self,
+        name: str,
+        sample: Dict,
+        error: Exception,
+        info: Optional[Dict] = None,
+        cost: float = 0.0,
+        attempt: int = 1,
+        kind: Optional[str] = None,
+    ) -> Dict:
+        if not self.quiet:
+            print(f"Error processing sample {sample['id']} with {name}: {error}")
+        self.telemetry.outcome(name, "error")
+        return {
+            "Sample ID": sample["id"],
+            "Engine": name,
+            "Status": "error",
+            "Latency (s)": -1,
+            "WER": -1,
+            "CER": -1,
+            "Cached": False,
+            "Profile": self.profiles[name].name,
+            "Payload (KB)": -1,
+            "Char Edits": 0,
+            "Ref Chars": 0,
+            "Word Edits": 0,
+            "Ref Words": 0,
+            **_info_columns(info or {}),
+            "Cost ($)": round(cost, 6),
+            "Attempts": attempt,
+            "Error Kind": kind or error_kind(error),
+            "Ground Truth": "Error",
+            "Prediction": str(error),
+        }
+
+    def _call_engine(
+        self,
+        name: str,
+        engine: BaseOCREngine,
+        sample: Dict,
+        memo: _PayloadMemo,
+        submitted: Optional[float] = None,
+        attempt: int = 1,
+    ) -> Dict:
+        ground_truth = sample["ground_truth"]
+        encode_start = time.perf_counter()
+        try:
+            payload = memo.get(self.profiles[name])
+        except Exception as e:
+            return self._error_row(name, sample, e, attempt=attempt, kind="preprocess")
+        encode_time = time.perf_counter() - encode_start
+
+        controller = self.controllers.get(name)
+        token = controller.acquire() if controller is not None else None
+        with self._global_slots:
+            start = time.perf_counter()
+            if submitted is not None:
+                # Waiting for a pool thread and a global slot, minus our own preprocessing.
+                self.telemetry.observe(name, "queue", max(0.0, start - submitted - encode_time))
+            try:
+                prediction = engine.process_payload(payload)
+                latency = time.perf_counter() - start
+                error = None
+            except Exception as e:
+                prediction, latency, error = None, None, e
+            info = engine.pop_call_info()
+        if controller is not None:
+            # Cache hits say nothing about the service's latency.
+            timed = None if info.get("cached") else latency
+            controller.release(token, "ok" if error is None else error_kind(error), timed)
+
+        # Failed calls can still be billed (e.g. pages processed before a parse error).
+        cost = engine.call_cost(info)
+        if error is not None:
+            return self._error_row(name, sample, error, info, cost, attempt)
+
+        if info.get("cached"):
+            self.telemetry.observe(name, "cache", latency)
+        else:
+            # Engines report their own encode/parse time; the rest of the call is the request.
+            engine_encode, parse = info.get("encode_time", 0.0), info.get("parse_time", 0.0)
+            self.telemetry.observe(name, "encode", encode_time + engine_encode)
+            self.telemetry.observe(name, "request", max(0.0, latency - engine_encode - parse))
+            self.telemetry.observe(name, "parse", parse)
+        with self.telemetry.time(name, "score"):
+            scores = score_pair(ground_truth, prediction, memo.ref_words)
+        self.telemetry.outcome(name, "ok")
+        return {
+            "Sample ID": sample["id"],
+            "Engine": name,
+            "Status": "ok",
+            "Latency (s)": round(latency, 2),
+            "WER": round(scores["wer"], 4),
+            "CER": round(scores["cer"], 4),
+            "Cached": bool(info.get("cached", False)),
+            "Profile": payload.profile,
+            "Payload (KB)": round(payload.size / 1024, 1),
+            "Char Edits": scores["char_edits"],
+            "Ref Chars": scores["ref_chars"],
+            "Word Edits": scores["word_edits"],
+            "Ref Words": scores["ref_words"],
+            **_info_columns(info),
+            "Cost ($)": round(cost, 6),
+            "Attempts": attempt,
+            "Error Kind": None,
+            "Ground Truth": ground_truth,
+            "Prediction": prediction,
+        }
+
+    def _attempt(
+        self,
+        pool: ThreadPoolExecutor,
+        result: Future,
+        index: int,
+        name: str,
+        engine: BaseOCREngine,
+        sample: Dict,
+        memo: _PayloadMemo,
+        on_result: Optional[Callable[[int, Dict], None]],
+        submitted: Optional[float] = None,
+        attempt: int = 1,
+        spent: float = 0.0,
+    ) -> None:
+        """One try of a (sample, engine) pair; failures go back on the retry queue until ``max_attempts``."""
+
+        try:
+            row = self._call_engine(name, engine, sample, memo, submitted, attempt)
+            # The same bytes would fail preprocessing the same way again, so only engine calls are retried.
+            retry = row["Status"] != "ok" and row["Error Kind"] != "preprocess" and attempt < self.max_attempts
+            if self.budget is not None:
+                tokens = row["Prompt Tokens"] + row["Completion Tokens"]
+                # Every attempt is paid for, but the pair was admitted once and is released once.
+                self.budget.observe(
+                    name, row["Cost ($)"], tokens, cached=row["Cached"], ok=row["Status"] == "ok", release=not retry
+                )
+            # The row carries what every attempt cost, so the journal's spend stays complete.
+            spent += row["Cost ($)"]
+            row["Cost ($)"] = round(spent, 6)
+            if retry:
+                delay = backoff_delay(attempt, self.retry_backoff)
+                if not self.quiet:
+                    print(f"Retrying sample {sample['id']} with {name} in {delay:.1f}s ({attempt + 1}/{self.max_attempts})")
+                with self._stats_lock:
+                    self.stats.retries += 1
+
+                def resubmit() -> None:
+                    try:
+                        pool.submit(
+                            self._attempt, pool, result, index, name, engine, sample, memo, on_result,
+                            time.perf_counter(), attempt + 1, spent,
+                        )
+                    except BaseException as e:  # e.g. the pool was shut down by an interrupt
+                        result.set_exception(e)
+
+                self._retries.schedule(delay, resubmit)
+                return
+            if row["Status"] != "ok" and self.dead_letter is not None:
+                with self._stats_lock:
+                    self.stats.dead_letters += 1
+                self.dead_letter(index, {
+                    "Sample ID": row["Sample ID"],
+                    "Engine": name,
+                    "Attempts": attempt,
+                    "Error Kind": row["Error Kind"],
+                    "Error": row["Prediction"],
+                    "Time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                })
+            if on_result is not None:
+                on_result(index, row)
+            result.set_result(row)
+        except BaseException as e:
+            result.set_exception(e)
+
+    def run(
+        self,
+        samples: Iterable[Dict],
+        done: Optional[Set[Tuple[int, str]]] = None,
+        on_result: Optional[Callable[[int, Dict], None]] = None,
+    ) -> Iterator[Dict]:
+        """Yield one result row per (sample, engine) in deterministic order.
+
+        Args:
+            samples: Samples from the loader, in a stable order.
+            done: (sample index, engine name) pairs to skip, e.g. from a resumed journal.
+            on_result: Called as ``on_result(index, row)`` from the worker thread as soon
+                as each call finishes, before rows are re-ordered for the caller.
+        """
+
+        done = done or set()
+        pools = {
+            name: ThreadPoolExecutor(max_workers=self.concurrency_per_engine, thread_name_prefix=f"ocr-{name}")
+            for name in self.engines
+        }
+        # Bound how many samples are queued ahead so memory stays flat on long runs.
+        max_pending = self.workers * 2
+        pending: deque[List[Future]] = deque()
+        self._retries = RetryScheduler()
+
+        start = time.perf_counter()
+        try:
+            for position, sample in enumerate(samples):
+                # Loader samples carry their global index (stable across shards and resumes).
+                index = sample.get("index", position)
+                todo = [(name, eng) for name, eng in self.engines.items() if (index, name) not in done]
+                if not todo:
+                    continue
+                if self.budget is not None and not self.budget.admit(name for name, _ in todo):
+                    self.stats.budget_exhausted = True
+                    if not self.quiet:
+                        print(f"Budget reached; not submitting sample {sample['id']} or later samples.")
+                    break
+                if not self.quiet:
+                    print(f"Processing sample {sample['id']}...")
+                for stage, seconds in sample.get("timings", {}).items():
+                    self.telemetry.observe("dataset", stage, seconds)
+                memo = _PayloadMemo(sample["image_bytes"], sample["ground_truth"])
+                results = []
+                for name, eng in todo:
+                    result: Future = Future()
+                    pools[name].submit(
+                        self._attempt, pools[name], result, index, name, eng, sample, memo, on_result, time.perf_counter()
+                    )
+                    results.append(result)
+                pending.append(results)
+                self.stats.pages += 1
+                while len(pending) > max_pending:
+                    yield from self._collect(pending.popleft())
+            while pending:
+                yield from self._collect(pending.popleft())
+        finally:
+            self._retries.close()
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+            self.stats.wall_time = time.perf_counter() - start
+
+    def _collect(self, futures: List[Future]) -> Iterator[Dict]:
+        for future in futures:
+            row = future.result()
+            self.stats.calls += 1
+            if row["Status"] != "ok":
+                self.stats.errors += 1
+            yield row
@@ -0,0 +1,130 @@
+"""Sweeps: one run over a matrix of OpenAI engine configurations.
+
+A sweep crosses models, transcription prompts, completion-token limits and
+preprocessing profiles into :class:`SweepConfig` entries. It then runs all of
+them as engines of a single :class:`~ocr_eval.runner.EvaluationRunner`. So the
+dataset is loaded once, each sample is preprocessed once per profile and
+base64-encoded once per payload, and all configurations are in flight together.
+Comparing configurations in separate ``evaluate`` runs would repeat all of that
+for each one.
+
+Configurations of the same model share one client, connection pool and rate
+limiter (see :meth:`~ocr_eval.engines.openai.OpenAIVLMEngine.with_options`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+from .preprocess import PreprocessProfile, parse_profile
+
+if TYPE_CHECKING:
+    from .engines.openai import OpenAIVLMEngine
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """One point of the sweep matrix; ``name`` is its engine name in results and reports."""
+
+    name: str
+    model: str
+    prompt: str
+    user_prompt: str
+    max_completion_tokens: int
+    profile: PreprocessProfile
+
+    def as_row(self) -> Dict[str, Any]:
+        return {
+            "Engine": self.name,
+            "Model": self.model,
+            "Prompt": self.prompt,
+            "Max Tokens": self.max_completion_tokens,
+            "Profile": self.profile.name,
+        }
+
+
+def resolve_prompt(spec: str) -> Tuple[str, str]:
+    """``(name, user prompt)`` for a preset name (see ``TRANSCRIBE_PROMPTS``) or ``@file``."""
+
+    from .engines.openai import TRANSCRIBE_PROMPTS
+
+    spec = spec.strip()
+    if spec.startswith("@"):
+        path = Path(spec[1:])
+        return path.stem, path.read_text().strip()
+    if spec not in TRANSCRIBE_PROMPTS:
+        raise ValueError(f"unknown prompt {spec!r} (presets: {', '.join(TRANSCRIBE_PROMPTS)}, or @file)")
+    return spec, TRANSCRIBE_PROMPTS[spec]
+
+
+def _split(spec: str) -> List[str]:
+    return list(dict.fromkeys(filter(None, (part.strip() for part in spec.split(",")))))
+
+
+def _unique_prompts(prompts: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # Identical prompts collapse; different prompts sharing a name (e.g. two prompt.txt
+    # files) get a short hash of their text, so no configuration shadows another.
+    prompts = list(dict.fromkeys(prompts))
+    texts: Dict[str, set] = {}
+    for name, text in prompts:
+        texts.setdefault(name, set()).add(text)
+    return [
+        (f"{name}-{hashlib.blake2b(text.encode(), digest_size=3).hexdigest()}" if len(texts[name]) > 1 else name, text)
+        for name, text in prompts
+    ]
+
+
+def sweep_matrix(models: str, prompts: str, token_limits: str, profiles: str) -> List[SweepConfig]:
+    """Every combination of the comma-separated ``models``, ``prompts``, ``token_limits`` and ``profiles``.
+
+    Names only mention the dimensions that vary (the model always), e.g.
+    ``gpt-4o-mini/layout/jpeg-1600``.
+    """
+
+    axes = {
+        "model": _split(models),
+        "prompt": _unique_prompts([resolve_prompt(spec) for spec in _split(prompts)]),
+        "tokens": [int(limit) for limit in _split(token_limits)],
+        "profile": [parse_profile(spec) for spec in _split(profiles)],
+    }
+    empty = [axis for axis, values in axes.items() if not values]
+    if empty:
+        raise ValueError(f"no values for: {', '.join(empty)}")
+    if any(limit < 1 for limit in axes["tokens"]):
+        raise ValueError("token limits must be >= 1")
+    configs = []
+    for model, (prompt, user_prompt), tokens, profile in itertools.product(*axes.values()):
+        parts = [model]
+        if len(axes["prompt"]) > 1:
+            parts.append(prompt)
+        if len(axes["tokens"]) > 1:
+            parts.append(f"{tokens}tok")
+        if len(axes["profile"]) > 1:
+            parts.append(profile.name)
+        configs.append(SweepConfig("/".join(parts), model, prompt, user_prompt, tokens, profile))
+    names = [config.name for config in configs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        # e.g. two profile specs with the same name; engines are keyed by name.
+        raise ValueError(f"configurations share a name: {', '.join(duplicates)}")
+    return configs
+
+
+def build_engines(configs: Sequence[SweepConfig], **options: Any) -> Dict[str, OpenAIVLMEngine]:
+    """One engine per configuration; ``options`` go to each model's shared :class:`OpenAIVLMEngine`."""
+
+    from .engines.openai import OpenAIVLMEngine
+
+    bases: Dict[str, OpenAIVLMEngine] = {}
+    engines = {}
+    for config in configs:
+        if config.model not in bases:
+            bases[config.model] = OpenAIVLMEngine(model=config.model, **options)
+        engines[config.name] = bases[config.model].with_options(
+            user_prompt=config.user_prompt, max_completion_tokens=config.max_completion_tokens
+        )
+    return engines
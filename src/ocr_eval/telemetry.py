@@ -0,0 +1,175 @@
+"""Per-stage latency histograms and outcome counters for evaluation runs.
+
+The runner times each stage of a (sample, engine) call with ``perf_counter``
+and feeds a :class:`Telemetry` instance:
+
+- ``load``: reading/decoding the dataset row (recorded under engine ``dataset``)
+- ``materialize``: building the sample (image bytes, ground truth, optional PNG)
+- ``queue``: waiting for a worker thread and a global in-flight slot
+- ``encode``: preprocessing plus any engine-side encoding (base64, request body)
+- ``request``: the service call itself, including client-side waits and retries
+- ``parse``: turning the response into text
+- ``score``: CER/WER
+- ``cache``: calls answered by the prediction cache (instead of encode/request/parse)
+
+Histograms keep every observation, so p50/p90/p99 are exact; exports are JSON
+and the Prometheus text exposition format (for node_exporter's textfile
+collector), both written atomically.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STAGES = ("load", "materialize", "queue", "encode", "request", "parse", "score", "cache")
+QUANTILES = (0.5, 0.9, 0.99)
+# Prometheus histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Latency observations for one (engine, stage)."""
+
+    def __init__(self) -> None:
+        self.values: List[float] = []
+
+    def observe(self, seconds: float) -> None:
+        self.values.append(seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def total(self) -> float:
+        return float(sum(self.values))
+
+    def quantiles(self, qs: Sequence[float] = QUANTILES) -> Dict[float, float]:
+        if not self.values:
+            return {q: float("nan") for q in qs}
+        return dict(zip(qs, np.quantile(np.asarray(self.values), qs).tolist()))
+
+    def bucket_counts(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> List[int]:
+        """Cumulative counts per upper bound (Prometheus ``le`` semantics), excluding ``+Inf``."""
+
+        values = np.sort(np.asarray(self.values))
+        return np.searchsorted(values, np.asarray(bounds), side="right").tolist()
+
+
+class Telemetry:
+    """Thread-safe collection of stage histograms and per-engine call outcomes."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._outcomes: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, engine: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((engine, stage))
+            if histogram is None:
+                histogram = self._histograms[(engine, stage)] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, engine: str, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(engine, stage, time.perf_counter() - start)
+
+    def outcome(self, engine: str, status: str) -> None:
+        with self._lock:
+            self._outcomes.setdefault(engine, Counter())[status] += 1
+
+    def stage_summary(self) -> List[Dict[str, Any]]:
+        """One row per (engine, stage): count, mean, p50/p90/p99 and max seconds."""
+
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda kv: (kv[0][0], _stage_order(kv[0][1])))
+            rows = []
+            for (engine, stage), histogram in items:
+                quantiles = histogram.quantiles()
+                rows.append({
+                    "Engine": engine,
+                    "Stage": stage,
+                    "Count": histogram.count,
+                    "Mean (s)": histogram.total / histogram.count,
+                    **{f"p{round(q * 100)} (s)": v for q, v in quantiles.items()},
+                    "Max (s)": max(histogram.values),
+                })
+        return rows
+
+    def error_rates(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rates = {}
+            for engine, counts in self._outcomes.items():
+                calls = sum(counts.values())
+                errors = calls - counts.get("ok", 0)
+                rates[engine] = {"calls": calls, "errors": errors, "error_rate": errors / calls if calls else 0.0}
+        return rates
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"stages": self.stage_summary(), "outcomes": self.error_rates()}
+
+    def write_json(self, path: str | Path) -> None:
+        _write_atomic(Path(path), json.dumps(self.to_dict(), indent=2))
+
+    def to_prometheus(self, prefix: str = "ocr_eval", labels: Optional[Dict[str, str]] = None) -> str:
+        """Render histograms, quantile gauges and call counters in the Prometheus text format."""
+
+        extra = "".join(f',{k}="{_escape(v)}"' for k, v in (labels or {}).items())
+        lines = [
+            f"# HELP {prefix}_stage_seconds Per-stage latency of OCR evaluation calls.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        quantile_lines = [
+            f"# HELP {prefix}_stage_quantile_seconds Exact per-stage latency quantiles for the run.",
+            f"# TYPE {prefix}_stage_quantile_seconds gauge",
+        ]
+        with self._lock:
+            for (engine, stage), histogram in sorted(self._histograms.items()):
+                base = f'engine="{_escape(engine)}",stage="{stage}"{extra}'
+                for bound, count in zip(DEFAULT_BUCKETS, histogram.bucket_counts()):
+                    lines.append(f'{prefix}_stage_seconds_bucket{{{base},le="{bound}"}} {count}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{{base},le="+Inf"}} {histogram.count}')
+                lines.append(f"{prefix}_stage_seconds_sum{{{base}}} {histogram.total}")
+                lines.append(f"{prefix}_stage_seconds_count{{{base}}} {histogram.count}")
+                for q, value in histogram.quantiles().items():
+                    quantile_lines.append(f'{prefix}_stage_quantile_seconds{{{base},quantile="{q}"}} {value}')
+            lines.extend(quantile_lines)
+            lines.append(f"# HELP {prefix}_calls_total Engine calls by outcome.")
+            lines.append(f"# TYPE {prefix}_calls_total counter")
+            for engine, counts in sorted(self._outcomes.items()):
+                for status, count in sorted(counts.items()):
+                    lines.append(f'{prefix}_calls_total{{engine="{_escape(engine)}",status="{status}"{extra}}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path, labels: Optional[Dict[str, str]] = None) -> None:
+        _write_atomic(Path(path), self.to_prometheus(labels=labels))
+
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # The textfile collector may read at any moment; never expose a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    tmp.replace(path)
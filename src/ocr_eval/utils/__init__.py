@@ -1,9 +1,21 @@
-from .preview import preview_docvqa_sample, preview_funsd_sample
-from .metrics import calculate_cer, calculate_wer
-
-__all__ = [
-    "preview_docvqa_sample",
-    "preview_funsd_sample",
-    "calculate_cer",
-    "calculate_wer",
-]
+from importlib import import_module
+
+# Resolved on first access (PEP 562) so importing e.g. ``utils.ratelimit`` does
+# not pull in matplotlib and datasets through ``preview``.
+_EXPORTS = {
+    "preview_docvqa_sample": ".preview",
+    "preview_funsd_sample": ".preview",
+    "preview_grid": ".preview",
+    "calculate_cer": ".metrics",
+    "calculate_wer": ".metrics",
+    "match_boxes": ".boxes",
+    "score_boxes": ".boxes",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,301 @@
+"""IoU matching of predicted text boxes against reference boxes, and detection scores.
+
+Boxes are ``[x0, y0, x1, y1]`` in the same coordinate space for both sides (the
+engines' ``extract_text_with_boxes`` spans are in pixels). Predictions are
+assigned to references one-to-one so that the total IoU is maximal, with pairs
+below the IoU threshold forbidden; a prediction counts as a true positive when
+it is assigned at that threshold.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from .metrics import corpus_error_rate, score_batch
+
+Boxes = Union[np.ndarray, Sequence[Mapping[str, Any]], Sequence[Sequence[float]]]
+
+DEFAULT_THRESHOLDS = (0.5, 0.75, 0.9)
+# Rows of the IoU matrix computed at once when collecting overlapping pairs.
+_BLOCK_ROWS = 256
+
+def box_array(boxes: Boxes) -> np.ndarray:
+    """
+    ``(n, 4)`` float array from spans (``{"text", "bbox"}`` dicts), box lists or
+    an array. Corners are reordered so x0 <= x1 and y0 <= y1; spans without a
+    usable bbox get an empty box, which never matches.
+    """
+    if isinstance(boxes, np.ndarray):
+        array = boxes.astype(np.float64, copy=False).reshape(-1, 4)
+    else:
+        array = np.zeros((len(boxes), 4))
+        for i, box in enumerate(boxes):
+            if isinstance(box, Mapping):
+                box = box.get("bbox")
+            if box is not None and len(box) == 4:
+                array[i] = box
+    return np.concatenate(
+        [np.minimum(array[:, :2], array[:, 2:]), np.maximum(array[:, :2], array[:, 2:])], axis=1
+    )
+
+def span_texts(spans: Sequence[Mapping[str, Any]]) -> List[str]:
+    """The ``text`` of each span, in order."""
+    return [str(span.get("text") or "") for span in spans]
+
+def iou_matrix(a: Boxes, b: Boxes) -> np.ndarray:
+    """Dense ``(len(a), len(b))`` IoU matrix, computed by broadcasting."""
+    a, b = box_array(a), box_array(b)
+    width = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0])
+    height = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1])
+    inter = np.clip(width, 0, None) * np.clip(height, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+def overlapping_pairs(a: Boxes, b: Boxes, min_iou: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The non-zero entries of :func:`iou_matrix` that are >= ``min_iou``, as
+    ``(rows, cols, ious)``, without materializing the whole matrix.
+
+    Rows are taken in blocks of nearby boxes (sorted by top edge) and each block
+    is only compared with the columns that overlap it vertically, so a dense
+    page costs a band of the matrix rather than all of it.
+    """
+    a, b = box_array(a), box_array(b)
+    rows, cols, ious = [], [], []
+    order = np.argsort(a[:, 1], kind="stable")
+    for start in range(0, len(order), _BLOCK_ROWS):
+        block = order[start : start + _BLOCK_ROWS]
+        top, bottom = a[block, 1].min(), a[block, 3].max()
+        candidates = np.flatnonzero((b[:, 1] <= bottom) & (b[:, 3] >= top))
+        if not len(candidates):
+            continue
+        iou = iou_matrix(a[block], b[candidates])
+        r, c = np.nonzero((iou > 0) & (iou >= min_iou))
+        rows.append(block[r])
+        cols.append(candidates[c])
+        ious.append(iou[r, c])
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(ious)
+
+@lru_cache(maxsize=None)
+def _scipy_assignment():
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        return None
+    return linear_sum_assignment
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Shortest augmenting path (Kuhn-Munkres with potentials) for n <= m, one row
+    # at a time, each relaxation step vectorized over the columns. O(n^2 m).
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # owner[j]: 1-based row assigned to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            free = ~used[1:]
+            reduced = cost[owner[j0] - 1] - u[owner[j0]] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            slack = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(slack)) + 1
+            delta = slack[j1 - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    cols = np.flatnonzero(owner[1:])
+    rows = owner[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+def max_weight_assignment(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-to-one ``(rows, cols)`` assignment maximizing the total weight, using
+    SciPy's ``linear_sum_assignment`` when installed and a NumPy Hungarian
+    solver otherwise. Zero-weight pairs may be included; filter them out.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    solver = _scipy_assignment()
+    if solver is not None:
+        rows, cols = solver(weights, maximize=True)
+        return rows.astype(np.int64), cols.astype(np.int64)
+    if weights.shape[0] > weights.shape[1]:
+        cols, rows = _hungarian(-weights.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    return _hungarian(-weights)
+
+def _components(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> np.ndarray:
+    # Connected components of the bipartite overlap graph (columns offset by
+    # n_rows), by union-find with path halving; returns a label per edge.
+    parent = list(range(n_rows + int(cols.max()) + 1))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for r, c in zip(rows.tolist(), (cols + n_rows).tolist()):
+        root_r, root_c = find(r), find(c)
+        if root_r != root_c:
+            parent[root_c] = root_r
+    return np.fromiter((find(r) for r in rows.tolist()), dtype=np.int64, count=len(rows))
+
+def _assign_pairs(
+    rows: np.ndarray, cols: np.ndarray, ious: np.ndarray, n_rows: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Optimal assignment restricted to the given (allowed) pairs. The graph is
+    # sparse, so pairs whose row and column overlap nothing else are matched
+    # directly and only the remaining connected components go to the solver.
+    if not len(rows):
+        return rows, cols, ious
+    row_degree = np.bincount(rows, minlength=n_rows)
+    col_degree = np.bincount(cols)
+    simple = (row_degree[rows] == 1) & (col_degree[cols] == 1)
+    keep = [np.flatnonzero(simple)]
+
+    tangled = np.flatnonzero(~simple)
+    if len(tangled):
+        labels = _components(rows[tangled], cols[tangled], n_rows)
+        order = np.argsort(labels, kind="stable")
+        tangled, labels = tangled[order], labels[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        for edges in np.split(tangled, bounds):
+            row_ids, r = np.unique(rows[edges], return_inverse=True)
+            col_ids, c = np.unique(cols[edges], return_inverse=True)
+            weights = np.zeros((len(row_ids), len(col_ids)))
+            weights[r, c] = ious[edges]
+            edge_at = np.full(weights.shape, -1, dtype=np.int64)
+            edge_at[r, c] = edges
+            sr, sc = max_weight_assignment(weights)
+            chosen = edge_at[sr, sc]
+            keep.append(chosen[chosen >= 0])
+
+    keep = np.sort(np.concatenate(keep))
+    return rows[keep], cols[keep], ious[keep]
+
+def match_boxes(
+    predictions: Boxes, references: Boxes, threshold: float = 0.5
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Optimal one-to-one matching of predicted to reference boxes with IoU >=
+    ``threshold``, returned as ``(pred_idx, ref_idx, iou)`` arrays.
+    """
+    rows, cols, ious = overlapping_pairs(predictions, references, threshold)
+    return _assign_pairs(rows, cols, ious, len(box_array(predictions)))
+
+def _ratio(num: np.ndarray, den: np.ndarray, empty: np.ndarray) -> np.ndarray:
+    out = empty.astype(np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+def score_boxes_batch(
+    pages: Sequence[Tuple[Sequence[Mapping[str, Any]], Sequence[Mapping[str, Any]]]],
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    text_threshold: float = 0.5,
+    workers: int = -1,
+) -> Dict[str, Any]:
+    """
+    Detection and recognition scores over many ``(predicted_spans, reference_spans)`` pages.
+
+    Precision/recall/F1 are micro-averaged over pages for each IoU threshold
+    (arrays aligned with ``thresholds``; per-page true positives are in
+    ``page_true_positives``). CER/WER are corpus rates over the span texts of
+    the pairs matched at ``text_threshold``, scored in one rapidfuzz batch.
+    """
+    thresholds = np.asarray(sorted(thresholds), dtype=np.float64)
+    lowest = min(float(thresholds[0]), text_threshold) if len(thresholds) else text_threshold
+    page_tp = np.zeros((len(pages), len(thresholds)), dtype=np.int64)
+    n_pred = np.zeros(len(pages), dtype=np.int64)
+    n_ref = np.zeros(len(pages), dtype=np.int64)
+    refs, hyps, matched_ious = [], [], []
+
+    for p, (predicted, reference) in enumerate(pages):
+        n_pred[p], n_ref[p] = len(predicted), len(reference)
+        rows, cols, ious = overlapping_pairs(predicted, reference, lowest)
+        for t, threshold in enumerate(thresholds):
+            allowed = ious >= threshold
+            page_tp[p, t] = len(_assign_pairs(rows[allowed], cols[allowed], ious[allowed], len(predicted))[0])
+        allowed = ious >= text_threshold
+        pred_idx, ref_idx, pair_ious = _assign_pairs(rows[allowed], cols[allowed], ious[allowed], len(predicted))
+        pred_texts, ref_texts = span_texts(predicted), span_texts(reference)
+        hyps.extend(pred_texts[i] for i in pred_idx.tolist())
+        refs.extend(ref_texts[i] for i in ref_idx.tolist())
+        matched_ious.append(pair_ious)
+
+    tp = page_tp.sum(axis=0)
+    total_pred, total_ref = int(n_pred.sum()), int(n_ref.sum())
+    no_refs = np.full(len(thresholds), total_ref == 0)
+    precision = _ratio(tp, np.full(len(thresholds), total_pred), no_refs)
+    recall = _ratio(tp, np.full(len(thresholds), total_ref), np.full(len(thresholds), total_pred == 0))
+    f1 = _ratio(2 * precision * recall, precision + recall, np.zeros(len(thresholds)))
+    text = score_batch(refs, hyps, workers=workers)
+    ious = np.concatenate(matched_ious) if matched_ious else np.zeros(0)
+    return {
+        "thresholds": thresholds,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "true_positives": tp,
+        "page_true_positives": page_tp,
+        "pred_boxes": total_pred,
+        "ref_boxes": total_ref,
+        "matched": len(refs),
+        "mean_iou": float(ious.mean()) if len(ious) else float("nan"),
+        "cer": corpus_error_rate(text["char_edits"], text["ref_chars"]),
+        "wer": corpus_error_rate(text["word_edits"], text["ref_words"]),
+        "char_edits": int(text["char_edits"].sum()),
+        "ref_chars": int(text["ref_chars"].sum()),
+        "word_edits": int(text["word_edits"].sum()),
+        "ref_words": int(text["ref_words"].sum()),
+    }
+
+def score_boxes(
+    predicted: Sequence[Mapping[str, Any]],
+    reference: Sequence[Mapping[str, Any]],
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    text_threshold: float = 0.5,
+) -> Dict[str, Any]:
+    """Scores for a single page; see :func:`score_boxes_batch`."""
+    return score_boxes_batch([(predicted, reference)], thresholds, text_threshold, workers=1)
+
+def detection_row(scores: Mapping[str, Any]) -> Dict[str, float]:
+    """Flatten :func:`score_boxes_batch` output into one report row (``P@0.50``, ``R@0.50``, ...)."""
+    row: Dict[str, float] = {}
+    for t, threshold in enumerate(scores["thresholds"]):
+        row[f"P@{threshold:.2f}"] = float(scores["precision"][t])
+        row[f"R@{threshold:.2f}"] = float(scores["recall"][t])
+        row[f"F1@{threshold:.2f}"] = float(scores["f1"][t])
+    row.update(
+        {
+            "Pred Boxes": scores["pred_boxes"],
+            "Ref Boxes": scores["ref_boxes"],
+            "Matched": scores["matched"],
+            "Mean IoU": scores["mean_iou"],
+            "Matched CER": scores["cer"],
+            "Matched WER": scores["wer"],
+        }
+    )
+    return row
@@ -1,3 +1,7 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import process
 from rapidfuzz.distance import Levenshtein
 
 def calculate_cer(reference: str, hypothesis: str) -> float:
@@ -26,11 +30,98 @@ def calculate_wer(reference: str, hypothesis: str) -> float:
     I is the number of insertions,
     and N is the number of words in the reference.
     """
-    ref_words = reference.split()
-    hyp_words = hypothesis.split()
-    
+    return calculate_wer_tokens(reference.split(), hypothesis.split())
+
+def calculate_wer_tokens(ref_words: Sequence, hyp_words: Sequence) -> float:
+    """
+    WER over pre-tokenized sequences, so a reference split once can be scored
+    against several hypotheses.
+    """
     if not ref_words:
         return 1.0 if hyp_words else 0.0
         
     distance = Levenshtein.distance(ref_words, hyp_words)
     return distance / len(ref_words)
+
+def score_pair(reference: str, hypothesis: str, ref_words: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Score one pair, returning CER/WER and the edit/length counts behind them
+    (same keys as :func:`score_batch`). Pass ``ref_words`` to reuse a reference
+    that was already tokenized for another engine.
+    """
+    if ref_words is None:
+        ref_words = reference.split()
+    hyp_words = hypothesis.split()
+    char_edits = Levenshtein.distance(reference, hypothesis)
+    word_edits = Levenshtein.distance(ref_words, hyp_words)
+    return {
+        "cer": char_edits / len(reference) if reference else float(char_edits > 0),
+        "wer": word_edits / len(ref_words) if ref_words else float(word_edits > 0),
+        "char_edits": char_edits,
+        "ref_chars": len(reference),
+        "word_edits": word_edits,
+        "ref_words": len(ref_words),
+    }
+
+def _edit_distances(refs: Sequence, hyps: Sequence, workers: int) -> np.ndarray:
+    if len(refs) != len(hyps):
+        raise ValueError(f"refs and hyps must have the same length ({len(refs)} != {len(hyps)})")
+    if not refs:
+        return np.zeros(0, dtype=np.int64)
+    return process.cpdist(refs, hyps, scorer=Levenshtein.distance, workers=workers).astype(np.int64)
+
+def _rates(edits: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Same convention as the scalar metrics: an empty reference scores 0 if the hypothesis is empty too, else 1.
+    rates = np.where(edits > 0, 1.0, 0.0)
+    nonzero = lengths > 0
+    rates[nonzero] = edits[nonzero] / lengths[nonzero]
+    return rates
+
+def score_batch(refs: Sequence[str], hyps: Sequence[str], workers: int = -1) -> Dict[str, np.ndarray]:
+    """
+    Score many (reference, hypothesis) pairs at once with rapidfuzz's
+    multi-threaded pairwise distance (``workers=-1`` uses all cores).
+
+    Returns arrays of per-pair ``cer`` / ``wer`` plus the raw ``char_edits``,
+    ``ref_chars``, ``word_edits`` and ``ref_words`` counts needed for corpus metrics.
+    """
+    char_edits = _edit_distances(refs, hyps, workers)
+    ref_chars = np.fromiter((len(r) for r in refs), dtype=np.int64, count=len(refs))
+    ref_tokens = [r.split() for r in refs]
+    word_edits = _edit_distances(ref_tokens, [h.split() for h in hyps], workers)
+    ref_words = np.fromiter((len(t) for t in ref_tokens), dtype=np.int64, count=len(refs))
+    return {
+        "cer": _rates(char_edits, ref_chars),
+        "wer": _rates(word_edits, ref_words),
+        "char_edits": char_edits,
+        "ref_chars": ref_chars,
+        "word_edits": word_edits,
+        "ref_words": ref_words,
+    }
+
+def calculate_cer_batch(refs: Sequence[str], hyps: Sequence[str], workers: int = -1) -> np.ndarray:
+    """Per-pair CER for many pairs as a NumPy array."""
+    return _rates(_edit_distances(refs, hyps, workers), np.fromiter(map(len, refs), dtype=np.int64, count=len(refs)))
+
+def calculate_wer_batch(refs: Sequence[str], hyps: Sequence[str], workers: int = -1) -> np.ndarray:
+    """Per-pair WER for many pairs as a NumPy array."""
+    ref_tokens = [r.split() for r in refs]
+    edits = _edit_distances(ref_tokens, [h.split() for h in hyps], workers)
+    return _rates(edits, np.fromiter(map(len, ref_tokens), dtype=np.int64, count=len(refs)))
+
+def corpus_error_rate(edits: np.ndarray, lengths: np.ndarray) -> float:
+    """Total edits over total reference length (not the mean of per-sample rates)."""
+    total = int(np.sum(lengths))
+    if total == 0:
+        return 1.0 if np.sum(edits) else 0.0
+    return float(np.sum(edits)) / total
+
+def corpus_cer(refs: Sequence[str], hyps: Sequence[str], workers: int = -1) -> float:
+    """Corpus-level CER: sum of character edits / sum of reference characters."""
+    return corpus_error_rate(_edit_distances(refs, hyps, workers), np.fromiter(map(len, refs), dtype=np.int64))
+
+def corpus_wer(refs: Sequence[str], hyps: Sequence[str], workers: int = -1) -> float:
+    """Corpus-level WER: sum of word edits / sum of reference words."""
+    ref_tokens = [r.split() for r in refs]
+    edits = _edit_distances(ref_tokens, [h.split() for h in hyps], workers)
+    return corpus_error_rate(edits, np.fromiter(map(len, ref_tokens), dtype=np.int64))
@@ -1,16 +1,21 @@
 """Preview helpers for DocVQA and FUNSD datasets."""
 from __future__ import annotations
 
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import matplotlib.pyplot as plt
 from datasets import Dataset, load_dataset
 from PIL import Image
 
 from ..config import DATASET_CONFIG
+from ..data.loader import _image_bytes, _undecoded_images
 
-__all__ = ["preview_docvqa_sample", "preview_funsd_sample"]
+__all__ = ["open_dataset", "preview_docvqa_sample", "preview_funsd_sample", "preview_grid"]
 
 _IMAGE_KEYS: tuple[str, ...] = ("image", "png", "image_path", "image_file", "file_name")
 
@@ -57,10 +62,24 @@ def _resolve_field(example: Dict[str, Any], candidates: Iterable[str]) -> Option
     return None
 
 
-def _pick_sample(dataset: Dataset, sample_idx: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def open_dataset(dataset_name: str, split: str, decode: bool = True) -> Dataset:
+    """Process-wide cache of opened splits; ``decode=False`` leaves image cells as encoded bytes."""
+    if not decode:
+        return _undecoded_images(open_dataset(dataset_name, split))
+    return load_dataset(dataset_name, split=split)
+
+
+def _pick_index(dataset: Dataset, sample_idx: Optional[int] = None, seed: int = 0) -> int:
+    # A seeded random row number: O(1), unlike shuffling the whole split to take one row.
     if sample_idx is not None:
-        return dataset[int(sample_idx)]
-    return dataset.shuffle(seed=seed).select(range(1))[0]
+        return int(sample_idx)
+    return random.Random(seed).randrange(len(dataset))
+
+
+def _pick_sample(dataset: Dataset, sample_idx: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    index = _pick_index(dataset, sample_idx, seed)
+    return {**dataset[index], "index": index}
 
 
 def _show(image: Image.Image, title: str) -> None:
@@ -80,7 +99,7 @@ def preview_docvqa_sample(
     show: bool = True,
     images_root: Optional[str | Path] = None,
 ) -> Dict[str, Any]:
-    ds = load_dataset(dataset_name, split=split)
+    ds = open_dataset(dataset_name, split)
     example = _pick_sample(ds, sample_idx=sample_idx, seed=seed)
     image = _ensure_image(example, Path(images_root) if images_root else None)
     meta = example.get("json", {})
@@ -119,7 +138,7 @@ def preview_funsd_sample(
     show: bool = True,
     images_root: Optional[str | Path] = None,
 ) -> Dict[str, Any]:
-    ds = load_dataset(dataset_name, split=split)
+    ds = open_dataset(dataset_name, split)
     example = _pick_sample(ds, sample_idx=sample_idx, seed=seed)
     image = _ensure_image(example, Path(images_root) if images_root else None)
     question = _resolve_field(example, ("question", "questions", "text"))
@@ -137,3 +156,94 @@ def preview_funsd_sample(
     result["question_text"] = question
     result["answer_text"] = answer
     return result
+
+
+def _image_column(dataset: Dataset) -> str:
+    for key in _IMAGE_KEYS:
+        if key in dataset.column_names:
+            return key
+    raise ValueError(f"No image column among {dataset.column_names}")
+
+
+def _decode(image_cell: Any, max_size: int) -> Image.Image:
+    image = Image.open(io.BytesIO(_image_bytes(image_cell)))
+    image.draft("RGB", (max_size, max_size))  # JPEG: decode at reduced scale
+    image = image.convert("RGB")
+    image.thumbnail((max_size, max_size))
+    return image
+
+
+def _run_predictions(run_dir: str | Path, indices: Sequence[int], engines: Optional[Sequence[str]]) -> Dict[int, List[Dict]]:
+    from ..results import read_results
+
+    df = read_results([run_dir], columns=["Prediction", "CER"])
+    if df.empty:
+        return {}
+    df = df[df["index"].isin(indices) & (df["Status"] == "ok")]
+    if engines:
+        df = df[df["Engine"].isin(engines)]
+    predictions: Dict[int, List[Dict]] = {}
+    for row in df.to_dict("records"):
+        predictions.setdefault(int(row["index"]), []).append(row)
+    return predictions
+
+
+def preview_grid(
+    dataset_name: str = "pixparse/docvqa-wds",
+    split: str = "validation",
+    indices: Optional[Sequence[int]] = None,
+    n: int = 8,
+    seed: int = 0,
+    *,
+    cols: int = 4,
+    max_size: int = 768,
+    workers: int = 8,
+    run_dir: Optional[str | Path] = None,
+    engines: Optional[Sequence[str]] = None,
+    overlay_chars: int = 200,
+    show: bool = True,
+) -> List[Dict[str, Any]]:
+    """Plot several samples in a grid, decoding their images on ``workers`` threads.
+
+    Without ``indices``, ``n`` distinct rows are drawn at random (seeded). With a
+    ``run_dir``, each tile is overlaid with the stored predictions (first
+    ``overlay_chars`` characters and CER) of that run's engines, or only
+    ``engines``; the run's sample index must refer to rows of the same split.
+
+    Returns one dict per tile with ``index``, the decoded ``image`` and the
+    overlaid ``predictions`` rows.
+    """
+
+    ds = open_dataset(dataset_name, split, decode=False)
+    if indices is None:
+        indices = random.Random(seed).sample(range(len(ds)), min(n, len(ds)))
+    indices = [int(i) for i in indices]
+    cells = ds.select(indices)[_image_column(ds)]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(cells)))) as pool:
+        images = list(pool.map(lambda cell: _decode(cell, max_size), cells))
+    predictions = _run_predictions(run_dir, indices, engines) if run_dir is not None else {}
+    tiles = [
+        {"index": index, "image": image, "predictions": predictions.get(index, [])}
+        for index, image in zip(indices, images)
+    ]
+
+    if show and tiles:
+        rows = -(-len(tiles) // cols)
+        fig, axes = plt.subplots(rows, cols, figsize=(4 * cols, 5 * rows), squeeze=False)
+        for ax in axes.flat:
+            ax.axis("off")
+        for ax, tile in zip(axes.flat, tiles):
+            ax.imshow(tile["image"])
+            ax.set_title(f"#{tile['index']}")
+            if tile["predictions"]:
+                text = "\n\n".join(
+                    f"{p['Engine']} (CER {p['CER']:.3f}): {' '.join(str(p['Prediction']).split())[:overlay_chars]}"
+                    for p in tile["predictions"]
+                )
+                ax.text(
+                    0.02, 0.02, text, transform=ax.transAxes, fontsize=7, va="bottom", wrap=True,
+                    bbox={"facecolor": "white", "alpha": 0.8, "edgecolor": "none"},
+                )
+        fig.tight_layout()
+        plt.show()
+    return tiles
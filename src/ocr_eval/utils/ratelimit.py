@@ -0,0 +1,97 @@
+"""Client-side rate limiting for API-backed engines.
+
+A token bucket refills continuously at ``rate_per_minute / 60`` units per
+second. Callers *reserve* units up front; if the bucket goes negative the
+caller sleeps until the debt is repaid, which keeps concurrent callers in
+FIFO order. The same bucket can be shared by threads and asyncio tasks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Continuously refilled token bucket.
+
+    Args:
+        rate_per_minute: Sustained refill rate.
+        capacity: Maximum burst size; defaults to one minute's worth of tokens.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Deduct ``amount`` and return how long the caller must wait before proceeding."""
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return (or, if negative, charge) tokens after the real cost is known."""
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def acquire(self, amount: float = 1.0) -> None:
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1.0) -> None:
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits applied together.
+
+    Either limit may be ``None`` to disable it. Token cost is estimated before
+    the request and reconciled with the real usage afterwards via :meth:`settle`.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _reserve(self, estimated_tokens: float) -> float:
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        return wait
+
+    def acquire(self, estimated_tokens: float = 0) -> None:
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens: float = 0) -> None:
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated_tokens: float, actual_tokens: Optional[float]) -> None:
+        """Refund over-estimates (or charge under-estimates) once usage is known."""
+
+        if self.tokens and actual_tokens is not None:
+            self.tokens.refund(estimated_tokens - actual_tokens)
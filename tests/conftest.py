@@ -0,0 +1,42 @@
+"""Shared fixtures: a fake engine in the registry and a local dataset for CLI runs."""
+
+import pytest
+from typer.testing import CliRunner
+
+from ocr_eval.engines import registry
+from ocr_eval.fakes import local_dataset, synthetic_hf_dataset
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    """Register ``--engine fake`` (:class:`~ocr_eval.fakes.FakeEngine`, reported as "Fake")."""
+
+    spec = registry.EngineSpec("fake", "Fake", "ocr_eval.fakes.engine:FakeEngine")
+    monkeypatch.setitem(registry.BUILTIN_ENGINES, "fake", spec)
+    registry.available_engines.cache_clear()
+    yield spec
+    registry.available_engines.cache_clear()
+
+
+@pytest.fixture
+def funsd(fake_engine):
+    """Serve a small FUNSD-shaped dataset for any ``--dataset`` the loader is asked for."""
+
+    with local_dataset(synthetic_hf_dataset(12, size=(400, 300))):
+        yield
+
+
+@pytest.fixture
+def cli():
+    """Invoke the CLI; returns ``run(*args)`` giving the click result (output in ``.output``)."""
+
+    from ocr_eval.cli import app
+
+    runner = CliRunner()
+
+    def run(*args):
+        result = runner.invoke(app, [str(arg) for arg in args], catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        return result
+
+    return run
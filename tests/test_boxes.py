@@ -0,0 +1,95 @@
+"""Box matching against brute force, and detection scores on a hand-built page."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from ocr_eval.utils import boxes
+from ocr_eval.utils.boxes import detection_row, match_boxes, max_weight_assignment, score_boxes
+
+
+@pytest.fixture(autouse=True)
+def numpy_solver(monkeypatch):
+    """Exercise the built-in solver even where SciPy is installed."""
+
+    monkeypatch.setattr(boxes, "_scipy_assignment", lambda: None)
+
+
+def _brute_force(weights):
+    n, m = weights.shape
+    if n <= m:
+        return max(sum(weights[i, j] for i, j in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+    return _brute_force(weights.T)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (4, 6), (6, 4), (5, 5), (2, 7)])
+def test_assignment_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    for trial in range(25):
+        weights = rng.random(shape)
+        if trial % 3 == 0:
+            weights = rng.integers(0, 3, shape).astype(float)  # ties and zero rows
+        rows, cols = max_weight_assignment(weights)
+        assert len(rows) == min(shape)
+        assert len(set(rows.tolist())) == len(rows) and len(set(cols.tolist())) == len(cols)
+        assert list(rows) == sorted(rows)
+        assert weights[rows, cols].sum() == pytest.approx(_brute_force(weights))
+
+
+def test_match_boxes_is_optimal_not_greedy():
+    # Greedy would take the best pair (0 -> 0, IoU 97/103) and leave prediction 1
+    # with only reference 1 (IoU 80/120, below the threshold).
+    references = [[0, 0, 10, 10], [1, 0, 11, 10]]
+    predictions = [[0.3, 0, 10.3, 10], [-1, 0, 9, 10]]
+    pred_idx, ref_idx, ious = match_boxes(predictions, references, threshold=0.7)
+    assert list(zip(pred_idx.tolist(), ref_idx.tolist())) == [(0, 1), (1, 0)]
+    assert ious.tolist() == pytest.approx([93 / 107, 90 / 110])
+
+
+def test_match_boxes_agrees_with_brute_force_on_random_pages():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        refs = rng.integers(0, 40, (6, 2)).repeat(2, axis=1) + [0, 0, 8, 8]
+        preds = refs[rng.permutation(6)[:5]] + rng.integers(-3, 4, (5, 4))
+        for threshold in (0.3, 0.5, 0.75):
+            iou = boxes.iou_matrix(preds, refs)
+            allowed = np.where(iou >= threshold, iou, 0.0)
+            _, _, ious = match_boxes(preds, refs, threshold)
+            assert (ious >= threshold).all()
+            assert ious.sum() == pytest.approx(_brute_force(allowed))
+
+
+def test_scores_per_iou_threshold():
+    references = [
+        {"text": "alpha", "bbox": [0, 0, 10, 10]},
+        {"text": "beta", "bbox": [20, 0, 30, 10]},
+        {"text": "gamma", "bbox": [40, 0, 50, 10]},
+    ]
+    predictions = [
+        {"text": "alpha", "bbox": [0, 0, 10, 10]},  # IoU 1
+        {"text": "beta", "bbox": [21, 0, 31, 10]},  # IoU 90/110
+        {"text": "gamme", "bbox": [43, 0, 53, 10]},  # IoU 70/130
+        {"text": "stray", "bbox": [100, 100, 110, 110]},
+    ]
+    scores = score_boxes(predictions, references, thresholds=(0.9, 0.5, 0.75))
+
+    assert scores["thresholds"].tolist() == [0.5, 0.75, 0.9]
+    assert scores["true_positives"].tolist() == [3, 2, 1]
+    assert scores["precision"].tolist() == pytest.approx([3 / 4, 2 / 4, 1 / 4])
+    assert scores["recall"].tolist() == pytest.approx([3 / 3, 2 / 3, 1 / 3])
+    assert scores["f1"].tolist() == pytest.approx([6 / 7, 4 / 7, 2 / 7])
+    assert scores["mean_iou"] == pytest.approx((1 + 90 / 110 + 70 / 130) / 3)
+    assert (scores["char_edits"], scores["ref_chars"]) == (1, 14)
+    assert (scores["word_edits"], scores["ref_words"]) == (1, 3)
+
+    row = detection_row(scores)
+    assert row["F1@0.75"] == pytest.approx(4 / 7)
+    assert (row["Pred Boxes"], row["Ref Boxes"], row["Matched"]) == (4, 3, 3)
+
+
+def test_empty_pages():
+    nothing = score_boxes([], [])
+    assert nothing["precision"].tolist() == nothing["recall"].tolist() == [1.0, 1.0, 1.0]
+    missed = score_boxes([], [{"text": "a", "bbox": [0, 0, 1, 1]}])
+    assert missed["recall"].tolist() == [0.0, 0.0, 0.0] and missed["f1"].tolist() == [0.0, 0.0, 0.0]
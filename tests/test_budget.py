@@ -0,0 +1,109 @@
+"""Budget admission: projection from observed calls, probing and exhaustion."""
+
+import threading
+
+import pytest
+
+from ocr_eval.budget import BudgetScheduler
+from ocr_eval.fakes import FakeEngine, synthetic_page, synthetic_samples
+from ocr_eval.runner import EvaluationRunner
+
+
+def _admit_in_thread(budget, names):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault("admitted", budget.admit(names)))
+    thread.start()
+    return thread, outcome
+
+
+def test_no_limit_admits_everything():
+    budget = BudgetScheduler()
+    assert not budget.enabled
+    assert all(budget.admit(["a", "b"]) for _ in range(100))
+
+
+def test_projection_uses_the_average_successful_live_call():
+    budget = BudgetScheduler(max_cost=1.0)
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.25, 100)
+    # Failed and cached calls count towards the spend but not the per-call average.
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.0, 0, ok=False)
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.0, 0, cached=True)
+    assert budget.spent_cost == 0.25
+
+    # 0.25 spent + 3 in flight x 0.25 = 1.0 fits; a fourth would not.
+    assert all(budget.admit(["vlm"]) for _ in range(3))
+    thread, outcome = _admit_in_thread(budget, ["vlm"])
+    thread.join(0.1)
+    assert thread.is_alive()  # waits for in-flight calls rather than giving up
+    budget.observe("vlm", 0.05, 10)  # cheaper than projected: room for one more
+    thread.join(5)
+    assert outcome == {"admitted": True}
+    assert budget.remaining()["cost"] == pytest.approx(0.7)
+
+
+def test_unobserved_engines_are_probed_one_call_at_a_time():
+    budget = BudgetScheduler(max_cost=1.0)
+    assert budget.admit(["vlm", "ocr"])
+    thread, outcome = _admit_in_thread(budget, ["vlm", "ocr"])
+    thread.join(0.1)
+    assert thread.is_alive()
+    budget.observe("vlm", 0.1, 0)
+    thread.join(0.1)
+    assert thread.is_alive()  # "ocr" is still probing
+    budget.observe("ocr", 0.0, 0, ok=False)  # a failed probe does not end probing
+    thread.join(5)
+    assert outcome == {"admitted": True}
+
+
+def test_cache_hit_ends_probing():
+    budget = BudgetScheduler(max_cost=1.0)
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.0, 0, cached=True)
+    assert budget.admit(["vlm"]) and budget.admit(["vlm"])
+
+
+def test_exhausted_once_nothing_in_flight_fits():
+    budget = BudgetScheduler(max_tokens=1000, spent_tokens=400)
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.0, 500)
+    assert not budget.admit(["vlm"])  # 900 + 500 > 1000
+    assert budget.exhausted and not budget.admit(["other"])
+    assert budget.remaining() == {"cost": None, "tokens": 100}
+
+
+def test_waiting_admission_fails_when_the_last_call_exhausts_the_budget():
+    budget = BudgetScheduler(max_cost=1.0)
+    assert budget.admit(["vlm"])
+    budget.observe("vlm", 0.4, 0)
+    assert budget.admit(["vlm"])
+    thread, outcome = _admit_in_thread(budget, ["vlm"])
+    thread.join(0.1)
+    assert thread.is_alive()
+    budget.observe("vlm", 0.4, 0)  # 0.8 spent, nothing in flight, 0.8 + 0.4 > 1.0
+    thread.join(5)
+    assert outcome == {"admitted": False} and budget.exhausted
+
+
+class _PricedEngine(FakeEngine):
+    def process_bytes(self, data, mime=None):
+        self._record_call_info(pages=1)
+        return super().process_bytes(data, mime)
+
+    def call_cost(self, info):
+        return info.get("pages", 0) * 0.1
+
+
+def test_runner_stops_admitting_samples_at_the_budget():
+    samples = synthetic_samples(10, gt_chars=40)
+    for sample in samples:
+        sample["image_bytes"] = synthetic_page(200, 100, lines=1, seed=sample["index"])
+    engine = _PricedEngine()
+    runner = EvaluationRunner({"priced": engine}, workers=4, quiet=True, budget=BudgetScheduler(max_cost=0.35))
+    rows = list(runner.run(samples))
+
+    assert len(rows) == engine.calls == 3
+    assert runner.stats.budget_exhausted
+    assert round(sum(row["Cost ($)"] for row in rows), 6) == 0.3
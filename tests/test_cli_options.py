@@ -0,0 +1,47 @@
+"""Validation of the per-engine --preprocess and --engine-processes options."""
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from ocr_eval.cli import app
+from ocr_eval.commands.common import _parse_processes, _parse_profiles
+
+
+def test_profiles_globally_and_per_engine():
+    profiles = _parse_profiles("jpeg-1600", ["OpenAI", "Textract"])
+    assert {name: p.name for name, p in profiles.items()} == {"OpenAI": "jpeg-1600", "Textract": "jpeg-1600"}
+    profiles = _parse_profiles("openai=jpeg-1600, TEXTRACT=original", ["OpenAI", "Textract"])
+    assert {name: p.name for name, p in profiles.items()} == {"OpenAI": "jpeg-1600", "Textract": "original"}
+
+
+@pytest.mark.parametrize("spec", ["opneai=jpeg-1600", "textract=original"])
+def test_profiles_for_unselected_engines_are_rejected(spec):
+    with pytest.raises(typer.BadParameter, match="is not a selected engine"):
+        _parse_profiles(spec, ["OpenAI"])
+
+
+def test_unknown_profiles_are_rejected():
+    with pytest.raises(typer.BadParameter, match="Unknown preprocessing token"):
+        _parse_profiles("openai=jpg-1600", ["OpenAI"])
+
+
+def test_processes():
+    assert _parse_processes("Textract=2", ["textract", "openai"]) == {"textract": 2}
+    assert _parse_processes(None, ["textract"]) == {}
+    for spec in ("textract", "textract=0", "textract=two"):
+        with pytest.raises(typer.BadParameter, match="expected engine=N"):
+            _parse_processes(spec, ["textract"])
+    with pytest.raises(typer.BadParameter, match="'openai' is not a selected engine"):
+        _parse_processes("openai=2", ["textract"])
+
+
+@pytest.mark.parametrize(
+    "option, value", [("--preprocess", "opneai=jpeg-1600"), ("--engine-processes", "openai=2")]
+)
+def test_evaluate_fails_before_starting_anything(fake_engine, tmp_path, option, value):
+    run_dir = tmp_path / "run"
+    result = CliRunner().invoke(app, ["evaluate", "--engine", "fake", "--run-dir", str(run_dir), option, value])
+    assert result.exit_code == 2
+    assert "is not a selected engine" in result.output
+    assert not run_dir.exists()
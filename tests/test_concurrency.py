@@ -0,0 +1,119 @@
+"""AIMD concurrency limits, retry backoff and the retry queue."""
+
+import random
+import threading
+
+import pytest
+
+from ocr_eval.concurrency import AIMDController, RetryScheduler, backoff_delay
+
+
+def _call(controller, outcome="ok", latency=0.01):
+    controller.release(controller.acquire(), outcome, latency)
+
+
+def test_slow_start_then_multiplicative_decrease():
+    controller = AIMDController(maximum=32, initial=4)
+    for _ in range(6):
+        _call(controller)
+    assert controller.limit == 10  # +1 per success while slow-starting
+
+    _call(controller, "throttled", None)
+    assert controller.limit == 5 and controller.decreases == 1
+    _call(controller, "timeout", None)
+    assert controller.limit == 2 and controller.decreases == 2
+    assert controller.signals == {"throttled": 1, "timeout": 1, "error": 0}
+
+
+def test_additive_increase_after_backoff():
+    controller = AIMDController(maximum=32, initial=8)
+    _call(controller, "throttled", None)
+    assert controller.limit == 4
+    # Congestion avoidance: one step per window of ``limit`` successes.
+    for expected in (5, 6, 7):
+        for _ in range(controller.limit - 1):
+            _call(controller)
+        assert controller.limit == expected - 1
+        _call(controller)
+        assert controller.limit == expected
+
+
+def test_in_flight_burst_backs_off_once():
+    controller = AIMDController(maximum=16, initial=8)
+    tokens = [controller.acquire() for _ in range(8)]
+    for token in tokens:  # every call that was in flight comes back throttled
+        controller.release(token, "throttled")
+    assert controller.limit == 4 and controller.decreases == 1
+    assert controller.signals["throttled"] == 8
+
+
+def test_limit_stays_within_bounds():
+    controller = AIMDController(maximum=3, initial=2, minimum=2)
+    for _ in range(20):
+        _call(controller)
+    assert controller.limit == controller.peak == 3
+    for _ in range(5):
+        _call(controller, "throttled", None)
+    assert controller.limit == 2
+
+
+def test_errors_and_slow_calls_hold_the_limit():
+    errors = AIMDController(maximum=32, initial=4, window=10)
+    for _ in range(3):
+        _call(errors, "error", None)
+    for _ in range(5):
+        _call(errors)
+    assert errors.limit == 4 and errors.signals["error"] == 3
+
+    slow = AIMDController(maximum=32, initial=4)
+    _call(slow, latency=0.1)
+    assert slow.limit == 5
+    for _ in range(10):
+        _call(slow, latency=5.0)
+    assert slow.limit == 5
+
+
+def test_acquire_blocks_at_the_limit():
+    controller = AIMDController(maximum=1, initial=1)
+    token = controller.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (controller.acquire(), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.1)
+    controller.release(token, "ok", 0.01)
+    assert acquired.wait(5)
+    waiter.join()
+
+
+@pytest.mark.parametrize("attempt, bound", [(1, 0.5), (2, 1.0), (3, 2.0), (6, 10.0), (40, 10.0)])
+def test_backoff_is_full_jitter_within_bounds(attempt, bound):
+    rng = random.Random(attempt)
+    delays = [backoff_delay(attempt, base=0.5, cap=10.0, rng=rng) for _ in range(2000)]
+    assert all(0.0 <= delay <= bound for delay in delays)
+    # Full jitter spreads retries over the whole window rather than clustering at its end.
+    assert min(delays) < 0.05 * bound and max(delays) > 0.95 * bound
+    assert sum(delays) / len(delays) == pytest.approx(bound / 2, rel=0.1)
+
+
+def test_retry_scheduler_runs_callbacks_in_due_order():
+    scheduler = RetryScheduler()
+    ran = []
+    finished = threading.Event()
+    scheduler.schedule(0.15, lambda: (ran.append("late"), finished.set()))
+    scheduler.schedule(0.0, lambda: ran.append("now"))
+    scheduler.schedule(0.05, lambda: 1 / 0)  # a failing callback does not stop the queue
+    scheduler.schedule(0.1, lambda: ran.append("soon"))
+    assert finished.wait(5)
+    scheduler.close()
+    assert ran == ["now", "soon", "late"]
+
+
+def test_retry_scheduler_close_drops_pending():
+    scheduler = RetryScheduler()
+    ran = []
+    scheduler.schedule(30.0, lambda: ran.append("never"))
+    assert scheduler.pending() == 1
+    scheduler.close()
+    assert scheduler.pending() == 0 and ran == []
+    with pytest.raises(RuntimeError):
+        scheduler.schedule(0.0, lambda: None)
@@ -0,0 +1,62 @@
+"""Ground-truth sidecar: round-trips and merging saves from concurrent writers."""
+
+import multiprocessing
+
+import numpy as np
+
+from ocr_eval.data.gt_index import INDEX_VERSION, GroundTruthIndex
+
+
+def _write_shard(path, shard, num_shards, count, barrier):
+    index = GroundTruthIndex(path)  # loaded before any shard has saved
+    for i in range(shard, count, num_shards):
+        index.add(i, f"text {i} " + "é" * (i % 7))
+    barrier.wait()  # save at the same moment as the other shards
+    index.save()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "gt.npz"
+    index = GroundTruthIndex(path)
+    index.add(3, "Grüße aus Köln")
+    index.add(1, "")
+    index.save()
+
+    loaded = GroundTruthIndex(path)
+    assert len(loaded) == 2 and 3 in loaded and 2 not in loaded
+    assert loaded.get(3) == "Grüße aus Köln" and loaded.get(1) == ""
+    with np.load(path) as data:
+        assert int(data["version"]) == INDEX_VERSION
+        assert set(data.files) == {"version", "indices", "text", "text_offsets"}
+
+
+def test_concurrent_writers_merge_their_entries(tmp_path):
+    path = tmp_path / "gt.npz"
+    seeded = GroundTruthIndex(path)
+    seeded.add(1000, "already there")
+    seeded.save()
+
+    num_shards, count = 4, 200
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(num_shards)
+    workers = [
+        context.Process(target=_write_shard, args=(path, shard, num_shards, count, barrier))
+        for shard in range(num_shards)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    merged = GroundTruthIndex(path)
+    assert len(merged) == count + 1
+    assert merged.get(1000) == "already there"
+    assert all(merged.get(i) == f"text {i} " + "é" * (i % 7) for i in range(count))
+    assert not list(tmp_path.glob("*.tmp.npz"))
+
+
+def test_stale_version_is_ignored(tmp_path):
+    path = tmp_path / "gt.npz"
+    np.savez_compressed(path, version=np.array(INDEX_VERSION - 1), indices=np.array([0]))
+    assert len(GroundTruthIndex(path)) == 0
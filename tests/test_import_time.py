@@ -0,0 +1,69 @@
+"""Importing the package, the CLI or one engine must not load dependencies that are only needed on demand.
+
+The import *time* budget is checked by the start-up benchmark (``benchmarks/bench_startup.py``).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+LAZY_MODULES = (
+    "boto3",
+    "botocore",
+    "datasets",
+    "httpx",
+    "Levenshtein",
+    "matplotlib",
+    "numpy",
+    "openai",
+    "pandas",
+    "PIL",
+    "pyarrow",
+    "rapidfuzz",
+    "sacrebleu",
+)
+
+# Lazy modules each engine needs itself; every other one must stay unloaded, so
+# choosing one engine never pays for another's SDK.
+ENGINE_MODULES = {
+    "ocr_eval.engines.textract": ("boto3", "botocore", "PIL"),
+    "ocr_eval.engines.openai": ("httpx", "openai", "PIL"),
+}
+
+_PROBE = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+def _import(module):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    # -X importtime lines end in "| <module>"; top-level names only.
+    timed = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in result.stderr.splitlines() if "|" in line}
+    return loaded, timed
+
+
+@pytest.mark.parametrize("module", ["ocr_eval", "ocr_eval.cli"])
+def test_import_does_not_load_lazy_modules(module):
+    loaded, timed = _import(module)
+    assert module in loaded
+    assert [name for name in LAZY_MODULES if name in loaded or name in timed] == []
+
+
+@pytest.mark.parametrize("module", sorted(ENGINE_MODULES))
+def test_engine_import_loads_only_its_own_dependencies(module):
+    loaded, timed = _import(module)
+    assert module in loaded
+    allowed = ENGINE_MODULES[module]
+    assert [name for name in LAZY_MODULES if name not in allowed and (name in loaded or name in timed)] == []
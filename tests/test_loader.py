@@ -0,0 +1,72 @@
+"""DocVQA page grouping in the loader, with and without sharding."""
+
+import datasets
+import pytest
+
+from ocr_eval.data.loader import iter_dataset_samples
+from ocr_eval.fakes import local_dataset, synthetic_page
+
+# Page shown by each question row; later rows revisit pages already yielded.
+ROW_PAGES = [0, 1, 0, 2, 1, 0, 3, 2]
+
+
+@pytest.fixture
+def docvqa():
+    pages = [synthetic_page(300, 200, lines=2, seed=page) for page in range(max(ROW_PAGES) + 1)]
+    ds = datasets.Dataset.from_dict(
+        {
+            "png": [{"bytes": pages[page], "path": None} for page in ROW_PAGES],
+            "json": [
+                {
+                    "questionId": 100 + row,
+                    "question": f"question {row} about page {page}?",
+                    "answers": [f"answer {row}", f"ANSWER {row}"],
+                    "ocr_results": {"recognitionResults": [{"lines": [{"text": f"page {page}"}]}]},
+                }
+                for row, page in enumerate(ROW_PAGES)
+            ],
+        }
+    ).cast_column("png", datasets.Image())
+    with local_dataset(ds):
+        yield
+
+
+def _samples(**kwargs):
+    return list(iter_dataset_samples("docvqa", prefetch_size=2, **kwargs))
+
+
+def _question_rows(sample):
+    return [int(question["id"]) - 100 for question in sample["questions"]]
+
+
+def test_questions_on_one_page_form_one_sample(docvqa):
+    samples = _samples()
+    # Each page is one sample, indexed by the first row that shows it.
+    assert [sample["index"] for sample in samples] == [0, 1, 3, 6]
+    assert [_question_rows(sample) for sample in samples] == [[0, 2, 5], [1, 4], [3, 7], [6]]
+    assert [sample["ground_truth"] for sample in samples] == ["page 0", "page 1", "page 2", "page 3"]
+    assert samples[0]["questions"][1]["answers"] == ["answer 2", "ANSWER 2"]
+
+
+def test_grouping_can_be_turned_off(docvqa):
+    samples = _samples(group_pages=False)
+    assert [sample["index"] for sample in samples] == list(range(len(ROW_PAGES)))
+    assert all(_question_rows(sample) == [sample["index"]] for sample in samples)
+
+
+def test_num_samples_counts_rows(docvqa):
+    samples = _samples(num_samples=5)
+    assert [_question_rows(sample) for sample in samples] == [[0, 2], [1, 4], [3]]
+
+
+@pytest.mark.parametrize("shard_by", ["index", "hash"])
+@pytest.mark.parametrize("num_shards", [2, 3])
+def test_shards_split_pages_without_overlap_or_gaps(docvqa, shard_by, num_shards):
+    whole = {sample["index"]: _question_rows(sample) for sample in _samples()}
+    shards = [
+        _samples(shard_index=shard, num_shards=num_shards, shard_by=shard_by) for shard in range(num_shards)
+    ]
+    indices = [sample["index"] for shard in shards for sample in shard]
+    assert sorted(indices) == sorted(whole)  # every page in exactly one shard
+    # A page's questions all stay with the shard that owns the page.
+    assert {sample["index"]: _question_rows(sample) for shard in shards for sample in shard} == whole
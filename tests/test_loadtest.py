@@ -0,0 +1,26 @@
+"""The offline load test against the fake OpenAI service."""
+
+
+def test_loadtest_against_fake_openai(cli, tmp_path):
+    output = tmp_path / "loadtest.md"
+    result = cli(
+        "loadtest", "--engine", "openai", "--pages", 12, "--workers", 4, "--throttle-rate", 0.25,
+        "--openai-max-retries", 8, "--page-width", 300, "--page-height", 200, "--output", output,
+    )
+    assert "Sustained throughput:" in result.output and " calls/s over " in result.output
+    report = output.read_text()
+    assert "**Load test:** 12 synthetic pages" in report
+    row = next(line for line in report.splitlines() if line.startswith("| OpenAI"))
+    cells = [cell.strip() for cell in row.strip("|").split("|")]
+    header = next(line for line in report.splitlines() if line.startswith("| Engine"))
+    columns = dict(zip([c.strip() for c in header.strip("|").split("|")], cells))
+    # Injected 429s are retried by the client, so every page still succeeds.
+    assert columns["Calls"] == "12" and columns["OK"] == "12" and columns["Failed"] == "0"
+    assert int(columns["Injected 429/Throttle"]) > 0
+    assert int(columns["Client Retries"]) == int(columns["Injected 429/Throttle"])
+
+
+def test_loadtest_rejects_zero_pages(cli, tmp_path):
+    result = cli("loadtest", "--engine", "openai", "--pages", 0, "--output", tmp_path / "loadtest.md")
+    assert "Invalid --pages" in result.output
+    assert not (tmp_path / "loadtest.md").exists()
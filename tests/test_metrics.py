@@ -0,0 +1,76 @@
+"""The batch scorer must agree with the per-pair scorer the runner uses."""
+
+import random
+
+import numpy as np
+import pytest
+
+from ocr_eval.utils.metrics import (
+    calculate_cer,
+    calculate_cer_batch,
+    calculate_wer,
+    calculate_wer_batch,
+    corpus_cer,
+    corpus_wer,
+    score_batch,
+    score_pair,
+)
+
+PAIRS = [
+    ("", ""),
+    ("", "extra words"),
+    ("total 12.50", ""),
+    ("total 12.50", "total 12.50"),
+    ("Invoice No. 4711\nDate: 2024-01-02", "Invoice No 4711 Date 2024-01-02"),
+    ("the quick brown fox", "the quick brown fox jumps"),
+    ("  leading and   trailing  ", "leading and trailing"),
+    ("Grüße aus Köln – 3 × 4 €", "Gruße aus Koln - 3 x 4 EUR"),
+]
+
+
+def _random_pairs(count, seed=0):
+    rng = random.Random(seed)
+    words = ["total", "tax", "12.50", "Invoice", "No.", "date", "ÄÖÜ", "x", ""]
+    pairs = []
+    for _ in range(count):
+        ref = " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        hyp = " ".join(word for word in ref.split() if rng.random() > 0.2)
+        if rng.random() < 0.3:
+            hyp += " " + rng.choice(words)
+        pairs.append((ref, hyp))
+    return pairs
+
+
+@pytest.mark.parametrize("workers", [1, -1])
+def test_score_batch_matches_score_pair(workers):
+    pairs = PAIRS + _random_pairs(200)
+    refs, hyps = [r for r, _ in pairs], [h for _, h in pairs]
+    batch = score_batch(refs, hyps, workers=workers)
+    for i, (ref, hyp) in enumerate(pairs):
+        single = score_pair(ref, hyp)
+        for key, value in single.items():
+            assert batch[key][i] == pytest.approx(value), (key, ref, hyp)
+
+
+def test_score_pair_matches_scalar_metrics_and_presplit_reference():
+    for ref, hyp in PAIRS + _random_pairs(50, seed=1):
+        scores = score_pair(ref, hyp)
+        assert scores["cer"] == pytest.approx(calculate_cer(ref, hyp))
+        assert scores["wer"] == pytest.approx(calculate_wer(ref, hyp))
+        assert score_pair(ref, hyp, ref.split()) == scores
+
+
+def test_batch_helpers_and_corpus_rates():
+    pairs = PAIRS + _random_pairs(50, seed=2)
+    refs, hyps = [r for r, _ in pairs], [h for _, h in pairs]
+    batch = score_batch(refs, hyps)
+    np.testing.assert_allclose(calculate_cer_batch(refs, hyps), batch["cer"])
+    np.testing.assert_allclose(calculate_wer_batch(refs, hyps), batch["wer"])
+    assert corpus_cer(refs, hyps) == pytest.approx(batch["char_edits"].sum() / batch["ref_chars"].sum())
+    assert corpus_wer(refs, hyps) == pytest.approx(batch["word_edits"].sum() / batch["ref_words"].sum())
+
+
+def test_score_batch_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        score_batch(["a"], [])
+    assert all(len(values) == 0 for values in score_batch([], []).values())
@@ -0,0 +1,106 @@
+"""The async OpenAI path against the fake chat completions server (and what it shares with the sync path)."""
+
+import asyncio
+
+import pytest
+
+from ocr_eval.fakes import FakeOpenAIServer, synthetic_page
+
+pytest.importorskip("openai")
+
+from ocr_eval.engines.openai import OpenAIVLMEngine  # noqa: E402
+
+
+class _NullContentServer(FakeOpenAIServer):
+    """Answers with ``"content": null``, as refusals and tool-only replies do."""
+
+    def respond(self, request):
+        status, payload = super().respond(request)
+        if status == 200:
+            payload["choices"][0]["message"]["content"] = None
+        return status, payload
+
+
+def _engine(server, **kwargs):
+    return OpenAIVLMEngine(model="fake-vlm", api_key="sk-fake", base_url=server.base_url, max_retries=0, **kwargs)
+
+
+def test_aprocess_bytes_returns_reply_and_usage():
+    async def main(engine):
+        try:
+            text = await engine.aprocess_bytes(synthetic_page(400, 300, lines=3))
+            return text, engine.pop_call_info()
+        finally:
+            await engine.aclose()
+
+    with FakeOpenAIServer(reply="```\nhello async\n```") as server:
+        text, info = asyncio.run(main(_engine(server)))
+        assert server.counters["ok"] == 1
+    assert text == "hello async"
+    assert info["prompt_tokens"] > 0 and info["completion_tokens"] > 0
+    assert info["retries"] == 0
+    assert info["encode_time"] > 0 and info["parse_time"] > 0
+
+
+def test_concurrent_tasks_keep_their_own_call_info():
+    # The fake server derives prompt tokens from the request size, so each
+    # question gets a different count; a shared record would mix them up.
+    questions = ["q" * (400 * (i + 1)) for i in range(8)]
+
+    async def ask(engine, question):
+        await engine.aanswer_question("context", question)
+        await asyncio.sleep(0)  # let the other tasks record their calls in between
+        return engine.pop_call_info()["prompt_tokens"]
+
+    async def main(engine):
+        try:
+            return await asyncio.gather(*(ask(engine, q) for q in questions))
+        finally:
+            await engine.aclose()
+
+    with FakeOpenAIServer(reply="answer", latency=0.02) as server:
+        engine = _engine(server)
+        tokens = asyncio.run(main(engine))
+    assert tokens == sorted(tokens) and len(set(tokens)) == len(questions)
+    # Call info recorded inside the tasks does not leak into the calling context.
+    assert engine.pop_call_info() == {}
+
+
+def test_null_content_is_an_empty_prediction():
+    async def main(engine):
+        try:
+            return await engine.aprocess_bytes(synthetic_page(400, 300, lines=3))
+        finally:
+            await engine.aclose()
+
+    with _NullContentServer() as server:
+        assert asyncio.run(main(_engine(server))) == ""
+        assert _engine(server).process_bytes(synthetic_page(400, 300, lines=3)) == ""
+
+
+def test_failed_requests_give_back_their_token_reservation():
+    async def main(engine):
+        try:
+            await engine.aprocess_bytes(synthetic_page(400, 300, lines=3))
+        finally:
+            await engine.aclose()
+
+    with FakeOpenAIServer(error_rate=1.0) as server:
+        engine = _engine(server, tokens_per_minute=60_000)
+        bucket = engine.rate_limiter.tokens
+        with pytest.raises(Exception):
+            asyncio.run(main(engine))
+        assert bucket._tokens == pytest.approx(bucket.capacity)
+        with pytest.raises(Exception):
+            engine.process_bytes(synthetic_page(400, 300, lines=3))
+        assert bucket._tokens == pytest.approx(bucket.capacity)
+        assert server.counters["errors"] == 2
+
+
+def test_cache_identity_includes_the_endpoint(monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", "")
+    default = OpenAIVLMEngine(model="fake-vlm", api_key="sk-fake")
+    local = OpenAIVLMEngine(model="fake-vlm", api_key="sk-fake", base_url="http://127.0.0.1:9/v1")
+    assert "base_url" not in default.cache_identity("process_image")
+    assert local.cache_identity("process_image")["base_url"] == "http://127.0.0.1:9/v1"
+    assert local.with_options(user_prompt="x").cache_identity("process_image")["base_url"] == local._base_url
@@ -0,0 +1,82 @@
+"""Each sample is preprocessed, base64-encoded and hashed once, however many engines share it."""
+
+import base64
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+from ocr_eval import preprocess as preprocess_module
+from ocr_eval import runner as runner_module
+from ocr_eval.cache import CachedEngine, PredictionCache, make_cache_key
+from ocr_eval.fakes import FakeEngine, FakeOpenAIServer, synthetic_page, synthetic_samples
+from ocr_eval.preprocess import parse_profile, preprocess
+from ocr_eval.runner import EvaluationRunner
+
+
+@pytest.fixture
+def counts(monkeypatch):
+    """Count base64 encodes and SHA-256 digests of payloads, and preprocess calls in the runner."""
+
+    counts = {"b64": 0, "digest": 0, "preprocess": 0}
+
+    def b64encode(data):
+        counts["b64"] += 1
+        return base64.b64encode(data)
+
+    def sha256(data):
+        counts["digest"] += 1
+        return hashlib.sha256(data)
+
+    def counted_preprocess(data, profile):
+        counts["preprocess"] += 1
+        return preprocess(data, profile)
+
+    monkeypatch.setattr(preprocess_module, "base64", SimpleNamespace(b64encode=b64encode))
+    monkeypatch.setattr(preprocess_module, "hashlib", SimpleNamespace(sha256=sha256))
+    monkeypatch.setattr(runner_module, "preprocess", counted_preprocess)
+    return counts
+
+
+def test_payload_encodings_are_computed_once(counts):
+    payload = preprocess(synthetic_page(), parse_profile("jpeg-1600"))
+    assert payload.b64 is payload.b64
+    assert payload.digest is payload.digest
+    assert base64.b64decode(payload.b64) == payload.data
+    assert payload.digest == hashlib.sha256(payload.data).digest()
+    assert counts["b64"] == 1 and counts["digest"] == 1
+
+
+def test_cached_engine_keys_payloads_like_raw_bytes(tmp_path):
+    payload = preprocess(synthetic_page(), parse_profile("original"))
+    identity = FakeEngine().cache_identity("process_image")
+    assert make_cache_key(payload.data, identity, payload.digest) == make_cache_key(payload.data, identity)
+
+    engine = FakeEngine(reply="cached")
+    cached = CachedEngine(engine, PredictionCache(tmp_path / "cache.db"))
+    assert cached.process_payload(payload) == "cached"
+    assert cached.process_bytes(payload.data) == "cached"
+    assert engine.calls == 1 and cached.hits == 1
+
+
+def test_runner_shares_one_payload_across_engines(counts, tmp_path):
+    from ocr_eval.engines.openai import OpenAIVLMEngine
+
+    samples = synthetic_samples(3, gt_chars=200)
+    for sample in samples:  # distinct pages, so no sample hits another's cache entries
+        sample["image_bytes"] = synthetic_page(800, 1000, lines=10, seed=1000 * sample["index"])
+    profile = parse_profile("jpeg-1600")
+    cache = PredictionCache(tmp_path / "cache.db")
+    with FakeOpenAIServer(reply="hello") as server:
+        base = OpenAIVLMEngine(model="fake-vlm", api_key="sk-fake", base_url=server.base_url, max_retries=0)
+        engines = {
+            "plain": CachedEngine(base, cache),
+            "short": CachedEngine(base.with_options(max_completion_tokens=16), cache),
+            "layout": CachedEngine(base.with_options(user_prompt="Keep the layout."), cache),
+        }
+        runner = EvaluationRunner(engines, workers=4, profiles={name: profile for name in engines}, quiet=True)
+        rows = list(runner.run(samples))
+        assert server.counters["ok"] == len(samples) * len(engines)
+
+    assert [row["Status"] for row in rows] == ["ok"] * len(samples) * len(engines)
+    assert counts == {"b64": len(samples), "digest": len(samples), "preprocess": len(samples)}
@@ -0,0 +1,87 @@
+"""ProcessPoolEngine with FakeCPUEngine workers: crashes, retirement, timeouts and recycling."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ocr_eval.engines.process_pool import ProcessPoolEngine, WorkerCrashedError
+from ocr_eval.fakes import FakeCPUEngine, synthetic_page
+from ocr_eval.runner import EvaluationRunner
+
+
+def _pages(count):
+    return [b"x" * (i + 1) for i in range(count)]
+
+
+def _call(engine, page):
+    try:
+        return engine.process_bytes(page)
+    except WorkerCrashedError as e:
+        return e
+
+
+def test_crashed_calls_fail_and_the_rest_come_back_in_order():
+    pages = _pages(60)
+    options = {"reply": None, "rounds": 100, "crash_rate": 0.2, "seed": 1}
+    with ProcessPoolEngine(FakeCPUEngine, options, processes=2) as pool:
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda page: _call(pool, page), pages))
+        stats = pool.worker_stats()
+
+    failed = [r for r in results if isinstance(r, WorkerCrashedError)]
+    assert failed, "crash_rate=0.2 over 60 calls should crash at least once"
+    for page, result in zip(pages, results):
+        if not isinstance(result, WorkerCrashedError):
+            assert result == f"{len(page)} bytes"
+    # Every crash is reported once: as the failed call's error and as a restart of its worker.
+    assert sum(row["Errors"] for row in stats) == len(failed)
+    assert sum(row["Restarts"] for row in stats) == len(failed)
+    assert sum(row["Calls"] for row in stats) == len(pages) - len(failed)
+
+
+def test_runner_reports_each_crash_as_an_error_row():
+    pages = [synthetic_page(200, 100, lines=1, seed=i) for i in range(30)]
+    samples = [
+        {"id": str(i), "index": i, "image_bytes": page, "ground_truth": f"{len(page)} bytes"}
+        for i, page in enumerate(pages)
+    ]
+    options = {"reply": None, "rounds": 100, "crash_rate": 0.2, "seed": 2}
+    with ProcessPoolEngine(FakeCPUEngine, options, processes=2) as pool:
+        rows = list(EvaluationRunner({"CPU": pool}, workers=4, quiet=True).run(samples))
+        restarts = sum(row["Restarts"] for row in pool.worker_stats())
+
+    assert [row["Sample ID"] for row in rows] == [sample["id"] for sample in samples]
+    errors = [row for row in rows if row["Status"] != "ok"]
+    assert len(errors) == restarts > 0
+    assert all("exited with code 70" in row["Prediction"] for row in errors)
+    assert all(row["CER"] == 0 for row in rows if row["Status"] == "ok")
+
+
+def test_worker_is_retired_after_max_crashes():
+    with ProcessPoolEngine(FakeCPUEngine, {"crash_rate": 1.0}, processes=1, max_crashes=2) as pool:
+        with ThreadPoolExecutor(4) as executor:
+            errors = list(executor.map(lambda page: _call(pool, page), _pages(4)))
+        assert all(isinstance(e, WorkerCrashedError) for e in errors)
+        assert any("2 crashes in a row" in str(e) for e in errors)
+        # Later calls fail at once instead of waiting for a worker that will never come.
+        with pytest.raises(WorkerCrashedError, match="all workers failed"):
+            pool.process_bytes(b"page")
+        assert pool.worker_stats()[0]["Restarts"] == 1
+
+
+def test_call_over_task_timeout_restarts_its_worker():
+    with ProcessPoolEngine(FakeCPUEngine, {"rounds": 50_000_000}, processes=1, task_timeout=0.2) as pool:
+        with pytest.raises(TimeoutError):
+            pool.process_bytes(b"slow page")
+        assert pool.worker_stats()[0]["Restarts"] == 1
+
+
+def test_workers_are_recycled_after_max_tasks():
+    with ProcessPoolEngine(FakeCPUEngine, {"rounds": 10}, processes=1, max_tasks_per_worker=2) as pool:
+        pids = set()
+        for page in _pages(5):
+            assert pool.process_bytes(page) == "fake transcription"
+            pids.add(pool.worker_stats()[0]["PID"])
+        row = pool.worker_stats()[0]
+    assert len(pids) >= 2
+    assert row["Calls"] == 5 and row["Restarts"] == 0 and row["Errors"] == 0
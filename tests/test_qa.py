@@ -0,0 +1,74 @@
+"""Known-answer checks for the DocVQA scores (EM, token F1, ANLS)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ocr_eval.qa import normalize_answers, score_answer_frame, score_answers
+
+
+def _scores(prediction, golds):
+    scores = score_answers([prediction], [golds], processes=1)
+    return {column: float(values[0]) for column, values in scores.items()}
+
+
+def test_normalization():
+    assert normalize_answers(["The Quick, brown fox!", "  A  b  ", None, "an apple-pie"]) == [
+        "quick brown fox", "b", "", "applepie"
+    ]
+
+
+def test_em_and_f1_compare_normalized_answers():
+    assert _scores("The Total: $1,250", ["total 1250"])["EM"] == 1.0
+    scores = _scores("new york city", ["York City"])
+    assert scores["EM"] == 0.0
+    assert scores["Answer F1"] == pytest.approx(0.8)  # precision 2/3, recall 1
+    assert _scores("paris", ["london"])["Answer F1"] == 0.0
+
+
+def test_anls_cuts_off_at_the_threshold():
+    assert _scores("12345", ["12346"])["ANLS"] == pytest.approx(0.8)
+    assert _scores("ABC ", ["abx"])["ANLS"] == pytest.approx(2 / 3)  # lowercased and stripped only
+    assert _scores("abcd", ["abxy"])["ANLS"] == 0.0  # distance exactly 0.5
+    # No SQuAD normalization: "the total: $1,250" is 7 edits from "total 1250".
+    assert _scores("The Total: $1,250", ["total 1250"])["ANLS"] == pytest.approx(1 - 7 / 17)
+
+
+def test_each_score_takes_its_best_gold_answer():
+    # F1 peaks on the first gold answer and ANLS on the second.
+    scores = _scores("march 3 1999", ["3 March 1999", "march 3 1998", "unrelated"])
+    assert scores["EM"] == 0.0
+    assert scores["Answer F1"] == 1.0
+    assert scores["ANLS"] == pytest.approx(1 - 1 / 12)
+
+
+def test_reduceat_keeps_questions_apart():
+    predictions = ["a cat", "dog", None, "x", "blue"]
+    gold_answers = [["cat", "kitten"], ["wolf"], [], ["y", "x"], ["bleu", "azure"]]
+    expected = {
+        "EM": [1, 0, 1, 1, 0],
+        "Answer F1": [1, 0, 1, 1, 0],
+        # "a cat" is 2 edits from "cat"; "blue" is 2 of 4 from "bleu", at the cutoff.
+        "ANLS": [0.6, 0, 1, 1, 0],
+    }
+    single = score_answers(predictions, gold_answers, processes=1)
+    chunked = score_answers(predictions, gold_answers, processes=2, chunk_size=2)
+    for column, values in expected.items():
+        assert single[column].tolist() == pytest.approx(values)
+        assert chunked[column].tolist() == pytest.approx(values)
+
+
+def test_score_answer_frame_leaves_failed_calls_unscored():
+    answers = pd.DataFrame({
+        "Answer": ["cat", "timeout"],
+        "Gold Answers": [["cat"], ["dog"]],
+        "Status": ["ok", "error"],
+    })
+    scored = score_answer_frame(answers, processes=1)
+    assert scored["EM"].tolist()[0] == 1.0 and np.isnan(scored["EM"].tolist()[1])
+    assert np.isnan(scored["ANLS"].iloc[1])
+
+
+def test_length_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        score_answers(["a"], [["a"], ["b"]])
@@ -0,0 +1,60 @@
+"""Parquet results store: round-trips, the success-wins rule and rebuilding from the journal."""
+
+from ocr_eval.journal import RunJournal
+from ocr_eval.results import ResultStore, read_results
+
+
+def _row(engine, status, prediction, latency=0.5):
+    return {
+        "Sample ID": "doc",
+        "Engine": engine,
+        "Status": status,
+        "Latency (s)": latency if status == "ok" else -1,
+        "WER": 0.0 if status == "ok" else 1.0,
+        "Prediction": prediction,
+    }
+
+
+def test_success_survives_a_later_failure_across_sessions(tmp_path):
+    # Session 1 fails a pair, session 2 succeeds, session 3 fails it again.
+    for status, prediction in [("error", "timeout"), ("ok", "hello"), ("error", "throttled")]:
+        with ResultStore(tmp_path) as store:
+            store.append(0, _row("A", status, prediction))
+            store.append(1, _row("A", "error", f"{prediction} on 1"))
+    df = read_results([tmp_path])
+    assert list(df["index"]) == [0, 1]
+    assert df.loc[0, "Status"] == "ok" and df.loc[0, "Prediction"] == "hello"
+    assert df.loc[0, "Latency (s)"] == 0.5
+    # Without any success, the latest failure wins.
+    assert df.loc[1, "Prediction"] == "throttled on 1"
+
+
+def test_failure_then_success_round_trip_in_one_part(tmp_path):
+    with ResultStore(tmp_path, row_group_size=1) as store:
+        store.append(3, _row("B", "error", "boom"))
+        store.append(3, _row("A", "ok", "first"))
+        store.append(3, _row("B", "ok", "fixed"))
+    assert len(ResultStore(tmp_path).parts()) == 1
+    df = read_results([tmp_path], texts=False)
+    assert list(df["Engine"]) == ["B", "A"]  # engines in order of first appearance
+    assert list(df["Status"]) == ["ok", "ok"]
+    assert "Prediction" not in df.columns
+
+
+def test_sync_rebuilds_the_store_from_the_journal(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.append(0, _row("A", "error", "boom"))
+    journal.append(0, _row("A", "ok", "hello"))
+    journal.close()
+    records = list(journal.records())
+
+    store = ResultStore(tmp_path)
+    assert store.sync(journal.records(), len(records))  # nothing stored yet
+    assert not store.sync(journal.records(), len(records))  # already in step
+    # A part from a killed session is unreadable: sync replaces it.
+    (store.path / "part-00001.parquet").write_bytes(b"PAR1 torn")
+    assert store.num_rows() is None
+    assert store.sync(journal.records(), len(records))
+
+    df = read_results([tmp_path])
+    assert len(df) == 1 and df.loc[0, "Prediction"] == "hello"
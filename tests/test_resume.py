@@ -0,0 +1,51 @@
+"""Resuming an evaluate run: finished pairs are skipped, failed ones run again."""
+
+from ocr_eval.fakes import FakeEngine, synthetic_page
+from ocr_eval.journal import RunJournal
+from ocr_eval.results import read_results
+
+# Pages the conftest ``funsd`` dataset serves for samples 1 and 4.
+FAILING = {synthetic_page(400, 300, lines=20, seed=i) for i in (1, 4)}
+
+
+def _evaluate(cli, tmp_path, *args):
+    return cli(
+        "evaluate", "--dataset", "funsd", "--engine", "fake", "--samples", 6, "--max-attempts", 1,
+        "--output", tmp_path / "results.md", "--cache-dir", tmp_path / "cache", "--no-cache", *args,
+    )
+
+
+def test_resume_skips_finished_pairs_and_retries_failed_ones(cli, funsd, tmp_path, monkeypatch):
+    run_dir = tmp_path / "run"
+    calls = []
+    process_bytes = FakeEngine.process_bytes
+
+    def flaky(self, data, mime=None):
+        calls.append(bytes(data))
+        if bytes(data) in FAILING:
+            raise RuntimeError("page unavailable")
+        return process_bytes(self, data, mime)
+
+    monkeypatch.setattr(FakeEngine, "process_bytes", flaky)
+    _evaluate(cli, tmp_path, "--run-dir", run_dir)
+    assert len(calls) == 6
+    first = read_results([run_dir])
+    assert sorted(first.loc[first["Status"] == "error", "index"]) == [1, 4]
+
+    FAILING.clear()
+    calls.clear()
+    result = _evaluate(cli, tmp_path, "--resume", run_dir)
+    assert "4 results already done" in result.output
+    assert sorted(calls) == sorted(synthetic_page(400, 300, lines=20, seed=i) for i in (1, 4))
+
+    journal = RunJournal(run_dir)
+    assert len(list(journal.records())) == 8  # 6 from the first session, 2 retried
+    assert journal.completed() == {(i, "Fake") for i in range(6)}
+    resumed = read_results([run_dir])
+    assert sorted(resumed["index"]) == list(range(6)) and (resumed["Status"] == "ok").all()
+    assert "(2 pages, 2 calls" in (tmp_path / "results.md").read_text()
+
+    # Nothing left to do: a second resume makes no calls.
+    calls.clear()
+    _evaluate(cli, tmp_path, "--resume", run_dir)
+    assert calls == []
@@ -0,0 +1,87 @@
+"""The runner's retry queue: retried calls, dead letters and budget admissions."""
+
+from ocr_eval.budget import BudgetScheduler
+from ocr_eval.fakes import FakeEngine, synthetic_page, synthetic_samples
+from ocr_eval.runner import EvaluationRunner
+
+
+class _CountingBudget(BudgetScheduler):
+    """Budget that counts how often each engine's admissions are released."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.releases = {}
+
+    def observe(self, name, cost, tokens, cached=False, ok=True, release=True):
+        if release:
+            self.releases[name] = self.releases.get(name, 0) + 1
+        super().observe(name, cost, tokens, cached=cached, ok=ok, release=release)
+
+
+def _samples(count):
+    samples = synthetic_samples(count, gt_chars=80)
+    for sample in samples:
+        sample["image_bytes"] = synthetic_page(200, 100, lines=1, seed=sample["index"])
+    return samples
+
+
+def test_failures_are_dead_lettered_after_max_attempts():
+    engine = FakeEngine(error_rate=1.0)
+    dead = []
+    runner = EvaluationRunner(
+        {"broken": engine}, workers=2, quiet=True, max_attempts=3, retry_backoff=0.001,
+        dead_letter=lambda index, record: dead.append((index, record)),
+    )
+    rows = list(runner.run(_samples(4)))
+
+    assert engine.calls == 4 * 3
+    assert [(row["Status"], row["Attempts"]) for row in rows] == [("error", 3)] * 4
+    assert sorted(index for index, _ in dead) == [0, 1, 2, 3]
+    assert all(record["Attempts"] == 3 and record["Engine"] == "broken" for _, record in dead)
+    assert runner.stats.retries == 4 * 2 and runner.stats.dead_letters == 4
+    assert runner.stats.calls == 4 and runner.stats.errors == 4
+
+
+def test_retried_pairs_recover_without_a_dead_letter():
+    engine = FakeEngine(reply="eventually", error_rate=0.5, seed=1)
+    dead = []
+    runner = EvaluationRunner(
+        {"flaky": engine}, workers=4, quiet=True, max_attempts=20, retry_backoff=0.001,
+        dead_letter=lambda index, record: dead.append(record),
+    )
+    rows = list(runner.run(_samples(8)))
+
+    assert [row["Sample ID"] for row in rows] == [sample["id"] for sample in _samples(8)]
+    assert all(row["Status"] == "ok" and row["Prediction"] == "eventually" for row in rows)
+    assert sum(row["Attempts"] for row in rows) == engine.calls
+    assert runner.stats.retries == engine.calls - 8 > 0
+    assert dead == []
+
+
+def test_budget_admission_is_released_once_per_pair():
+    engines = {"flaky": FakeEngine(error_rate=0.5, seed=2), "steady": FakeEngine()}
+    budget = _CountingBudget(max_cost=1.0)
+    runner = EvaluationRunner(engines, workers=4, quiet=True, budget=budget, max_attempts=3, retry_backoff=0.001)
+    rows = list(runner.run(_samples(6)))
+
+    assert len(rows) == 12 and engines["flaky"].calls > 6
+    assert budget.releases == {"flaky": 6, "steady": 6}
+    assert not any(budget._in_flight.values())
+    assert not runner.stats.budget_exhausted
+
+
+def test_preprocessing_failures_are_not_retried():
+    engine = FakeEngine()
+    dead = []
+    samples = _samples(2)
+    samples[1]["image_bytes"] = b"not an image"
+    runner = EvaluationRunner(
+        {"fake": engine}, quiet=True, max_attempts=5, retry_backoff=0.001,
+        dead_letter=lambda index, record: dead.append(record),
+    )
+    ok, broken = runner.run(samples)
+
+    assert ok["Status"] == "ok" and engine.calls == 1
+    assert (broken["Status"], broken["Attempts"], broken["Error Kind"]) == ("error", 1, "preprocess")
+    assert runner.stats.retries == 0
+    assert [record["Error Kind"] for record in dead] == ["preprocess"]
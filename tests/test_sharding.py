@@ -0,0 +1,64 @@
+"""Sharded evaluate runs and merge."""
+
+import pytest
+
+from ocr_eval.data.loader import shard_of
+from ocr_eval.results import read_results
+
+
+@pytest.mark.parametrize("by", ["index", "hash"])
+@pytest.mark.parametrize("num_shards", [1, 2, 3, 7])
+def test_shard_of_partitions_samples(by, num_shards):
+    indices = range(200)
+    shards = {i: shard_of(i, f"doc-{i}", num_shards, by) for i in indices}
+    assert set(shards.values()) <= set(range(num_shards))
+    # Deterministic: the same sample always lands in the same shard.
+    assert all(shard_of(i, f"doc-{i}", num_shards, by) == shards[i] for i in indices)
+    if num_shards > 1:
+        assert len(set(shards.values())) == num_shards
+
+
+def _evaluate_shard(cli, tmp_path, index, num_shards=2, samples=10):
+    run_dir = tmp_path / f"shard{index}"
+    cli(
+        "evaluate", "--dataset", "funsd", "--engine", "fake", "--samples", samples,
+        "--num-shards", num_shards, "--shard-index", index, "--run-dir", run_dir,
+        "--output", tmp_path / f"shard{index}.md", "--cache-dir", tmp_path / "cache", "--no-cache",
+    )
+    return run_dir
+
+
+def test_shards_cover_the_split_once_and_merge(cli, funsd, tmp_path):
+    run_dirs = [_evaluate_shard(cli, tmp_path, i) for i in range(2)]
+    shard_indices = [set(read_results([d])["index"]) for d in run_dirs]
+    assert shard_indices[0].isdisjoint(shard_indices[1])
+    assert shard_indices[0] | shard_indices[1] == set(range(10))
+    assert shard_indices[1] == {i for i in range(10) if shard_of(i, None, 2) == 1}
+
+    merged = read_results(run_dirs)
+    assert sorted(merged["index"]) == list(range(10))
+    assert set(merged["Engine"]) == {"Fake"} and (merged["Status"] == "ok").all()
+
+    result = cli("merge", *run_dirs, "--output", tmp_path / "merged.md")
+    assert "Merged report saved" in result.output and "partial" not in result.output
+    report = (tmp_path / "merged.md").read_text()
+    assert "**Results:** 10 rows" in report
+
+
+def test_merge_rejects_unrelated_runs(cli, funsd, tmp_path):
+    shard0 = _evaluate_shard(cli, tmp_path, 0)
+    other = _evaluate_shard(cli, tmp_path / "other", 1, 2, 6)
+    result = cli("merge", shard0, other, "--output", tmp_path / "merged.md")
+    assert "Cannot merge runs started with different options (samples)" in result.output
+    assert not (tmp_path / "merged.md").exists()
+
+    again = _evaluate_shard(cli, tmp_path / "again", 0)
+    result = cli("merge", shard0, again, "--output", tmp_path / "merged.md")
+    assert "shard(s) 0 appear in more than one run directory" in result.output
+    assert not (tmp_path / "merged.md").exists()
+
+
+def test_merge_warns_about_missing_shards(cli, funsd, tmp_path):
+    shard0 = _evaluate_shard(cli, tmp_path, 0)
+    result = cli("merge", shard0, "--output", tmp_path / "merged.md")
+    assert "the merged report is partial" in result.output
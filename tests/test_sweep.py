@@ -0,0 +1,63 @@
+"""A sweep runs every configuration on shared samples and payloads."""
+
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from ocr_eval import preprocess as preprocess_module
+from ocr_eval import runner as runner_module
+from ocr_eval.fakes import FakeOpenAIServer
+from ocr_eval.journal import RunJournal
+from ocr_eval.preprocess import preprocess
+from ocr_eval.results import read_results
+from ocr_eval.sweep import sweep_matrix
+
+pytest.importorskip("openai")
+
+
+@pytest.fixture
+def openai_server(monkeypatch):
+    with FakeOpenAIServer(reply="swept") as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-fake")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        yield server
+
+
+def test_configurations_share_payloads_and_keep_their_own_labels(cli, funsd, openai_server, tmp_path, monkeypatch):
+    counts = {"preprocess": 0, "b64": 0}
+
+    def counted_preprocess(data, profile):
+        counts["preprocess"] += 1
+        return preprocess(data, profile)
+
+    def b64encode(data):
+        counts["b64"] += 1
+        return base64.b64encode(data)
+
+    monkeypatch.setattr(runner_module, "preprocess", counted_preprocess)
+    monkeypatch.setattr(preprocess_module, "base64", SimpleNamespace(b64encode=b64encode))
+
+    run_dir = tmp_path / "run"
+    result = cli(
+        "sweep", "--dataset", "funsd", "--samples", 4, "--models", "fake-vlm", "--prompts", "default,layout",
+        "--max-completion-tokens", "256,1024", "--preprocess", "original,jpeg-1600", "--workers", 4,
+        "--run-dir", run_dir, "--output", tmp_path / "sweep.md", "--cache-dir", tmp_path / "cache", "--no-cache",
+    )
+
+    configs = sweep_matrix("fake-vlm", "default,layout", "256,1024", "original,jpeg-1600")
+    names = {config.name for config in configs}
+    assert len(names) == len(configs) == 8
+    # Each page is preprocessed and base64-encoded once per profile, not once per configuration.
+    assert counts == {"preprocess": 4 * 2, "b64": 4 * 2}
+    assert openai_server.counters["ok"] == 4 * 8
+    assert "2 payload(s) per page shared by 8 configurations" in result.output
+
+    df = read_results([run_dir])
+    assert set(df["Engine"]) == names and (df["Status"] == "ok").all()
+    assert df.groupby("Engine").size().tolist() == [4] * 8
+    profiles = {config.name: config.profile.name for config in configs}
+    assert all(profiles[row.Engine] == row.Profile for row in df.itertuples())
+    assert {record["Engine"] for record in RunJournal(run_dir).records()} == names
+    report = (tmp_path / "sweep.md").read_text()
+    assert all(name in report for name in names)
@@ -0,0 +1,63 @@
+"""The Textract engine against the fake Textract service."""
+
+import boto3
+import pytest
+
+from ocr_eval.cache import make_cache_key
+from ocr_eval.engines.textract import TextractEngine
+from ocr_eval.fakes import FakeTextractServer, synthetic_page
+from ocr_eval.preprocess import Payload
+from ocr_eval.responses import ResponseStore
+
+
+def _engine(server, **kwargs):
+    session = boto3.Session(aws_access_key_id="fake", aws_secret_access_key="fake", region_name="us-east-1")
+    return TextractEngine(endpoint_url=server.endpoint_url, session=session, retry_mode="standard", **kwargs)
+
+
+@pytest.mark.parametrize("per_thread_clients", [False, True])
+def test_throttles_are_retried_and_counted(per_thread_clients):
+    with FakeTextractServer(reply="hello textract", throttle_rate=0.25, seed=3) as server:
+        engine = _engine(server, max_attempts=20, per_thread_clients=per_thread_clients)
+        infos = []
+        for seed in range(4):
+            assert engine.process_bytes(synthetic_page(200, 100, lines=1, seed=seed)) == "hello textract"
+            infos.append(engine.pop_call_info())
+        counters = dict(server.counters)
+
+    assert counters["ok"] == 4 and counters["throttled"] > 0
+    assert sum(info["retries"] for info in infos) == counters["throttled"]
+    assert sum(info["throttled"] for info in infos) == counters["throttled"]
+    for info in infos:
+        assert info["pages"] == 1 and info["parse_time"] >= 0
+        if info["retries"]:
+            assert info["throttle_time"] > 0
+
+
+def test_exhausted_retries_raise_a_throttling_error():
+    with FakeTextractServer(throttle_rate=1.0) as server:
+        engine = _engine(server, max_attempts=2)  # botocore's ``max_attempts`` counts retries
+        with pytest.raises(Exception) as excinfo:
+            engine.process_bytes(synthetic_page(200, 100, lines=1))
+        info = engine.pop_call_info()
+        assert server.counters["throttled"] == 3
+    assert excinfo.value.response["Error"]["Code"] == "ThrottlingException"
+    assert info["retries"] == 2 and info["throttled"] == 3
+    assert "pages" not in info
+
+
+def test_raw_responses_read_back_from_the_store(tmp_path):
+    store = ResponseStore(tmp_path / "responses.sqlite")
+    image = synthetic_page(300, 200, lines=2)
+    payload = Payload(image, "image/png", 300, 200)
+    with FakeTextractServer(reply="stored words") as server:
+        engine = _engine(server, response_store=store)
+        assert engine.process_payload(payload) == "stored words"
+
+    identity = engine.cache_identity("process_image")
+    # Keyed by the payload's digest, which matches hashing the bytes sent.
+    assert make_cache_key(image, identity, payload.digest) == make_cache_key(image, identity)
+    response = store.get_for_image(image, identity)
+    assert response == server.response
+    assert len(store) == 1
+    store.close()